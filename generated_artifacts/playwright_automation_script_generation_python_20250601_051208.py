@@ -4,8 +4,11 @@
 This script automates the login functionality on the Practice Test Automation website.
 
 ```python
-import playwright
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import expect
+
+# `page` comes from qa_framework.pytest_plugin: a fresh BrowserContext per test
+# on a pooled, session-scoped browser.
+pytest_plugins = ["qa_framework.pytest_plugin"]
 
 # Base URL for navigation
 BASE_URL = "https://practicetestautomation.com/"
@@ -38,10 +41,10 @@ def test_positive_login(page):
     page.wait_for_url("**/logged-in-successfully/**")
 
     # Verify new page contains expected text
-    page.expect_that(page.content(), "contains", "Congratulations")
+    expect(page.locator("body")).to_contain_text("Congratulations")
 
     # Verify Log out button is displayed on the new page
-    page.expect_that(page.locator("#wp-logout"), "to_be_visible")
+    expect(page.locator("#wp-logout")).to_be_visible()
 
 def test_negative_username(page):
     """
@@ -61,10 +64,10 @@ def test_negative_username(page):
 
     # Verify error message is displayed
     error_message = page.locator("#error")
-    page.expect_that(error_message, "to_be_visible")
+    expect(error_message).to_be_visible()
 
     # Verify error message text
-    page.expect_that(error_message, "to_contain_text", "Your username is invalid!")
+    expect(error_message).to_contain_text("Your username is invalid!")
 
 def test_negative_password(page):
     """
@@ -84,39 +87,17 @@ def test_negative_password(page):
 
     # Verify error message is displayed
     error_message = page.locator("#error")
-    page.expect_that(error_message, "to_be_visible")
+    expect(error_message).to_be_visible()
 
     # Verify error message text ( Note - This may need adjustment based on actual error message )
-    page.expect_that(error_message, "to_contain_text", "Your password is invalid!")
-
-def main():
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context()
-        page = context.new_page()
-
-        test_positive_login(page)
-        page.close()
-        page = context.new_page()
-
-        test_negative_username(page)
-        page.close()
-        page = context.new_page()
-
-        test_negative_password(page)
-        page.close()
-
-        browser.close()
-
-if __name__ == "__main__":
-    main()
+    expect(error_message).to_contain_text("Your password is invalid!")
 ```
 
 **Notes:**
 
 1. The script assumes you have Playwright installed. If not, you can install it via pip: `pip install playwright`
-2. The script uses the Chromium browser. You can change this to WebKit or Firefox by replacing `p.chromium.launch()` with `p.webkit.launch()` or `p.firefox.launch()`
-3. The script uses the `sync_playwright` API for simplicity. For more complex scripts, consider using the async API.
+2. The browser is launched by the shared pool; set `QA_BROWSER` to `webkit` or `firefox` to change it.
+3. The script uses the sync API for simplicity. For more complex scripts, consider using the async API.
 4. The script tests three scenarios:
 	* Positive login with valid credentials
 	* Negative login with incorrect username
@@ -132,4 +113,4 @@ if __name__ == "__main__":
 
 **Running the Script:**
 
-Save the script to a file (e.g., `login_page_automation.py`) and run it using Python: `python login_page_automation.py`
\ No newline at end of file
+Save the script to a file (e.g., `test_login_page.py`) and run it with pytest: `pytest test_login_page.py`
\ No newline at end of file
@@ -3,6 +3,7 @@ Here's a Python script using Playwright to automate the test cases on the provid
 ```python
 # Import the required Playwright modules
 from playwright.sync_api import sync_playwright
+from qa_framework.readiness import click_and_wait_for_url, expect_text, expect_visible
 
 # Define test cases
 def test_positive_login(page):
@@ -20,21 +21,14 @@ def test_positive_login(page):
     password_input = page.locator('#password')
     password_input.fill('Password123')
 
-    # Click submit button
-    submit_button = page.locator('#submit')
-    submit_button.click()
-
-    # Verify new page URL contains 'logged-in-successfully/'
-    page.wait_for_load_state()
-    assert 'logged-in-successfully/' in page.url()
+    # Click submit and wait for the URL to contain 'logged-in-successfully/'
+    click_and_wait_for_url(page, '#submit', '**/logged-in-successfully/**')
 
     # Verify new page contains expected text
-    congratulations_text = page.locator('text="Congratulations"')
-    assert congratulations_text.count() > 0
+    expect_visible(page, 'text="Congratulations"')
 
     # Verify Log out button is displayed
-    logout_button = page.locator('text="Log out"')
-    assert logout_button.count() > 0
+    expect_visible(page, 'text="Log out"')
 
 def test_negative_username(page):
     """
@@ -56,8 +50,7 @@ def test_negative_username(page):
     submit_button.click()
 
     # Verify error message is displayed
-    error_message = page.locator('#error')
-    assert error_message.text_content() == 'Your username is invalid!'
+    expect_text(page, '#error', 'Your username is invalid!', exact=True)
 
 def test_negative_password(page):
     """
@@ -79,8 +72,7 @@ def test_negative_password(page):
     submit_button.click()
 
     # Verify error message is displayed (Note: For this test case error message might not be 'Your password is invalid!' - adapt as per actual error)
-    error_message = page.locator('#error')
-    assert error_message.count() > 0
+    expect_visible(page, '#error')
 
 # Run the tests
 with sync_playwright() as p:
@@ -114,14 +106,11 @@ Here's how you can refactor the tests:
 
 ```python
 # tests/test_login.py
-import pytest
-from playwright.sync_api import sync_playwright
+from qa_framework.readiness import click_and_wait_for_url, expect_text, expect_visible
 
-@pytest.fixture
-def browser():
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        yield browser
+# `browser` comes from qa_framework.pytest_plugin: a pooled, session-scoped
+# browser whose close() only releases the contexts this test opened.
+pytest_plugins = ["qa_framework.pytest_plugin"]
 
 def test_positive_login(browser):
     context = browser.new_context()
@@ -136,21 +125,14 @@ def test_positive_login(browser):
     password_input = page.locator('#password')
     password_input.fill('Password123')
 
-    # Click submit button
-    submit_button = page.locator('#submit')
-    submit_button.click()
-
-    # Verify new page URL contains 'logged-in-successfully/'
-    page.wait_for_load_state()
-    assert 'logged-in-successfully/' in page.url()
+    # Click submit and wait for the URL to contain 'logged-in-successfully/'
+    click_and_wait_for_url(page, '#submit', '**/logged-in-successfully/**')
 
     # Verify new page contains expected text
-    congratulations_text = page.locator('text="Congratulations"')
-    assert congratulations_text.count() > 0
+    expect_visible(page, 'text="Congratulations"')
 
     # Verify Log out button is displayed
-    logout_button = page.locator('text="Log out"')
-    assert logout_button.count() > 0
+    expect_visible(page, 'text="Log out"')
 
     browser.close()
 
@@ -172,8 +154,7 @@ def test_negative_username(browser):
     submit_button.click()
 
     # Verify error message is displayed
-    error_message = page.locator('#error')
-    assert error_message.text_content() == 'Your username is invalid!'
+    expect_text(page, '#error', 'Your username is invalid!', exact=True)
 
     browser.close()
 
@@ -195,31 +176,19 @@ def test_negative_password(browser):
     submit_button.click()
 
     # Verify error message is displayed (Note: For this test case error message might not be 'Your password is invalid!' - adapt as per actual error)
-    error_message = page.locator('#error')
-    assert error_message.count() > 0
+    expect_visible(page, '#error')
 
     browser.close()
 ```
 Or you could use a more optimized way with pytest fixture to reduce duplication:
 ```python
 # tests/conftest.py
-import pytest
-from playwright.sync_api import sync_playwright
-
-@pytest.fixture
-def browser():
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        yield browser
-
-@pytest.fixture
-def page(browser):
-    context = browser.new_context()
-    page = context.new_page()
-    yield page
-    page.close()
+# Session-scoped browser pool with a fresh BrowserContext per test; see
+# qa_framework/pytest_plugin.py for the `browser_pool`, `context` and `page` fixtures.
+pytest_plugins = ["qa_framework.pytest_plugin"]
 
 # tests/test_login.py
+from qa_framework.readiness import click_and_wait_for_url, expect_text, expect_visible
 def test_positive_login(page):
     page.goto("https://practicetestautomation.com/login/")
 
@@ -231,21 +200,14 @@ def test_positive_login(page):
     password_input = page.locator('#password')
     password_input.fill('Password123')
 
-    # Click submit button
-    submit_button = page.locator('#submit')
-    submit_button.click()
-
-    # Verify new page URL contains 'logged-in-successfully/'
-    page.wait_for_load_state()
-    assert 'logged-in-successfully/' in page.url()
+    # Click submit and wait for the URL to contain 'logged-in-successfully/'
+    click_and_wait_for_url(page, '#submit', '**/logged-in-successfully/**')
 
     # Verify new page contains expected text
-    congratulations_text = page.locator('text="Congratulations"')
-    assert congratulations_text.count() > 0
+    expect_visible(page, 'text="Congratulations"')
 
     # Verify Log out button is displayed
-    logout_button = page.locator('text="Log out"')
-    assert logout_button.count() > 0
+    expect_visible(page, 'text="Log out"')
 
 def test_negative_username(page):
     page.goto("https://practicetestautomation.com/login/")
@@ -263,8 +225,7 @@ def test_negative_username(page):
     submit_button.click()
 
     # Verify error message is displayed
-    error_message = page.locator('#error')
-    assert error_message.text_content() == 'Your username is invalid!'
+    expect_text(page, '#error', 'Your username is invalid!', exact=True)
 
 def test_negative_password(page):
     page.goto("https://practicetestautomation.com/login/")
@@ -282,8 +243,7 @@ def test_negative_password(page):
     submit_button.click()
 
     # Verify error message is displayed (Note: For this test case error message might not be 'Your password is invalid!' - adapt as per actual error)
-    error_message = page.locator('#error')
-    assert error_message.count() > 0
+    expect_visible(page, '#error')
 
 # Run tests via pytest command
 ```
\ No newline at end of file
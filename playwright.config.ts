@@ -0,0 +1,16 @@
+import { defineConfig } from '@playwright/test';
+
+// Specs import `test` from tests/offline.ts; set QA_OFFLINE=1 to serve them
+// from qa_framework/recordings/ instead of the live sites.
+export default defineConfig({
+  testDir: 'tests',
+  testMatch: '*.spec.ts',
+  reporter: [
+    ['list'],
+    ['html', { open: 'never' }],
+    ['junit', { outputFile: 'test-results/results.xml' }],
+  ],
+  use: {
+    trace: 'retain-on-failure',
+  },
+});
@@ -0,0 +1,13 @@
+"""Runtime support for the artifacts produced by the LLM-Powered QA Framework.
+
+Generated scripts live in ``generated_artifacts/`` and ``tests/``; the modules
+in this package provide the shared infrastructure they run on.
+"""
+
+import os
+from pathlib import Path
+
+__version__ = "0.1.0"
+
+#: Root for on-disk caches (storage state, generations, schemas).
+CACHE_ROOT = Path(os.environ.get("QA_CACHE_DIR", ".qa_cache"))
@@ -0,0 +1,115 @@
+"""Reading generated artifacts.
+
+Most artifacts are raw LLM responses: Markdown prose with fenced code blocks,
+saved under whatever extension the prompt type implies.  These helpers pull
+the code back out so it can be validated, executed or rewritten.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+ARTIFACTS_DIR = Path(__file__).resolve().parent.parent / "generated_artifacts"
+
+_FENCE = re.compile(r"^\s*(?P<fence>`{3,}|~{3,})\s*(?P<lang>[\w+#.-]*)\s*$")
+
+_LANGUAGE_ALIASES = {
+    "py": "python",
+    "python3": "python",
+    "ts": "typescript",
+    "js": "javascript",
+    "sh": "bash",
+    "shell": "bash",
+    "md": "markdown",
+}
+
+
+@dataclass(frozen=True)
+class CodeBlock:
+    """One fenced code block from an artifact."""
+
+    language: str
+    code: str
+    start_line: int
+    index: int
+    closed: bool = True
+
+
+def match_fence(line: str) -> tuple[str, str] | None:
+    """Return ``(fence, language_tag)`` if ``line`` is a code fence."""
+    match = _FENCE.match(line)
+    return (match["fence"], match["lang"]) if match else None
+
+
+def closes_fence(line: str, opening: str) -> bool:
+    """Whether ``line`` closes a block opened with the ``opening`` fence."""
+    fence = match_fence(line)
+    return fence is not None and not fence[1] and fence[0][0] == opening[0] and len(fence[0]) >= len(opening)
+
+
+def normalize_language(tag: str) -> str:
+    tag = tag.strip().lower()
+    return _LANGUAGE_ALIASES.get(tag, tag)
+
+
+def extract_code_blocks(text: str) -> list[CodeBlock]:
+    """Return the fenced code blocks in ``text`` in document order.
+
+    ``start_line`` is the 1-based line of the first line of code.  A block
+    left open at end of input is returned with ``closed=False``.
+    """
+    blocks: list[CodeBlock] = []
+    lines = text.splitlines()
+    fence = None
+    lang = ""
+    start = 0
+    body: list[str] = []
+    for lineno, line in enumerate(lines, 1):
+        if fence is None:
+            opened = match_fence(line)
+            if opened:
+                (fence, lang), start, body = opened, lineno + 1, []
+            continue
+        if closes_fence(line, fence):
+            blocks.append(CodeBlock(normalize_language(lang), "\n".join(body) + "\n", start, len(blocks)))
+            fence = None
+            continue
+        body.append(line)
+    if fence is not None:
+        blocks.append(CodeBlock(normalize_language(lang), "\n".join(body) + "\n" if body else "", start, len(blocks), closed=False))
+    return blocks
+
+
+def read_code_blocks(path: str | Path) -> list[CodeBlock]:
+    """Extract code blocks from an artifact file.
+
+    A file without any fences is treated as a single block whose language is
+    guessed from its extension.
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    blocks = extract_code_blocks(text)
+    if blocks:
+        return blocks
+    return [CodeBlock(language_for_suffix(path), text, 1, 0)]
+
+
+def language_for_suffix(path: str | Path) -> str:
+    name = Path(path).name
+    if name.endswith(".spec.ts") or name.endswith(".ts"):
+        return "typescript"
+    return normalize_language(Path(path).suffix.lstrip(".")) or "text"
+
+
+def iter_artifacts(root: str | Path = ARTIFACTS_DIR, pattern: str = "*") -> Iterator[Path]:
+    """Yield artifact files under ``root`` in a stable order."""
+    root = Path(root)
+    if root.is_file():
+        yield root
+        return
+    for path in sorted(root.rglob(pattern)):
+        if path.is_file() and not path.name.startswith("."):
+            yield path
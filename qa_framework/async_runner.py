@@ -0,0 +1,116 @@
+"""Run generated tests on Playwright's ``async_api``.
+
+Sync tests are converted with :func:`qa_framework.codegen.async_variant.to_async`
+at load time, so every artifact can run in this mode.  All tests in a shard
+share one browser and one event loop; each gets its own ``BrowserContext``
+and at most ``concurrency`` of them are in flight at once, so page waits in
+one test overlap with work in the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+import traceback
+from typing import Any, Awaitable, Callable
+
+from qa_framework import mock_sites
+from qa_framework.artifacts import read_code_blocks
+from qa_framework.browser_pool import PoolConfig
+from qa_framework.codegen.async_variant import to_async
+from qa_framework.runner import TestItem, TestResult, harvest_module
+
+DEFAULT_CONCURRENCY = 8
+
+_namespaces: dict[tuple[str, int], dict[str, Any]] = {}
+
+
+def load_async_test(item: TestItem) -> Callable[..., Awaitable[Any]]:
+    """Compile the async rendering of the block holding ``item`` and return the test."""
+    key = (item.path, item.block)
+    namespace = _namespaces.get(key)
+    if namespace is None:
+        code = read_code_blocks(item.path)[item.block].code
+        if not item.is_async:
+            code = to_async(code)
+        namespace = {"__name__": f"generated_block_{item.block}_async", "__file__": item.path}
+        exec(compile(harvest_module(code), f"{item.path}#block{item.block}", "exec"), namespace)
+        _namespaces[key] = namespace
+    return namespace[item.name]
+
+
+class AsyncBorrowedBrowser:
+    """Async counterpart of :class:`~qa_framework.browser_pool.BorrowedBrowser`."""
+
+    def __init__(self, browser: Any, context_options: dict[str, Any] | None = None, offline: bool = False) -> None:
+        self._browser = browser
+        self._context_options = context_options or {}
+        self._offline = offline
+        self._contexts: list[Any] = []
+
+    async def new_context(self, **options: Any) -> Any:
+        context = await self._browser.new_context(**{**self._context_options, **options})
+        if self._offline:
+            await mock_sites.install_async(context)
+        self._contexts.append(context)
+        return context
+
+    async def new_page(self, **options: Any) -> Any:
+        return await (await self.new_context(**options)).new_page()
+
+    async def close(self) -> None:
+        for context in self._contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        self._contexts.clear()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._browser, name)
+
+
+async def _run_one(browser: Any, config: PoolConfig, item: TestItem, limit: asyncio.Semaphore) -> TestResult:
+    async with limit:
+        start = time.perf_counter()
+        borrowed = AsyncBorrowedBrowser(browser, config.context_options, config.offline)
+        try:
+            test = load_async_test(item)
+            context = await borrowed.new_context()
+            fixtures = {"browser": borrowed, "context": context}
+            if "page" in item.params:
+                fixtures["page"] = await context.new_page()
+            await test(**{name: fixtures[name] for name in item.params})
+            outcome, message = "passed", ""
+        except AssertionError:
+            outcome, message = "failed", traceback.format_exc()
+        except Exception:
+            outcome, message = "error", traceback.format_exc()
+        finally:
+            await borrowed.close()
+        return TestResult(item.test_id, outcome, time.perf_counter() - start, message, os.getpid())
+
+
+async def run_async(
+    items: list[TestItem],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    pool_config: dict[str, Any] | None = None,
+) -> list[TestResult]:
+    """Run ``items`` concurrently on one browser, at most ``concurrency`` at a time."""
+    from playwright.async_api import async_playwright
+
+    config = PoolConfig(**(pool_config or {}))
+    limit = asyncio.Semaphore(max(1, concurrency))
+    async with async_playwright() as playwright:
+        launcher = getattr(playwright, config.browser_type)
+        browser = await launcher.launch(headless=config.headless, **config.launch_options)
+        try:
+            return list(await asyncio.gather(*(_run_one(browser, config, item, limit) for item in items)))
+        finally:
+            await browser.close()
+
+
+def run_shard(items: list[TestItem], concurrency: int, pool_config: dict[str, Any] | None = None) -> list[TestResult]:
+    """Process-pool entry point: run one shard on a fresh event loop."""
+    return asyncio.run(run_async(items, concurrency, pool_config))
@@ -0,0 +1,134 @@
+"""Cache of authenticated Playwright storage state.
+
+Tests that need a logged-in user should not drive the login form each time.
+:class:`StorageStateCache` performs the login once per (site, credentials),
+saves the resulting cookies and ``localStorage`` with
+``context.storage_state(path=...)`` and hands the file to new contexts via
+``browser.new_context(storage_state=path)``.  Entries expire after ``ttl``
+seconds so server-side session expiry does not leak into test results.
+
+Only the tests that exercise the login form itself should log in directly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from qa_framework import CACHE_ROOT, mock_sites
+
+@dataclass(frozen=True)
+class LoginRecipe:
+    """How to log in to one site through its form."""
+
+    site: str
+    url: str
+    username_selector: str
+    password_selector: str
+    submit_selector: str
+    success_url: str
+
+
+PRACTICE_TEST_AUTOMATION = LoginRecipe(
+    site="practicetestautomation.com",
+    url="https://practicetestautomation.com/login/",
+    username_selector="#username",
+    password_selector="#password",
+    submit_selector="#submit",
+    success_url="**/logged-in-successfully/**",
+)
+
+
+class StorageStateCache:
+    """Storage-state files on disk, one per (site, username, password)."""
+
+    def __init__(self, directory: str | Path | None = None, ttl: float | None = None) -> None:
+        self.directory = Path(directory) if directory else CACHE_ROOT / "storage_state"
+        self.ttl = ttl if ttl is not None else float(os.environ.get("QA_AUTH_TTL", "3600"))
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._async_locks: dict[str, asyncio.Lock] = {}
+
+    def path_for(self, recipe: LoginRecipe, username: str, password: str) -> Path:
+        # Hash the credentials so the password never appears in a file name.
+        digest = hashlib.sha256(f"{recipe.site}\0{username}\0{password}".encode()).hexdigest()[:24]
+        return self.directory / f"{recipe.site}-{digest}.json"
+
+    def is_fresh(self, path: Path) -> bool:
+        try:
+            return time.time() - path.stat().st_mtime < self.ttl
+        except FileNotFoundError:
+            return False
+
+    def invalidate(self, recipe: LoginRecipe, username: str, password: str) -> None:
+        self.path_for(recipe, username, password).unlink(missing_ok=True)
+
+    def _lock(self, path: Path) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(str(path), threading.Lock())
+
+    def ensure(self, browser: Any, recipe: LoginRecipe, username: str, password: str, offline: bool = False) -> Path:
+        """Return a fresh storage-state file, logging in with ``browser`` if needed.
+
+        With ``offline`` the login context is served from the recorded sites,
+        like every other context of an offline :class:`BrowserPool`.
+        """
+        path = self.path_for(recipe, username, password)
+        if self.is_fresh(path):
+            return path
+        with self._lock(path):
+            if self.is_fresh(path):
+                return path
+            context = browser.new_context()
+            try:
+                if offline:
+                    mock_sites.install(context)
+                page = context.new_page()
+                page.goto(recipe.url)
+                page.fill(recipe.username_selector, username)
+                page.fill(recipe.password_selector, password)
+                page.click(recipe.submit_selector)
+                page.wait_for_url(recipe.success_url)
+                tmp = self._tmp_path(path)
+                context.storage_state(path=str(tmp))
+                os.replace(tmp, path)
+            finally:
+                context.close()
+        return path
+
+    async def ensure_async(self, browser: Any, recipe: LoginRecipe, username: str, password: str, offline: bool = False) -> Path:
+        """:meth:`ensure` for ``async_api`` browsers."""
+        path = self.path_for(recipe, username, password)
+        if self.is_fresh(path):
+            return path
+        async with self._async_locks.setdefault(str(path), asyncio.Lock()):
+            if self.is_fresh(path):
+                return path
+            context = await browser.new_context()
+            try:
+                if offline:
+                    await mock_sites.install_async(context)
+                page = await context.new_page()
+                await page.goto(recipe.url)
+                await page.fill(recipe.username_selector, username)
+                await page.fill(recipe.password_selector, password)
+                await page.click(recipe.submit_selector)
+                await page.wait_for_url(recipe.success_url)
+                tmp = self._tmp_path(path)
+                await context.storage_state(path=str(tmp))
+                os.replace(tmp, path)
+            finally:
+                await context.close()
+        return path
+
+    def _tmp_path(self, path: Path) -> Path:
+        # Written under a unique name and renamed into place, so readers in
+        # other processes never see a partial file.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
@@ -0,0 +1,266 @@
+"""Micro-benchmarks with warm-up, repetition and comparable JSON output.
+
+The generated MongoDB performance check times ``find({'user_id': 1})`` with
+``time.time()`` around a cursor it never iterates, so it measures cursor
+creation once.  :func:`run_benchmark` instead warms up, times ``repeat``
+calls with ``perf_counter_ns``, materializes every result (``fetchall()`` for
+DB-API cursors, ``list()`` for other iterators) inside the timed region and
+summarizes the samples with median, p95, p99 and a bootstrap confidence
+interval of the median.  Results are written as JSON so two runs can be
+compared::
+
+    python -m qa_framework.bench run sqlite:///load.db --json before.json
+    python -m qa_framework.bench run sqlite:///load.db --json after.json
+    python -m qa_framework.bench compare before.json after.json
+
+``compare`` only reports a regression when the median moved by more than
+``--threshold`` *and* the confidence intervals do not overlap.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+DEFAULT_WARMUP = 5
+DEFAULT_REPEAT = 50
+
+
+@dataclass
+class Summary:
+    """Timing statistics in milliseconds."""
+
+    n: int
+    mean: float
+    stdev: float
+    min: float
+    median: float
+    p95: float
+    p99: float
+    max: float
+    ci_low: float
+    ci_high: float
+
+
+@dataclass
+class BenchResult:
+    name: str
+    summary: Summary
+    items: int  # rows / documents / elements produced per call
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BenchResult":
+        return cls(data["name"], Summary(**data["summary"]), data["items"])
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def median_ci(values: list[float], confidence: float = 0.95, resamples: int = 1000, seed: int = 0) -> tuple[float, float]:
+    """Bootstrap confidence interval of the median."""
+    if len(values) < 2:
+        return (values[0], values[0]) if values else (0.0, 0.0)
+    rng = random.Random(seed)
+    medians = sorted(statistics.median(rng.choices(values, k=len(values))) for _ in range(resamples))
+    tail = (1 - confidence) / 2 * 100
+    return percentile(medians, tail), percentile(medians, 100 - tail)
+
+
+def summarize(samples_ns: list[int]) -> Summary:
+    values = sorted(ns / 1e6 for ns in samples_ns)
+    low, high = median_ci(values)
+    return Summary(
+        n=len(values),
+        mean=statistics.fmean(values),
+        stdev=statistics.stdev(values) if len(values) > 1 else 0.0,
+        min=values[0],
+        median=statistics.median(values),
+        p95=percentile(values, 95),
+        p99=percentile(values, 99),
+        max=values[-1],
+        ci_low=low,
+        ci_high=high,
+    )
+
+
+def materialize(result: Any) -> int:
+    """Force a lazy result to be fully produced; returns how many items it had."""
+    if result is None:
+        return 0
+    if hasattr(result, "fetchall"):
+        return len(result.fetchall())
+    if isinstance(result, (str, bytes, dict)):
+        return 1
+    if hasattr(result, "__len__"):
+        return len(result)
+    if hasattr(result, "__iter__"):
+        return sum(1 for _ in result)
+    return 1
+
+
+def run_benchmark(
+    name: str,
+    fn: Callable[[], Any],
+    warmup: int = DEFAULT_WARMUP,
+    repeat: int = DEFAULT_REPEAT,
+    setup: Callable[[], None] | None = None,
+) -> BenchResult:
+    """Time ``fn`` ``repeat`` times after ``warmup`` untimed calls.
+
+    ``setup`` runs before every call, outside the timed region.
+    """
+    items = 0
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        materialize(fn())
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter_ns()
+        items = materialize(fn())
+        samples.append(time.perf_counter_ns() - started)
+    return BenchResult(name, summarize(samples), items)
+
+
+# -- comparison ------------------------------------------------------------
+
+
+@dataclass
+class Change:
+    name: str
+    before: float
+    after: float
+    significant: bool
+
+    @property
+    def ratio(self) -> float:
+        return self.after / self.before if self.before else float("inf")
+
+
+def compare(before: dict[str, BenchResult], after: dict[str, BenchResult], threshold: float = 0.10) -> list[Change]:
+    changes = []
+    for name, new in after.items():
+        old = before.get(name)
+        if old is None:
+            continue
+        a, b = old.summary, new.summary
+        disjoint = b.ci_low > a.ci_high or b.ci_high < a.ci_low
+        moved = abs(b.median - a.median) > threshold * a.median
+        changes.append(Change(name, a.median, b.median, disjoint and moved))
+    return changes
+
+
+def write_results(path: str | Path, results: list[BenchResult], **metadata: Any) -> None:
+    payload = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.time(),
+        **metadata,
+        "results": [r.to_dict() for r in results],
+    }
+    Path(path).write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def read_results(path: str | Path) -> dict[str, BenchResult]:
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {r["name"]: BenchResult.from_dict(r) for r in payload["results"]}
+
+
+# -- database suite --------------------------------------------------------
+
+
+def database_suite(url: str, user_id: int = 1) -> list[tuple[str, Callable[[], Any]]]:
+    """The lookups the database artifact's performance checks time."""
+    from qa_framework.db import database_name, dialect_for, placeholder
+    from qa_framework.db.pool import get_pool, mongo_client
+
+    if dialect_for(url) == "mongodb":
+        db = mongo_client(url)[database_name(url) or "google"]
+        return [
+            ("search_history.find(user_id)", lambda: db.search_history.find({"user_id": user_id})),
+            ("users.find_one(_id)", lambda: db.users.find_one({"_id": user_id})),
+        ]
+    pool = get_pool(url)
+    mark = placeholder(pool.dialect)
+
+    def query(sql: str) -> Callable[[], Any]:
+        def call() -> list:
+            with pool.connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(sql, (user_id,))
+                    return cursor.fetchall()
+                finally:
+                    cursor.close()
+
+        return call
+
+    return [
+        ("search_history by user_id", query(f"SELECT * FROM search_history WHERE user_id = {mark}")),
+        ("users by id", query(f"SELECT * FROM users WHERE id = {mark}")),
+        (
+            "users join search_history",
+            query(f"SELECT u.email, s.search_query FROM users u JOIN search_history s ON s.user_id = u.id WHERE u.id = {mark}"),
+        ),
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run or compare micro-benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="benchmark the database suite against a URL")
+    run.add_argument("url")
+    run.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    run.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    run.add_argument("--json", default=None)
+    cmp = commands.add_parser("compare", help="compare two result files")
+    cmp.add_argument("before")
+    cmp.add_argument("after")
+    cmp.add_argument("--threshold", type=float, default=0.10, help="relative change of the median to report")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        from qa_framework.db import redact
+
+        results = [run_benchmark(name, fn, args.warmup, args.repeat) for name, fn in database_suite(args.url)]
+        for r in results:
+            s = r.summary
+            print(
+                f"{r.name:<30} median {s.median:8.3f}ms [{s.ci_low:.3f}, {s.ci_high:.3f}]"
+                f"  p95 {s.p95:8.3f}ms  p99 {s.p99:8.3f}ms  ({r.items} rows, n={s.n})"
+            )
+        if args.json:
+            write_results(args.json, results, url=redact(args.url))
+        return 0
+
+    regressions = 0
+    for change in compare(read_results(args.before), read_results(args.after), args.threshold):
+        verdict = "-"
+        if change.significant:
+            verdict = "REGRESSION" if change.ratio > 1 else "improvement"
+            regressions += change.ratio > 1
+        print(f"{change.name:<30} {change.before:8.3f}ms -> {change.after:8.3f}ms  x{change.ratio:.2f}  {verdict}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""Pooled Playwright browsers shared by generated tests.
+
+Launching Chromium dominates the run time of short generated tests, so
+browsers are launched once per session and handed out on loan.  Every test
+still gets a fresh ``BrowserContext``, which is cheap and gives full cookie /
+storage isolation.  Browsers are health-checked when returned and recycled
+after ``max_uses`` loans to bound memory growth.  With ``offline`` set, each
+new context is served from :mod:`qa_framework.mock_sites` recordings.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from qa_framework import mock_sites
+
+
+@dataclass
+class PoolConfig:
+    """Settings for a :class:`BrowserPool`."""
+
+    browser_type: str = "chromium"
+    headless: bool = True
+    size: int = 2
+    max_uses: int = 100
+    offline: bool = False
+    launch_options: dict[str, Any] = field(default_factory=dict)
+    context_options: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        """Build a config from ``QA_*`` environment variables."""
+        return cls(
+            browser_type=os.environ.get("QA_BROWSER", "chromium"),
+            headless=os.environ.get("QA_HEADLESS", "1") not in ("0", "false", "no"),
+            size=int(os.environ.get("QA_POOL_SIZE", "2")),
+            max_uses=int(os.environ.get("QA_RECYCLE_AFTER", "100")),
+            offline=os.environ.get("QA_OFFLINE", "0") not in ("0", "false", "no"),
+        )
+
+
+class _PooledBrowser:
+    def __init__(self, browser: Any) -> None:
+        self.browser = browser
+        self.uses = 0
+
+
+class BrowserPool:
+    """A bounded pool of launched browsers.
+
+    ``playwright`` is the object returned by ``sync_playwright().start()``.
+    The pool launches browsers lazily, never holds more than ``config.size``
+    at once, and blocks callers when all of them are on loan.
+    """
+
+    def __init__(self, playwright: Any, config: PoolConfig | None = None) -> None:
+        self.playwright = playwright
+        self.config = config or PoolConfig()
+        self._idle: list[_PooledBrowser] = []
+        self._launched = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _launch(self) -> _PooledBrowser:
+        launcher = getattr(self.playwright, self.config.browser_type)
+        browser = launcher.launch(headless=self.config.headless, **self.config.launch_options)
+        return _PooledBrowser(browser)
+
+    def acquire(self, timeout: float | None = None) -> _PooledBrowser:
+        """Borrow a healthy browser, launching one if the pool has room."""
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("browser pool is closed")
+                while self._idle:
+                    pooled = self._idle.pop()
+                    if pooled.browser.is_connected():
+                        return pooled
+                    self._launched -= 1
+                if self._launched < self.config.size:
+                    self._launched += 1
+                    break
+                if not self._cond.wait(timeout):
+                    raise TimeoutError("no browser became available in the pool")
+        try:
+            return self._launch()
+        except BaseException:
+            with self._cond:
+                self._launched -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, pooled: _PooledBrowser) -> None:
+        """Return a borrowed browser, retiring it if it is worn out or dead."""
+        pooled.uses += 1
+        healthy = pooled.uses < self.config.max_uses and pooled.browser.is_connected()
+        with self._cond:
+            # Decided under the lock: a concurrent close() either finds the
+            # browser in ``_idle`` and closes it, or has us close it here.
+            retire = self._closed or not healthy
+            if retire:
+                self._launched -= 1
+            else:
+                self._idle.append(pooled)
+            self._cond.notify()
+        if retire:
+            _close_quietly(pooled.browser)
+
+    @contextmanager
+    def context(self, **options: Any) -> Iterator[Any]:
+        """Yield a fresh ``BrowserContext`` on a pooled browser."""
+        pooled = self.acquire()
+        try:
+            context = pooled.browser.new_context(**{**self.config.context_options, **options})
+            if self.config.offline:
+                mock_sites.install(context)
+            try:
+                yield context
+            finally:
+                _close_quietly(context)
+        finally:
+            self.release(pooled)
+
+    @contextmanager
+    def page(self, **options: Any) -> Iterator[Any]:
+        """Yield a new page in a fresh context."""
+        with self.context(**options) as context:
+            yield context.new_page()
+
+    def close(self) -> None:
+        """Close every idle browser; loaned ones are closed on release."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._launched -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            _close_quietly(pooled.browser)
+
+
+class BorrowedBrowser:
+    """Browser facade handed to tests that expect to own their browser.
+
+    Generated tests written against a function-scoped ``browser`` fixture call
+    ``browser.new_context()`` and ``browser.close()`` themselves.  This facade
+    tracks the contexts they open so they can be cleaned up, and turns
+    ``close()`` into a no-op so the pooled browser survives for the next test.
+    """
+
+    def __init__(self, browser: Any, context_options: dict[str, Any] | None = None, offline: bool = False) -> None:
+        self._browser = browser
+        self._context_options = context_options or {}
+        self._offline = offline
+        self._contexts: list[Any] = []
+
+    def new_context(self, **options: Any) -> Any:
+        context = self._browser.new_context(**{**self._context_options, **options})
+        if self._offline:
+            mock_sites.install(context)
+        self._contexts.append(context)
+        return context
+
+    def new_page(self, **options: Any) -> Any:
+        return self.new_context(**options).new_page()
+
+    def close(self) -> None:
+        for context in self._contexts:
+            _close_quietly(context)
+        self._contexts.clear()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._browser, name)
+
+
+def _close_quietly(target: Any) -> None:
+    try:
+        target.close()
+    except Exception:
+        pass
@@ -0,0 +1,252 @@
+"""Emit ``playwright.async_api`` variants of generated sync scripts.
+
+The LLM produces ``sync_api`` code.  :func:`to_async` rewrites it so the same
+tests can run concurrently on one event loop:
+
+* ``sync_api`` imports become ``async_api`` (``sync_playwright`` becomes
+  ``async_playwright``);
+* calls on Playwright objects that perform I/O are awaited, while locator
+  builders such as ``page.locator()`` / ``get_by_role()`` are left alone;
+* every function that ends up awaiting something, and every ``test_*``
+  function, becomes ``async def`` and calls to it are awaited;
+* ``with sync_playwright()`` blocks become ``async with`` and script entry
+  points are driven through ``asyncio.run``.
+
+Playwright objects are tracked by name: fixture parameters (``page``,
+``context``, ``browser``), the target of ``with sync_playwright() as p`` and
+anything assigned from an expression rooted at one of those.
+
+Usage::
+
+    python -m qa_framework.codegen.async_variant generated_artifacts/<artifact>.py -o login_async.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import copy
+import sys
+from pathlib import Path
+
+from qa_framework.artifacts import read_code_blocks
+
+FIXTURE_NAMES = frozenset({"page", "context", "browser", "playwright"})
+
+AWAITABLE_METHODS = frozenset(
+    {
+        # navigation and lifecycle
+        "goto", "reload", "go_back", "go_forward", "close", "new_page", "new_context", "launch",
+        "set_content", "content", "title", "screenshot", "pdf", "evaluate", "evaluate_handle",
+        "bring_to_front", "set_viewport_size", "storage_state", "add_cookies", "cookies",
+        "clear_cookies", "add_init_script", "route", "unroute", "route_from_har", "stop",
+        # waits
+        "wait_for", "wait_for_url", "wait_for_load_state", "wait_for_selector",
+        "wait_for_timeout", "wait_for_function", "wait_for_event",
+        # element actions and queries
+        "click", "dblclick", "fill", "type", "press", "press_sequentially", "check", "uncheck",
+        "set_checked", "select_option", "select_text", "hover", "focus", "blur", "tap", "clear",
+        "set_input_files", "dispatch_event", "scroll_into_view_if_needed", "drag_to",
+        "text_content", "inner_text", "inner_html", "input_value", "get_attribute",
+        "is_visible", "is_hidden", "is_enabled", "is_disabled", "is_checked", "is_editable",
+        "count", "all", "all_text_contents", "all_inner_texts", "bounding_box",
+        "query_selector", "query_selector_all",
+        # web-first assertions (called on ``expect(...)``)
+        "to_be_visible", "to_be_hidden", "to_be_enabled", "to_be_disabled", "to_be_checked",
+        "to_be_editable", "to_be_empty", "to_be_focused", "to_be_attached",
+        "to_have_url", "to_have_title", "to_have_text", "to_contain_text", "to_have_value",
+        "to_have_values", "to_have_count", "to_have_attribute", "to_have_class", "to_have_id",
+        "to_have_css", "to_have_accessible_name",
+        "not_to_be_visible", "not_to_have_url", "not_to_contain_text", "not_to_have_text",
+    }
+)
+
+
+def root_name(node: ast.AST) -> str | None:
+    """Return the name an attribute / call chain such as ``page.locator(x).fill`` starts from."""
+    while True:
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Attribute):
+            node = node.value
+        elif isinstance(node, ast.Call):
+            node = node.func
+        elif isinstance(node, (ast.Subscript, ast.Await)):
+            node = node.value
+        else:
+            return None
+
+
+def _is_call_to(node: ast.AST, name: str) -> bool:
+    return isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == name
+
+
+class _Awaiter(ast.NodeTransformer):
+    """Await I/O calls on tracked Playwright objects inside one function."""
+
+    def __init__(self, tracked: set[str], async_functions: set[str]) -> None:
+        self.tracked = set(tracked) | {"expect"}
+        self.async_functions = async_functions
+        self.awaits = 0
+
+    def visit_Assign(self, node: ast.Assign) -> ast.AST:
+        self.generic_visit(node)
+        if root_name(node.value) in self.tracked:
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self.tracked.add(target.id)
+        return node
+
+    def visit_With(self, node: ast.With) -> ast.AST:
+        is_playwright = False
+        for item in node.items:
+            if _is_call_to(item.context_expr, "sync_playwright"):
+                item.context_expr.func = ast.Name("async_playwright", ast.Load())
+                is_playwright = True
+                if isinstance(item.optional_vars, ast.Name):
+                    self.tracked.add(item.optional_vars.id)
+        self.generic_visit(node)
+        if not is_playwright:
+            return node
+        self.awaits += 1
+        return ast.AsyncWith(items=node.items, body=node.body, type_comment=None)
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        self.generic_visit(node)
+        func = node.func
+        awaitable = (
+            isinstance(func, ast.Attribute)
+            and func.attr in AWAITABLE_METHODS
+            and root_name(func.value) in self.tracked
+        ) or (isinstance(func, ast.Name) and func.id in self.async_functions)
+        if not awaitable:
+            return node
+        self.awaits += 1
+        return ast.Await(node)
+
+    # Nested scopes are converted on their own.
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.AST:
+        return node
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+
+def _convert_function(node: ast.FunctionDef, async_functions: set[str]) -> tuple[ast.FunctionDef, int]:
+    tracked = {arg.arg for arg in node.args.args if arg.arg in FIXTURE_NAMES}
+    awaiter = _Awaiter(tracked, async_functions)
+    converted = copy.copy(node)
+    converted.body = [awaiter.visit(stmt) for stmt in copy.deepcopy(node.body)]
+    return converted, awaiter.awaits
+
+
+def _rewrite_imports(tree: ast.Module) -> None:
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module == "playwright.sync_api":
+            node.module = "playwright.async_api"
+            for alias in node.names:
+                if alias.name == "sync_playwright":
+                    alias.name = "async_playwright"
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name == "playwright.sync_api":
+                    alias.name = "playwright.async_api"
+
+
+def to_async(source: str) -> str:
+    """Return the ``async_api`` rendering of sync Playwright ``source``."""
+    tree = ast.parse(source)
+    _rewrite_imports(tree)
+
+    # Script-level ``with sync_playwright()`` drivers become an async main.
+    body: list[ast.stmt] = []
+    module_driver: list[ast.stmt] = []
+    for stmt in tree.body:
+        if isinstance(stmt, ast.With) and any(_is_call_to(i.context_expr, "sync_playwright") for i in stmt.items):
+            module_driver.append(stmt)
+        else:
+            body.append(stmt)
+    if module_driver:
+        driver = ast.parse("def _main():\n    pass").body[0]
+        driver.body = module_driver
+        body.append(driver)
+        body.append(ast.parse("if __name__ == '__main__':\n    _main()").body[0])
+
+    functions = {stmt.name: stmt for stmt in body if isinstance(stmt, ast.FunctionDef)}
+    async_functions = {name for name in functions if name.startswith("test_")}
+    while True:
+        converted = {}
+        for name, func in functions.items():
+            converted[name], awaits = _convert_function(func, async_functions)
+            if awaits and name not in async_functions:
+                async_functions.add(name)
+                break
+        else:
+            break
+
+    new_body: list[ast.stmt] = []
+    for stmt in body:
+        if isinstance(stmt, ast.FunctionDef):
+            func = converted[stmt.name]
+            if stmt.name in async_functions:
+                func = ast.AsyncFunctionDef(**{f: getattr(func, f) for f in func._fields})
+            new_body.append(func)
+        elif _is_main_guard(stmt):
+            new_body.append(_RunEntryPoints(async_functions).visit(stmt))
+        else:
+            new_body.append(stmt)
+
+    if any(_is_main_guard(stmt) for stmt in new_body):
+        new_body.insert(_after_docstring(new_body), ast.Import([ast.alias("asyncio")]))
+    tree.body = new_body
+    return ast.unparse(ast.fix_missing_locations(tree)) + "\n"
+
+
+def _is_main_guard(stmt: ast.stmt) -> bool:
+    return (
+        isinstance(stmt, ast.If)
+        and isinstance(stmt.test, ast.Compare)
+        and isinstance(stmt.test.left, ast.Name)
+        and stmt.test.left.id == "__name__"
+    )
+
+
+def _after_docstring(body: list[ast.stmt]) -> int:
+    if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) and isinstance(body[0].value.value, str):
+        return 1
+    return 0
+
+
+class _RunEntryPoints(ast.NodeTransformer):
+    def __init__(self, async_functions: set[str]) -> None:
+        self.async_functions = async_functions
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        if isinstance(node.func, ast.Name) and node.func.id in self.async_functions:
+            return ast.Call(ast.Attribute(ast.Name("asyncio", ast.Load()), "run", ast.Load()), [node], [])
+        return node
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Emit async_api variants of a generated Playwright artifact.")
+    parser.add_argument("artifact")
+    parser.add_argument("-o", "--output", help="write here instead of stdout")
+    args = parser.parse_args(argv)
+
+    rendered = []
+    for block in read_code_blocks(args.artifact):
+        if block.language != "python" or ("sync_api" not in block.code and "def test_" not in block.code):
+            continue
+        try:
+            rendered.append(to_async(block.code))
+        except SyntaxError as exc:
+            print(f"skipping block {block.index}: {exc}", file=sys.stderr)
+    output = "\n\n".join(rendered)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+    else:
+        sys.stdout.write(output)
+    return 0 if rendered else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
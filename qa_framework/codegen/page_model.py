@@ -0,0 +1,512 @@
+"""One page model, compiled to Playwright-Python, Playwright-TS and Appium.
+
+The generators are prompted once per platform and each answer re-derives the
+same locators: the Appium artifact repeats every XPath for ``@AndroidFindBy``
+and ``@iOSFindBy``, and the Playwright artifacts inline ``"#username"`` in
+every test function.  :func:`build_model` instead reduces the refined DOM
+once to a :class:`PageModel`:
+
+* elements - form fields, buttons, links and status messages, each with
+  the locator :func:`qa_framework.mobile.locators.choose` picks for web and
+  for native contexts;
+* actions - ``goto``, ``enter_<field>``, ``click_<element>`` and one
+  ``login`` / ``search`` / ``submit_<form>`` per form;
+* assertions - ``expect_loaded`` and ``expect_<message>`` for error and
+  status messages.
+
+:func:`compile_model` turns the model into a page object per target.  The
+model is plain JSON, cached per refined-DOM hash in the generation cache, and
+can equally be written by one LLM call and loaded with
+:meth:`PageModel.from_dict`::
+
+    python -m qa_framework.codegen.page_model login.html --url https://practicetestautomation.com/practice-test-login/ -o pages/
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import keyword
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from qa_framework.dom import DomElement, parse_refined_dom
+from qa_framework.gen_cache import GenerationCache, GenerationKey
+from qa_framework.mobile.locators import Locator, choose, find_by_annotations, is_unique, matches
+
+#: Bump when the model rules change so cached models are not reused.
+MODEL_VERSION = "page-model/2"
+
+TARGETS = ("playwright-python", "playwright-ts", "appium-java")
+
+_FIELD_TYPES = {"checkbox": "checkbox", "radio": "checkbox"}
+_SKIPPED_INPUTS = {"hidden", "submit", "button", "reset", "image", "file"}
+_MESSAGE = re.compile(r"error|alert|message|notice|flash|toast", re.IGNORECASE)
+
+# Words a parameter may not be called in any target, including names the
+# compiled methods already use (``self``, ``page``, ``driver``).
+_RESERVED = frozenset(keyword.kwlist) | {
+    "self", "this", "page", "driver", "arguments", "await", "break", "case", "catch",
+    "char", "class", "const", "continue", "debugger", "default", "delete", "do", "double", "else", "enum",
+    "eval", "export", "extends", "false", "final", "finally", "float", "for", "function", "goto", "if",
+    "implements", "import", "in", "instanceof", "int", "interface", "let", "long", "native", "new",
+    "null", "package", "private", "protected", "public", "return", "short", "static", "super", "switch",
+    "synchronized", "throw", "throws", "transient", "true", "try", "typeof", "var", "void",
+    "volatile", "while", "with", "yield", "boolean", "byte", "abstract", "assert", "strictfp",
+}
+
+
+@dataclass
+class ModelElement:
+    name: str  # snake_case, e.g. "username_input"
+    kind: str  # "input", "checkbox", "select", "button", "link" or "message"
+    tag: str
+    web: Locator
+    native: Locator
+
+
+@dataclass
+class Step:
+    kind: str  # "fill", "press", "check", "select", "click", "expect_url", "expect_visible" or "expect_text"
+    element: str | None = None
+    param: str | None = None  # method parameter supplying the value
+    value: str | None = None  # literal value
+
+
+@dataclass
+class Method:
+    name: str  # snake_case
+    params: list[str] = field(default_factory=list)
+    steps: list[Step] = field(default_factory=list)
+
+
+@dataclass
+class PageModel:
+    name: str  # class name, e.g. "GoogleHomePage"
+    url: str
+    elements: list[ModelElement] = field(default_factory=list)
+    actions: list[Method] = field(default_factory=list)
+    assertions: list[Method] = field(default_factory=list)
+
+    def element(self, name: str) -> ModelElement:
+        return next(e for e in self.elements if e.name == name)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PageModel":
+        elements = [
+            ModelElement(e["name"], e["kind"], e["tag"], Locator(**e["web"]), Locator(**e["native"])) for e in data["elements"]
+        ]
+
+        def methods(items: list[dict]) -> list[Method]:
+            return [Method(m["name"], list(m["params"]), [Step(**s) for s in m["steps"]]) for m in items]
+
+        return cls(data["name"], data["url"], elements, methods(data["actions"]), methods(data["assertions"]))
+
+
+# -- building --------------------------------------------------------------
+
+
+def _words(text: str) -> list[str]:
+    text = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", text.replace("'", ""))
+    return [w for w in re.split(r"[^A-Za-z0-9]+", text.lower()) if w][:4]
+
+
+def _kind(element: DomElement) -> str | None:
+    if element.tag == "input":
+        input_type = element.attrs.get("type", "text").lower()
+        if input_type in ("submit", "button", "image"):
+            return "button"
+        return None if input_type in _SKIPPED_INPUTS else _FIELD_TYPES.get(input_type, "input")
+    if element.tag == "textarea":
+        return "input"
+    if element.tag in ("select", "button"):
+        return element.tag
+    if element.tag == "a":
+        return "link" if element.attrs.get("href") and element.text else None
+    if element.attrs.get("role") in ("alert", "status") or _MESSAGE.search(element.attrs.get("id", "")):
+        return "message"
+    return None
+
+
+def _base_words(element: DomElement, kind: str) -> list[str]:
+    attrs = element.attrs
+    if kind == "message":
+        sources = [attrs.get("id", ""), attrs.get("role", "")]
+    elif kind == "link":
+        sources = [element.text, attrs.get("title", ""), urlsplit(attrs.get("href", "")).path]
+    elif kind == "button":
+        sources = [element.accessible_name, attrs.get("value", ""), attrs.get("id", ""), attrs.get("name", "")]
+    else:
+        sources = [element.label or "", attrs.get("aria-label", ""), attrs.get("placeholder", ""), attrs.get("name", ""), attrs.get("id", "")]
+    words = next((w for w in map(_words, sources) if w), None) or ["field"]
+    if words[-1] == kind:
+        words = words[:-1] or words
+    if words[0][0].isdigit():
+        words = [kind] + words  # "2FA code" -> input_2_fa_code, a valid identifier
+    return words
+
+
+def _stem(element: ModelElement) -> str:
+    """``username_input`` -> ``username``, ``field_input_2`` -> ``field_2``."""
+    return re.sub(rf"_{element.kind}(?=_\d+$|$)", "", element.name)
+
+
+def _param(element: ModelElement) -> str:
+    """The method parameter supplying ``element``'s value; unique because element names are."""
+    name = _stem(element)
+    return f"{name}_value" if name in _RESERVED else name
+
+
+def _locator(element: DomElement, elements: list[DomElement], context: str) -> Locator:
+    """:func:`choose`, with an XPath index when nothing identifies the element on its own."""
+    locator = choose(element, elements, context)
+    if locator.strategy != "xpath" or is_unique(locator, elements):
+        return locator
+    if locator.value == f"//{element.tag}":
+        same = [e for e in elements if e.tag == element.tag]
+    else:
+        same = [e for e in elements if matches(e, locator)]
+    index = next(i for i, e in enumerate(same, 1) if e is element)
+    return Locator("xpath", f"({locator.value})[{index}]")
+
+
+def page_name(url: str) -> str:
+    """``https://www.google.com/`` -> ``GoogleHomePage``, ``.../practice-test-login/`` -> ``PracticeTestLoginPage``."""
+    parts = urlsplit(url)
+    host = (parts.hostname or "page").removeprefix("www.").split(".")[0]
+    path = [w for w in _words(parts.path) if w not in ("html", "php", "index")]
+    return "".join(w.capitalize() for w in (path or [host, "home"])) + "Page"
+
+
+def _form_method(form: list[tuple[ModelElement, list[str]]], buttons: list[ModelElement], fallback: str) -> Method | None:
+    fields = [(e, w) for e, w in form if e.kind in ("input", "checkbox", "select")]
+    if not fields:
+        return None
+    params = [_param(e) for e, _ in fields if e.kind != "checkbox"]
+    is_login = any("password" in w for _, w in fields)
+    is_search = not is_login and any(w[:1] in (["search"], ["q"], ["query"]) for _, w in fields)
+    if is_search:
+        search = fields[0][0]
+        return Method("search", ["query"], [Step("fill", search.name, "query"), Step("press", search.name, value="Enter")])
+    if not is_login and len(fields) < 2:
+        return None
+    steps = []
+    for element, _ in fields:
+        if element.kind == "checkbox":
+            steps.append(Step("check", element.name))
+        else:
+            steps.append(Step("select" if element.kind == "select" else "fill", element.name, _param(element)))
+    if buttons:
+        steps.append(Step("click", buttons[0].name))
+    else:
+        steps.append(Step("press", fields[-1][0].name, value="Enter"))
+    return Method("login" if is_login else f"submit_{fallback}", params, steps)
+
+
+def build_model(html: str, url: str, name: str | None = None) -> PageModel:
+    """Derive the page model from a refined DOM."""
+    elements = parse_refined_dom(html)
+    model = PageModel(name or page_name(url), url)
+    used: set[str] = set()
+    forms: dict[str, list[tuple[ModelElement, list[str]]]] = {}
+    for element in elements:
+        kind = _kind(element)
+        if kind is None:
+            continue
+        words = _base_words(element, kind)
+        base = "_".join(words + [kind])
+        unique, n = base, 2
+        while unique in used:
+            unique, n = f"{base}_{n}", n + 1
+        used.add(unique)
+        item = ModelElement(unique, kind, element.tag, _locator(element, elements, "web"), _locator(element, elements, "native"))
+        model.elements.append(item)
+        if kind != "link" and kind != "message":
+            forms.setdefault(element.form or "page", []).append((item, words))
+
+    model.actions.append(Method("goto"))
+    for item in model.elements:
+        if item.kind == "input":
+            param = _param(item)
+            model.actions.append(Method(f"enter_{_stem(item)}", [param], [Step("fill", item.name, param)]))
+        elif item.kind == "select":
+            param = _param(item)
+            model.actions.append(Method(f"select_{_stem(item)}", [param], [Step("select", item.name, param)]))
+        elif item.kind == "checkbox":
+            model.actions.append(Method(f"check_{_stem(item)}", [], [Step("check", item.name)]))
+        elif item.kind in ("button", "link"):
+            model.actions.append(Method(f"click_{item.name}", [], [Step("click", item.name)]))
+    names = {m.name for m in model.actions}
+    for key, form in forms.items():
+        buttons = [e for e, _ in form if e.kind == "button"]
+        method = _form_method(form, buttons, "_".join(_words(urlsplit(key).path or key)) or "form")
+        if method is not None and method.name not in names:
+            names.add(method.name)
+            model.actions.append(method)
+
+    path = urlsplit(url).path.strip("/")
+    loaded = [Step("expect_url", value=path.rsplit("/", 1)[-1] if path else urlsplit(url).hostname or url)]
+    anchor = next((e for e in model.elements if e.kind in ("input", "button")), None)
+    if anchor is not None:
+        loaded.append(Step("expect_visible", anchor.name))
+    model.assertions.append(Method("expect_loaded", [], loaded))
+    for item in model.elements:
+        if item.kind == "message":
+            model.assertions.append(Method(f"expect_{item.name}", ["text"], [Step("expect_visible", item.name), Step("expect_text", item.name, "text")]))
+    return model
+
+
+def model_cached(html: str, url: str, cache: GenerationCache | None = None) -> tuple[PageModel, bool]:
+    """Return ``(model, hit)``; the model is built once per refined DOM and URL."""
+    cache = cache or GenerationCache()
+    key = GenerationKey("page_model", html, MODEL_VERSION, {"url": url})
+    text, hit = cache.get_or_generate(key, lambda: json.dumps(build_model(html, url).to_dict()))
+    return PageModel.from_dict(json.loads(text)), hit
+
+
+# -- compiling -------------------------------------------------------------
+
+
+def _camel(snake: str) -> str:
+    head, *rest = snake.split("_")
+    return head + "".join(w.capitalize() for w in rest)
+
+
+def _string(value: str) -> str:
+    """A double-quoted literal valid in Python, TypeScript and Java."""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _css_string(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\a ") + '"'
+
+
+def _css_id(value: str) -> str:
+    return f"#{value}" if re.fullmatch(r"[A-Za-z_][\w-]*", value) else f"[id={_css_string(value)}]"
+
+
+def _playwright_locator(element: ModelElement, python: bool) -> str:
+    locator = element.web
+    if locator.strategy == "link text":
+        if python:
+            return f'get_by_role("link", name={_string(locator.value)}, exact=True)'
+        return f"getByRole('link', {{ name: {_string(locator.value)}, exact: true }})"
+    selector = {
+        "id": lambda v: _css_id(v),
+        "name": lambda v: f"{element.tag}[name={_css_string(v)}]",
+        "css selector": lambda v: v,
+        "xpath": lambda v: f"xpath={v}",
+    }[locator.strategy](locator.value)
+    return f"locator({_string(selector)})"
+
+
+def _url_fragment(step: Step) -> str:
+    """The expected URL fragment as a regular expression."""
+    return re.sub(r"[.*+?^${}()|[\]\\]", r"\\\g<0>", step.value or "")
+
+
+def _python(model: PageModel) -> str:
+    lines = [
+        f'"""Page object for {model.url}, compiled from its page model."""',
+        "",
+        "import re",
+        "",
+        "from playwright.sync_api import Page, expect",
+        "",
+        "",
+        f"class {model.name}:",
+        f"    URL = {_string(model.url)}",
+        "",
+        "    def __init__(self, page: Page) -> None:",
+        "        self.page = page",
+    ]
+    lines += [f"        self.{e.name} = page.{_playwright_locator(e, True)}" for e in model.elements]
+
+    def statement(step: Step) -> str:
+        target = f"self.{step.element}"
+        value = step.param or _string(step.value or "")
+        return {
+            "fill": f"{target}.fill({value})",
+            "press": f"{target}.press({value})",
+            "check": f"{target}.check()",
+            "select": f"{target}.select_option({value})",
+            "click": f"{target}.click()",
+            "expect_url": f"expect(self.page).to_have_url(re.compile({_string(_url_fragment(step))}))",
+            "expect_visible": f"expect({target}).to_be_visible()",
+            "expect_text": f"expect({target}).to_contain_text({value})",
+        }[step.kind]
+
+    for method in model.actions + model.assertions:
+        params = "".join(f", {p}: str" for p in method.params)
+        lines += ["", f"    def {method.name}(self{params}) -> None:"]
+        body = ["self.page.goto(self.URL)"] if method.name == "goto" else [statement(s) for s in method.steps]
+        lines += [f"        {line}" for line in body or ["pass"]]
+    return "\n".join(lines) + "\n"
+
+
+def _typescript(model: PageModel) -> str:
+    lines = [
+        f"// Page object for {model.url}, compiled from its page model.",
+        "import { expect, type Locator, type Page } from '@playwright/test';",
+        "",
+        f"export class {model.name} {{",
+        f"  static readonly URL = {_string(model.url)};",
+        "  readonly page: Page;",
+    ]
+    lines += [f"  readonly {_camel(e.name)}: Locator;" for e in model.elements]
+    lines += ["", "  constructor(page: Page) {", "    this.page = page;"]
+    lines += [f"    this.{_camel(e.name)} = page.{_playwright_locator(e, False)};" for e in model.elements]
+    lines.append("  }")
+
+    def statement(step: Step) -> str:
+        target = f"this.{_camel(step.element or '')}"
+        value = _camel(step.param) if step.param else _string(step.value or "")
+        return {
+            "fill": f"await {target}.fill({value});",
+            "press": f"await {target}.press({value});",
+            "check": f"await {target}.check();",
+            "select": f"await {target}.selectOption({value});",
+            "click": f"await {target}.click();",
+            "expect_url": f"await expect(this.page).toHaveURL(new RegExp({_string(_url_fragment(step))}));",
+            "expect_visible": f"await expect({target}).toBeVisible();",
+            "expect_text": f"await expect({target}).toContainText({value});",
+        }[step.kind]
+
+    for method in model.actions + model.assertions:
+        params = ", ".join(f"{_camel(p)}: string" for p in method.params)
+        lines += ["", f"  async {_camel(method.name)}({params}): Promise<void> {{"]
+        body = [f"await this.page.goto({model.name}.URL);"] if method.name == "goto" else [statement(s) for s in method.steps]
+        lines += [f"    {line}" for line in body]
+        lines.append("  }")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def _java(model: PageModel, context: str = "web") -> str:
+    fields = []
+    for element in model.elements:
+        locator = element.native if context == "native" else element.web
+        fields += [find_by_annotations(locator, context, "    ").rstrip("\n"), f"    private WebElement {_camel(element.name)};", ""]
+    annotations = "\n".join(fields)
+    imports = {
+        "io.appium.java_client.AppiumDriver",
+        "io.appium.java_client.pagefactory.AppiumFieldDecorator",
+        "org.openqa.selenium.WebElement",
+        "org.openqa.selenium.support.PageFactory",
+        "org.testng.Assert",
+    }
+    if "@FindBy" in annotations:
+        imports.add("org.openqa.selenium.support.FindBy")
+    if "@AndroidFindBy" in annotations:
+        imports |= {"io.appium.java_client.pagefactory.AndroidFindBy", "io.appium.java_client.pagefactory.iOSFindBy"}
+
+    def statement(step: Step) -> list[str]:
+        target = _camel(step.element or "")
+        value = _camel(step.param) if step.param else _string(step.value or "")
+        if step.kind == "press":
+            imports.add("org.openqa.selenium.Keys")
+            return [f"{target}.sendKeys(Keys.{(step.value or 'Enter').upper()});"]
+        if step.kind == "select":
+            imports.add("org.openqa.selenium.support.ui.Select")
+            return [f"new Select({target}).selectByVisibleText({value});"]
+        return {
+            "fill": [f"{target}.clear();", f"{target}.sendKeys({value});"],
+            "check": [f"if (!{target}.isSelected()) {{", f"    {target}.click();", "}"],
+            "click": [f"{target}.click();"],
+            "expect_url": [f"Assert.assertTrue(driver.getCurrentUrl().contains({_string(step.value or '')}), driver.getCurrentUrl());"],
+            "expect_visible": [f"Assert.assertTrue({target}.isDisplayed(), {_string(f'{step.element} is not displayed')});"],
+            "expect_text": [f"Assert.assertTrue({target}.getText().contains({value}), {target}.getText());"],
+        }[step.kind]
+
+    methods = []
+    for method in model.actions + model.assertions:
+        name = "open" if method.name == "goto" else _camel(method.name)
+        params = ", ".join(f"String {_camel(p)}" for p in method.params)
+        body = ["driver.get(URL);"] if method.name == "goto" else [line for s in method.steps for line in statement(s)]
+        methods += ["", f"    public void {name}({params}) {{"] + [f"        {line}" for line in body] + ["    }"]
+
+    lines = [f"// {model.name}.java", ""]
+    lines += [f"import {name};" for name in sorted(imports)]
+    lines += [
+        "",
+        f"public class {model.name} {{",
+        f"    public static final String URL = {_string(model.url)};",
+        "",
+        "    private final AppiumDriver driver;",
+        "",
+        annotations,
+        f"    public {model.name}(AppiumDriver driver) {{",
+        "        this.driver = driver;",
+        "        PageFactory.initElements(new AppiumFieldDecorator(driver), this);",
+        "    }",
+    ]
+    lines += methods + ["}"]
+    return "\n".join(lines) + "\n"
+
+
+def compile_model(model: PageModel, target: str, context: str = "web") -> str:
+    """Source of the page object for ``target`` (one of :data:`TARGETS`).
+
+    ``context`` selects web or native locators for ``appium-java``.
+    """
+    if target == "playwright-python":
+        return _python(model)
+    if target == "playwright-ts":
+        return _typescript(model)
+    if target == "appium-java":
+        return _java(model, context)
+    raise ValueError(f"unknown target {target!r}; expected one of {', '.join(TARGETS)}")
+
+
+def output_name(model: PageModel, target: str) -> str:
+    snake = re.sub(r"(?<!^)(?=[A-Z])", "_", model.name).lower()
+    return {"playwright-python": f"{snake}.py", "playwright-ts": f"{model.name}.ts", "appium-java": f"{model.name}.java"}[target]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compile one page model to page objects for every platform.")
+    parser.add_argument("refined_dom", help="HTML file, or a page-model .json")
+    parser.add_argument("--url", help="page URL (required for HTML input)")
+    parser.add_argument("--name", default=None, help="class name (default: derived from the URL)")
+    parser.add_argument("--targets", nargs="*", choices=TARGETS, default=list(TARGETS))
+    parser.add_argument("--context", choices=("web", "native"), default="web", help="locators for the Appium page object")
+    parser.add_argument("-o", "--output", default=None, help="directory to write the page objects to (default: stdout)")
+    parser.add_argument("--model", action="store_true", help="print the page model as JSON and stop")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    source = Path(args.refined_dom)
+    if source.suffix == ".json":
+        model = PageModel.from_dict(json.loads(source.read_text(encoding="utf-8")))
+    else:
+        if not args.url:
+            parser.error("--url is required for refined-DOM input")
+        html = source.read_text(encoding="utf-8")
+        model = build_model(html, args.url) if args.no_cache else model_cached(html, args.url)[0]
+    if args.name:
+        model.name = args.name
+    if args.model:
+        print(json.dumps(model.to_dict(), indent=2, ensure_ascii=False))
+        return 0
+
+    for target in args.targets:
+        code = compile_model(model, target, args.context)
+        if args.output:
+            path = Path(args.output) / output_name(model, target)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(code, encoding="utf-8")
+            print(path)
+        else:
+            print(f"// ---- {target} ----" if target != "playwright-python" else f"# ---- {target} ----")
+            print(code)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
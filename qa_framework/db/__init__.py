@@ -0,0 +1,91 @@
+"""Database side of the validation suite.
+
+The database artifacts target MySQL, PostgreSQL and MongoDB.  Everything in
+this package addresses a server by URL and imports the matching driver only
+when it is used, so SQLite (``sqlite:///path``) can stand in for the SQL
+servers locally:
+
+==============================  ==========================
+URL                             driver
+==============================  ==========================
+``sqlite:///load.db``           :mod:`sqlite3`
+``postgresql://u:p@host/db``    ``psycopg`` (or ``psycopg2``)
+``mysql://u:p@host/db``         ``pymysql``
+``mongodb://host:27017/db``     ``pymongo``
+==============================  ==========================
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+DIALECTS = ("sqlite", "postgresql", "mysql", "mongodb")
+
+_SCHEME_ALIASES = {"postgres": "postgresql", "mariadb": "mysql", "mongodb+srv": "mongodb"}
+
+
+def dialect_for(url: str) -> str:
+    scheme = urlsplit(url).scheme
+    dialect = _SCHEME_ALIASES.get(scheme, scheme.split("+")[0])
+    if dialect not in DIALECTS:
+        raise ValueError(f"unsupported database URL {redact(url)!r}; expected one of {', '.join(DIALECTS)}")
+    return dialect
+
+
+def redact(url: str) -> str:
+    """``url`` without its user name and password, for reports and logs."""
+    parts = urlsplit(url)
+    if "@" not in parts.netloc:
+        return url
+    return parts._replace(netloc=parts.netloc.rsplit("@", 1)[1]).geturl()
+
+
+def database_name(url: str) -> str:
+    return unquote(urlsplit(url).path.lstrip("/"))
+
+
+def placeholder(dialect: str) -> str:
+    """The DB-API parameter marker for ``dialect``."""
+    return "?" if dialect == "sqlite" else "%s"
+
+
+def connect(url: str, **options: Any) -> Any:
+    """Open a connection for ``url``.
+
+    SQL dialects return a DB-API connection; ``mongodb`` returns the
+    ``pymongo`` database named by the URL path.
+    """
+    dialect = dialect_for(url)
+    parts = urlsplit(url)
+    if dialect == "sqlite":
+        import sqlite3
+
+        # SQLAlchemy convention: sqlite:///relative.db, sqlite:////abs/path.db
+        path = url.split(":///", 1)[1] if ":///" in url else ""
+        options.setdefault("check_same_thread", False)
+        return sqlite3.connect(path or ":memory:", **options)
+    if dialect == "postgresql":
+        dsn = f"postgresql://{url.split('://', 1)[1]}"
+        try:
+            import psycopg
+        except ImportError:
+            import psycopg2
+
+            return psycopg2.connect(dsn, **options)
+        return psycopg.connect(dsn, **options)
+    if dialect == "mysql":
+        import pymysql
+
+        return pymysql.connect(
+            host=parts.hostname or "localhost",
+            port=parts.port or 3306,
+            user=unquote(parts.username or ""),
+            password=unquote(parts.password or ""),
+            database=database_name(url) or None,
+            **options,
+        )
+    import pymongo
+
+    client = pymongo.MongoClient(url, **options)
+    return client[database_name(url) or "test"]
@@ -0,0 +1,164 @@
+"""Set-based cross-table consistency checks derived from the schema DDL.
+
+The generated consistency section returns ``SELECT * FROM users JOIN
+search_history ...`` for someone to eyeball.  :func:`derive_checks` reads the
+foreign keys out of the inferred ``CREATE TABLE`` statements
+(:mod:`qa_framework.db.schema`) and produces, per relationship and table:
+
+* ``orphans`` - child rows whose foreign key matches no parent, as a
+  ``NOT EXISTS`` anti-join (a ``$lookup`` pipeline on MongoDB);
+* ``join-fanout`` - for foreign keys to a column other than the parent's
+  primary key, the child count must equal the child-join-parent count,
+  which breaks when the referenced values are duplicated;
+* ``duplicate-keys`` - primary keys that occur more than once, for tables
+  loaded without constraints.  This also covers fan-out through foreign
+  keys to a primary key, so no ``join-fanout`` check is derived for those.
+
+Every check is a single aggregate the database evaluates; checks run in
+parallel on pooled connections and only violations are reported, each with
+a few sample keys::
+
+    python -m qa_framework.db.consistency postgresql://localhost/google -j 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from qa_framework.db import database_name, dialect_for
+from qa_framework.db.pool import get_pool, mongo_client
+from qa_framework.db.schema import Schema, load_schema
+
+SAMPLE_SIZE = 5
+
+
+@dataclass
+class Check:
+    name: str
+    kind: str  # "orphans", "join-fanout" or "duplicate-keys"
+    count_sql: str = ""  # returns one row: the number of violations
+    sample_sql: str = ""  # returns up to SAMPLE_SIZE offending keys
+    pipeline: list[dict] = field(default_factory=list)  # MongoDB equivalent
+    collection: str = ""
+
+
+@dataclass
+class Violation:
+    check: Check
+    count: int
+    samples: list[Any]
+
+
+def derive_checks(schema: Schema, mongo: bool = False) -> list[Check]:
+    checks: list[Check] = []
+    for table in schema.values():
+        pk = table.primary_key[0] if len(table.primary_key) == 1 else None
+        for fk in table.foreign_keys:
+            name = f"{table.name}.{fk.column} -> {fk.ref_table}.{fk.ref_column}"
+            if mongo:
+                foreign = "_id" if fk.ref_column in schema[fk.ref_table].primary_key else fk.ref_column
+                checks.append(
+                    Check(
+                        name,
+                        "orphans",
+                        collection=table.name,
+                        pipeline=[
+                            {"$match": {fk.column: {"$ne": None}}},
+                            {"$lookup": {"from": fk.ref_table, "localField": fk.column, "foreignField": foreign, "as": "_parent"}},
+                            {"$match": {"_parent": {"$size": 0}}},
+                            {"$project": {"_id": 1}},
+                        ],
+                    )
+                )
+                continue
+            anti_join = (
+                f"FROM {table.name} c WHERE c.{fk.column} IS NOT NULL AND NOT EXISTS "
+                f"(SELECT 1 FROM {fk.ref_table} p WHERE p.{fk.ref_column} = c.{fk.column})"
+            )
+            key = f"c.{pk}" if pk else f"c.{fk.column}"
+            checks.append(Check(name, "orphans", f"SELECT COUNT(*) {anti_join}", f"SELECT {key} {anti_join} LIMIT {SAMPLE_SIZE}"))
+            parent = schema.get(fk.ref_table)
+            if parent is not None and parent.primary_key == (fk.ref_column,):
+                continue
+            checks.append(
+                Check(
+                    name,
+                    "join-fanout",
+                    f"SELECT (SELECT COUNT(*) FROM {table.name} c JOIN {fk.ref_table} p ON p.{fk.ref_column} = c.{fk.column})"
+                    f" - (SELECT COUNT(*) FROM {table.name} c WHERE EXISTS"
+                    f" (SELECT 1 FROM {fk.ref_table} p WHERE p.{fk.ref_column} = c.{fk.column}))",
+                    f"SELECT {fk.ref_column} FROM {fk.ref_table} GROUP BY {fk.ref_column} HAVING COUNT(*) > 1 LIMIT {SAMPLE_SIZE}",
+                )
+            )
+        if pk and not mongo:
+            duplicates = f"FROM {table.name} GROUP BY {pk} HAVING COUNT(*) > 1"
+            checks.append(
+                Check(
+                    f"{table.name}.{pk}",
+                    "duplicate-keys",
+                    f"SELECT COUNT(*) FROM (SELECT {pk} {duplicates}) d",
+                    f"SELECT {pk} {duplicates} LIMIT {SAMPLE_SIZE}",
+                )
+            )
+    return checks
+
+
+def _run_sql(url: str, check: Check) -> Violation | None:
+    with get_pool(url).connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(check.count_sql)
+            count = int(cursor.fetchone()[0] or 0)
+            if not count:
+                return None
+            cursor.execute(check.sample_sql)
+            return Violation(check, count, [row[0] for row in cursor.fetchall()])
+        finally:
+            cursor.close()
+
+
+def _run_mongo(url: str, check: Check) -> Violation | None:
+    collection = mongo_client(url)[database_name(url) or "google"][check.collection]
+    counted = list(collection.aggregate(check.pipeline + [{"$count": "n"}]))
+    if not counted:
+        return None
+    samples = [d["_id"] for d in collection.aggregate(check.pipeline + [{"$limit": SAMPLE_SIZE}])]
+    return Violation(check, counted[0]["n"], samples)
+
+
+def validate_consistency(url: str, schema: Schema, workers: int = 4) -> list[Violation]:
+    """Run every derived check in parallel; returns the violations only."""
+    mongo = dialect_for(url) == "mongodb"
+    checks = derive_checks(schema, mongo)
+    if not mongo:
+        pool = get_pool(url)
+        pool.config.size = max(pool.config.size, workers)
+    run = _run_mongo if mongo else _run_sql
+    with ThreadPoolExecutor(workers) as executor:
+        results = executor.map(lambda check: run(url, check), checks)
+        return [v for v in results if v is not None]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Report cross-table consistency violations derived from the schema's foreign keys.")
+    parser.add_argument("url")
+    parser.add_argument("--schema", default=None, help="database artifact, .sql file or refined-DOM .html (default: the database artifact)")
+    parser.add_argument("-j", "--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    schema = load_schema(args.schema)
+    violations = validate_consistency(args.url, schema, args.workers)
+    for violation in violations:
+        samples = ", ".join(str(s) for s in violation.samples)
+        print(f"{violation.check.kind:<15} {violation.check.name}: {violation.count} violation(s), e.g. {samples}")
+    if not violations:
+        print(f"no violations across {len(schema)} tables")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
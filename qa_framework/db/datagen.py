@@ -0,0 +1,292 @@
+"""Seeded, batched test-data generation for the database validation schema.
+
+The generated ``generate_test_data()`` builds ten users one dict at a time
+and the SQL scripts insert fixtures row by row.  :class:`DataGenerator`
+instead produces whole chunks column by column from a seed, keeping every
+foreign key pointing at a parent row that exists, and :func:`load` streams
+those chunks into the fastest bulk path each backend has:
+
+* SQLite - ``executemany`` inside one transaction per chunk;
+* MySQL - a single multi-row ``INSERT ... VALUES (...), (...)`` per chunk;
+* PostgreSQL - ``COPY ... FROM STDIN``;
+* MongoDB - ``insert_many(ordered=False)``.
+
+Chunks are derived from ``(seed, table, offset)`` alone, so any chunk can be
+regenerated independently and two runs with the same seed load identical
+data::
+
+    python -m qa_framework.db.datagen sqlite:///load.db --create --rows users=1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime
+import io
+import random
+import string
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from qa_framework.db import connect, dialect_for
+from qa_framework.db.schema import Column, Schema, Table, load_schema
+
+DEFAULT_CHUNK_SIZE = 5000
+
+#: Child rows per parent row when a table's size is not given explicitly.
+DEFAULT_FANOUT = {"search_history": 5.0, "feedback": 0.5, "settings": 2.0}
+
+_LANGUAGES = ("English", "Spanish", "French", "German", "Hindi", "Japanese", "Portuguese")
+_SETTINGS = ("language", "safe_search", "region", "results_per_page", "theme", "notifications")
+_WORDS = (
+    "google", "search", "news", "weather", "maps", "images", "translate", "python",
+    "playwright", "appium", "database", "login", "shopping", "flights", "music", "video",
+)
+_ALPHANUMERIC = string.ascii_lowercase + string.digits
+_EPOCH = datetime.datetime(2020, 1, 1)
+_SPAN_SECONDS = 5 * 365 * 86400
+
+
+@dataclass
+class LoadStats:
+    table: str
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else float("inf")
+
+
+def plan_rows(schema: Schema, rows: dict[str, int], fanout: dict[str, float] | None = None) -> dict[str, int]:
+    """Resolve the row count of every table.
+
+    Tables missing from ``rows`` get ``fanout`` times the size of the table
+    their first foreign key references (1x without a fanout entry).
+    """
+    fanout = {**DEFAULT_FANOUT, **(fanout or {})}
+    planned: dict[str, int] = {}
+    for table in schema.load_order():
+        if table.name in rows:
+            planned[table.name] = rows[table.name]
+        elif table.foreign_keys and table.foreign_keys[0].ref_table in planned:
+            planned[table.name] = int(planned[table.foreign_keys[0].ref_table] * fanout.get(table.name, 1.0))
+        else:
+            planned[table.name] = 0
+    return planned
+
+
+class DataGenerator:
+    """Deterministic, FK-consistent rows for every table in ``schema``.
+
+    Primary keys are ``1..n`` per table, so a foreign key only needs the
+    size of the table it references to pick a valid parent.
+    """
+
+    def __init__(self, schema: Schema, rows: dict[str, int], seed: int = 0) -> None:
+        self.schema = schema
+        self.rows = rows
+        self.seed = seed
+
+    def chunk(self, table: Table, start: int, stop: int) -> list[tuple]:
+        """Rows ``start..stop-1`` (0-based) of ``table`` as tuples in column order."""
+        rng = random.Random(f"{self.seed}:{table.name}:{start}")
+        n = stop - start
+        ids = range(start + 1, stop + 1)
+        columns = [self._column(table, column, ids, n, rng) for column in table.columns]
+        return list(zip(*columns))
+
+    def chunks(self, table: Table, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[list[tuple]]:
+        total = self.rows.get(table.name, 0)
+        for start in range(0, total, chunk_size):
+            yield self.chunk(table, start, min(start + chunk_size, total))
+
+    def _column(self, table: Table, column: Column, ids: range, n: int, rng: random.Random) -> list[Any]:
+        name = column.name.lower()
+        if column.name in table.primary_key and column.is_integer:
+            return list(ids)
+        fk = table.foreign_key(column.name)
+        if fk is not None:
+            parents = self.rows.get(fk.ref_table, 0)
+            return rng.choices(range(1, parents + 1), k=n) if parents else [None] * n
+        if column.is_integer:
+            return [rng.randrange(1_000_000) for _ in range(n)]
+        if column.type in ("BOOLEAN", "BOOL"):
+            return [rng.random() < 0.5 for _ in range(n)]
+        if column.type in ("DATE", "TIME", "TIMESTAMP", "DATETIME"):
+            moments = [_EPOCH + datetime.timedelta(seconds=rng.randrange(_SPAN_SECONDS)) for _ in range(n)]
+            if column.type == "DATE":
+                return [m.date() for m in moments]
+            return [m.time() for m in moments] if column.type == "TIME" else moments
+        if "email" in name:
+            # Derived from the row id so it stays unique without a lookup.
+            return [f"{table.name[:1]}{i}.{rng.choice(_WORDS)}@example.com" for i in ids]
+        if "language" in name:
+            return rng.choices(_LANGUAGES, k=n)
+        if name == "setting_name":
+            return rng.choices(_SETTINGS, k=n)
+        if "query" in name:
+            return [" ".join(rng.choices(_WORDS, k=rng.randint(1, 4))) for _ in range(n)]
+        if column.type == "TEXT" or name.endswith(("_text", "_results")):
+            return [" ".join(rng.choices(_WORDS, k=rng.randint(4, 16))) for _ in range(n)]
+        length = min(column.length or 16, 16)
+        return ["".join(rng.choices(_ALPHANUMERIC, k=length)) for _ in range(n)]
+
+
+# -- bulk loaders -----------------------------------------------------------
+
+
+def _iso(row: tuple) -> tuple:
+    """Dates and times as ISO strings; SQLite's default adapters are deprecated."""
+    return tuple(v.isoformat(" ") if isinstance(v, datetime.datetime) else v.isoformat() if isinstance(v, (datetime.date, datetime.time)) else v for v in row)
+
+
+def _insert_executemany(conn: Any, table: Table, rows: list[tuple]) -> None:
+    marks = ", ".join("?" for _ in table.columns)
+    with conn:
+        conn.executemany(f"INSERT INTO {table.name} ({', '.join(table.column_names)}) VALUES ({marks})", map(_iso, rows))
+
+
+def _insert_multirow(conn: Any, table: Table, rows: list[tuple]) -> None:
+    row_marks = "(" + ", ".join("%s" for _ in table.columns) + ")"
+    sql = f"INSERT INTO {table.name} ({', '.join(table.column_names)}) VALUES " + ", ".join([row_marks] * len(rows))
+    with conn.cursor() as cursor:
+        cursor.execute(sql, [value for row in rows for value in row])
+    conn.commit()
+
+
+def _copy(conn: Any, table: Table, rows: list[tuple]) -> None:
+    statement = f"COPY {table.name} ({', '.join(table.column_names)}) FROM STDIN"
+    with conn.cursor() as cursor:
+        if hasattr(cursor, "copy"):  # psycopg 3
+            with cursor.copy(statement) as copy:
+                for row in rows:
+                    copy.write_row(row)
+        else:  # psycopg2
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows)
+            buffer.seek(0)
+            cursor.copy_expert(statement + " WITH (FORMAT csv)", buffer)
+    conn.commit()
+
+
+def _bson(value: Any) -> Any:
+    """BSON has datetimes but no bare dates or times."""
+    if isinstance(value, datetime.time):
+        return value.isoformat()
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        return datetime.datetime.combine(value, datetime.time())
+    return value
+
+
+def _insert_many(db: Any, table: Table, rows: list[tuple]) -> None:
+    names = ["_id" if c in table.primary_key else c for c in table.column_names]
+    if any(c.type in ("DATE", "TIME") for c in table.columns):
+        rows = [tuple(map(_bson, row)) for row in rows]
+    db[table.name].insert_many([dict(zip(names, row)) for row in rows], ordered=False)
+
+
+_LOADERS = {
+    "sqlite": _insert_executemany,
+    "mysql": _insert_multirow,
+    "postgresql": _copy,
+    "mongodb": _insert_many,
+}
+
+
+def bulk_insert(conn: Any, dialect: str, table: Table, rows: list[tuple]) -> None:
+    """Insert one chunk of rows (in ``table.columns`` order) with the dialect's bulk path."""
+    _LOADERS[dialect](conn, table, rows)
+
+
+def create_schema(conn: Any, dialect: str, schema: Schema, drop: bool = False) -> None:
+    """Create the schema's tables (MongoDB collections are created on insert)."""
+    if dialect == "mongodb":
+        if drop:
+            for table in schema.values():
+                conn.drop_collection(table.name)
+        return
+    cursor = conn.cursor()
+    try:
+        if drop:
+            for table in reversed(schema.load_order()):
+                cursor.execute(f"DROP TABLE IF EXISTS {table.name}")
+        for table in schema.load_order():
+            cursor.execute(table.ddl.rstrip(";"))
+    finally:
+        cursor.close()
+    conn.commit()
+
+
+def load(
+    url: str,
+    schema: Schema,
+    rows: dict[str, int],
+    seed: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    create: bool = False,
+    conn: Any = None,
+) -> list[LoadStats]:
+    """Generate and bulk-load every table of ``schema``, parents first.
+
+    ``rows`` must already be resolved (see :func:`plan_rows`).  Pass
+    ``conn`` to reuse an open connection (or MongoDB database) for ``url``.
+    """
+    dialect = dialect_for(url)
+    own_connection = conn is None
+    conn = connect(url) if own_connection else conn
+    generator = DataGenerator(schema, rows, seed)
+    stats = []
+    try:
+        if create:
+            create_schema(conn, dialect, schema, drop=True)
+        for table in schema.load_order():
+            started = time.perf_counter()
+            loaded = 0
+            for chunk in generator.chunks(table, chunk_size):
+                bulk_insert(conn, dialect, table, chunk)
+                loaded += len(chunk)
+            stats.append(LoadStats(table.name, loaded, time.perf_counter() - started))
+    finally:
+        if own_connection and dialect != "mongodb":
+            conn.close()
+    return stats
+
+
+def _counts(values: list[str]) -> dict[str, float]:
+    result = {}
+    for value in values:
+        name, _, count = value.partition("=")
+        if not count:
+            raise argparse.ArgumentTypeError(f"expected TABLE=N, got {value!r}")
+        result[name] = float(count)
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-load seeded, FK-consistent test data.")
+    parser.add_argument("url", help="e.g. sqlite:///load.db, postgresql://u:p@localhost/google, mongodb://localhost/google")
+    parser.add_argument("--rows", nargs="*", default=["users=10000"], metavar="TABLE=N")
+    parser.add_argument("--fanout", nargs="*", default=[], metavar="TABLE=X", help="child rows per parent row")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--create", action="store_true", help="drop and recreate the tables first")
+    parser.add_argument("--schema", default=None, help="database artifact, .sql file or refined-DOM .html (default: the database artifact)")
+    args = parser.parse_args(argv)
+
+    schema = load_schema(args.schema)
+    rows = plan_rows(schema, {k: int(v) for k, v in _counts(args.rows).items()}, _counts(args.fanout))
+    stats = load(args.url, schema, rows, args.seed, args.chunk_size, args.create)
+    for s in stats:
+        print(f"{s.table:<20} {s.rows:>10} rows {s.seconds:>8.2f}s {s.rows_per_sec:>12,.0f} rows/s")
+    total_rows = sum(s.rows for s in stats)
+    total_seconds = sum(s.seconds for s in stats)
+    print(f"{'total':<20} {total_rows:>10} rows {total_seconds:>8.2f}s {total_rows / (total_seconds or 1):>12,.0f} rows/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""Deterministic schema inference from the refined DOM.
+
+The database generator used to ask the LLM to "infer" a schema from the
+page on every run, and got a slightly different one each time.  This stage
+does it with rules instead:
+
+* every form control becomes a typed :class:`FieldSpec` (``type=email`` ->
+  ``VARCHAR(255)``, ``number`` -> ``INT``, ``textarea`` -> ``TEXT`` ...),
+  grouped by form into :class:`FormSpec` - the field index;
+* a ``users`` table anchors the schema and takes the fields of login /
+  sign-up forms (any form with a password field);
+* a search form becomes ``search_history``, a feedback form or link
+  ``feedback``, preference links and selects (``?hl=``, language pickers)
+  ``settings``, and any other form ``<form>_submissions`` - each with a
+  ``user_id`` foreign key to ``users``.
+
+The resulting DDL is cached per refined-DOM hash in the generation cache, so
+every database generator for the same page gets the same schema without an
+LLM round-trip::
+
+    ddl, hit = infer_ddl_cached(refined_dom)
+    schema = parse_ddl(ddl)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from qa_framework.db.schema import Schema, parse_ddl
+from qa_framework.dom import DomElement, parse_refined_dom
+from qa_framework.gen_cache import GenerationCache, GenerationKey
+
+#: Bump when the rules change so cached schemas are not reused.
+RULES_VERSION = "schema-inference/2"
+
+_INPUT_TYPES = {
+    "email": ("VARCHAR", 255),
+    "password": ("VARCHAR", 255),
+    "tel": ("VARCHAR", 32),
+    "url": ("VARCHAR", 2048),
+    "number": ("INT", None),
+    "range": ("INT", None),
+    "checkbox": ("BOOLEAN", None),
+    "radio": ("VARCHAR", 50),
+    "date": ("DATE", None),
+    "datetime-local": ("TIMESTAMP", None),
+    "time": ("TIME", None),
+    "search": ("VARCHAR", 255),
+    "text": ("VARCHAR", 255),
+}
+_SKIPPED_TYPES = {"submit", "button", "reset", "hidden", "image", "file"}
+_COLUMN_ALIASES = {"q": "search_query", "query": "search_query", "user": "username", "login": "username", "pass": "password", "hl": "language", "lang": "language"}
+_PREFERENCE_PARAMS = {"hl": "language", "lang": "language", "gl": "region", "theme": "theme", "safe": "safe_search"}
+_ACCOUNT_COLUMNS = ("username", "email", "password")
+_SQL_RESERVED = frozenset(
+    """
+    all and any as asc between by case check column constraint create cross default delete desc distinct
+    drop else end exists foreign from full grant group having in index inner insert intersect into is
+    join key left like limit natural not null offset on or order outer primary range references right
+    select set table then to union unique update user using values when where with
+    """.split()
+)
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    column: str
+    sql_type: str
+    length: int | None
+    required: bool
+    xpath: str
+
+    @property
+    def ddl_type(self) -> str:
+        return f"{self.sql_type}({self.length})" if self.length else self.sql_type
+
+
+@dataclass
+class FormSpec:
+    name: str
+    kind: str  # "login", "search", "feedback" or "form"
+    fields: list[FieldSpec] = field(default_factory=list)
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_") or "field"
+
+
+def _field(element: DomElement) -> FieldSpec | None:
+    if element.tag not in ("input", "textarea", "select"):
+        return None
+    input_type = element.attrs.get("type", "text").lower() if element.tag == "input" else element.tag
+    if input_type in _SKIPPED_TYPES:
+        return None
+    raw = element.attrs.get("name") or element.attrs.get("id") or element.accessible_name
+    column = _COLUMN_ALIASES.get(raw.lower(), _slug(raw))
+    if element.tag == "textarea":
+        sql_type, length = ("VARCHAR", 255) if column == "search_query" else ("TEXT", None)
+    elif element.tag == "select":
+        sql_type, length = "VARCHAR", 50
+    else:
+        sql_type, length = _INPUT_TYPES.get(input_type, ("VARCHAR", 255))
+    return FieldSpec(column, sql_type, length, "required" in element.attrs, element.xpath)
+
+
+def _form_kind(name: str, elements: list[DomElement], fields: list[FieldSpec]) -> str:
+    text = " ".join([name] + [e.accessible_name for e in elements] + [e.attrs.get("role", "") for e in elements]).lower()
+    if any(f.column == "password" for f in fields):
+        return "login"
+    if "search" in text or any(f.column == "search_query" for f in fields):
+        return "search"
+    if "feedback" in text or "contact" in text:
+        return "feedback"
+    return "form"
+
+
+def field_index(html: str) -> list[FormSpec]:
+    """Forms on the page with their typed fields, in document order."""
+    grouped: dict[str, list[DomElement]] = {}
+    for element in parse_refined_dom(html):
+        if element.form is not None:
+            grouped.setdefault(element.form, []).append(element)
+        elif element.tag in ("input", "textarea", "select", "button"):
+            # Script-driven pages often have no <form>; treat them as one.
+            grouped.setdefault("page", []).append(element)
+    forms = []
+    for name, elements in grouped.items():
+        fields: list[FieldSpec] = []
+        for element in elements:
+            spec = _field(element)
+            if spec is not None and all(f.column != spec.column for f in fields):
+                fields.append(spec)
+        forms.append(FormSpec(_slug(urlsplit(name).path or name), _form_kind(name, elements, fields), fields))
+    return forms
+
+
+def _preferences(html: str) -> list[str]:
+    """Preference settings the page exposes outside forms (``?hl=`` links)."""
+    found: list[str] = []
+    for element in parse_refined_dom(html):
+        href = element.attrs.get("href", "")
+        for param in parse_qs(urlsplit(href).query):
+            setting = _PREFERENCE_PARAMS.get(param)
+            if setting and setting not in found:
+                found.append(setting)
+    return found
+
+
+def _table(name: str, columns: list[tuple[str, str]], user_fk: bool) -> str:
+    lines = ["  id INT PRIMARY KEY"]
+    taken = {"id"}
+    if user_fk:
+        lines.append("  user_id INT")
+        taken.add("user_id")
+    for column, ddl_type in columns:
+        # A field called ``id``, ``user_id`` or ``order`` must not clash with
+        # the generated keys or an SQL keyword.
+        unique = f"form_{column}" if column in taken or column in _SQL_RESERVED else column
+        n = 2
+        while unique in taken:
+            unique, n = f"form_{column}_{n}", n + 1
+        taken.add(unique)
+        lines.append(f"  {unique} {ddl_type}")
+    if user_fk:
+        lines.append("  FOREIGN KEY (user_id) REFERENCES users(id)")
+    return f"CREATE TABLE {name} (\n" + ",\n".join(lines) + "\n);"
+
+
+def infer_ddl(html: str) -> str:
+    """``CREATE TABLE`` statements for the data the page's forms and links imply."""
+    forms = field_index(html)
+    preferences = _preferences(html)
+    for form in forms:
+        preferences += [f.column for f in form.fields if f.column in _PREFERENCE_PARAMS.values() and f.column not in preferences]
+    users: dict[str, str] = {"email": "VARCHAR(255)", "password": "VARCHAR(255)"}
+    tables: dict[str, list[tuple[str, str]]] = {}
+    for form in forms:
+        if form.kind == "login":
+            for spec in form.fields:
+                users.setdefault(spec.column, spec.ddl_type)
+            continue
+        if form.kind == "search":
+            name = "search_history"
+            columns = [(f.column, f.ddl_type) for f in form.fields] + [("search_results", "TEXT")]
+        elif form.kind == "feedback":
+            name, columns = "feedback", [(f.column, f.ddl_type) for f in form.fields] or [("feedback_text", "TEXT")]
+        else:
+            name, columns = f"{form.name}_submissions", [(f.column, f.ddl_type) for f in form.fields]
+        existing = tables.setdefault(name, [])
+        existing.extend(c for c in columns if c[0] not in {e[0] for e in existing})
+    if "feedback" not in tables and re.search(r"\bfeedback\b", html, re.IGNORECASE):
+        tables["feedback"] = [("feedback_text", "TEXT")]
+    if "language" in preferences:
+        users.setdefault("language", "VARCHAR(50)")
+    if preferences:
+        tables.setdefault("settings", [("setting_name", "VARCHAR(50)"), ("setting_value", "VARCHAR(255)")])
+
+    ordered_users = [(c, users[c]) for c in _ACCOUNT_COLUMNS if c in users] + [(c, t) for c, t in users.items() if c not in _ACCOUNT_COLUMNS]
+    statements = [_table("users", ordered_users, user_fk=False)]
+    statements += [_table(name, columns, user_fk=True) for name, columns in tables.items()]
+    return "\n\n".join(statements) + "\n"
+
+
+def infer_ddl_cached(html: str, cache: GenerationCache | None = None) -> tuple[str, bool]:
+    """Return ``(ddl, hit)``; the DDL is computed once per refined-DOM hash."""
+    cache = cache or GenerationCache()
+    key = GenerationKey("schema_inference", html, RULES_VERSION)
+    return cache.get_or_generate(key, lambda: infer_ddl(html))
+
+
+def infer_schema(html: str, cache: GenerationCache | None = None) -> Schema:
+    return parse_ddl(infer_ddl_cached(html, cache)[0])
+
+
+def prompt_section(html: str, cache: GenerationCache | None = None) -> str:
+    """The schema as a Markdown section to put in database-generator prompts."""
+    ddl, _ = infer_ddl_cached(html, cache)
+    return "### Database Schema\n\nUse exactly this schema:\n\n```sql\n" + ddl + "```\n"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Infer a relational schema from a refined DOM.")
+    parser.add_argument("refined_dom", help="HTML file")
+    parser.add_argument("--fields", action="store_true", help="print the field index as JSON instead of DDL")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    html = Path(args.refined_dom).read_text(encoding="utf-8")
+    if args.fields:
+        print(json.dumps([asdict(form) for form in field_index(html)], indent=2))
+        return 0
+    if args.no_cache:
+        print(infer_ddl(html), end="")
+        return 0
+    ddl, hit = infer_ddl_cached(html)
+    print(ddl, end="")
+    print(f"-- schema {'from cache' if hit else 'inferred'}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Per-test isolation for the database validation suite.
+
+The generated scripts insert rows with fixed ids (1-6) and clean up with
+``delete_many({})`` or ad-hoc ``DELETE`` statements, so tests cannot run in
+parallel and teardown costs grow with the data.  Instead:
+
+* SQL tests run inside a transaction that is rolled back afterwards
+  (:meth:`TransactionalIsolation.transaction`); shared fixture rows can be
+  loaded once and each test wrapped in a savepoint
+  (:meth:`TransactionalIsolation.savepoint`).  Rolling back is O(1) in the
+  amount of data the test wrote.  Code under test must not ``COMMIT`` itself,
+  and on MySQL DDL commits implicitly, so DDL belongs in session setup.
+* MongoDB tests get a throwaway database that is dropped afterwards
+  (:meth:`MongoIsolation.throwaway_database`), or restore collections from a
+  server-side snapshot (:meth:`MongoIsolation.snapshot` /
+  :meth:`MongoIsolation.restore`) when a large fixture set is shared.
+* Parallel workers draw primary keys from disjoint ranges
+  (:class:`KeyAllocator`) so concurrent uncommitted inserts never wait on
+  each other's unique-index locks.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import re
+import uuid
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+#: Keys available to each worker per table.
+DEFAULT_KEY_BLOCK = 1_000_000
+
+
+def worker_index() -> int:
+    """Index of this parallel worker: pytest-xdist's ``gwN`` or ``QA_WORKER``."""
+    worker = os.environ.get("PYTEST_XDIST_WORKER") or os.environ.get("QA_WORKER", "0")
+    match = re.search(r"\d+", worker)
+    return int(match[0]) if match else 0
+
+
+class KeyAllocator:
+    """Primary keys from a range no other worker uses.
+
+    Worker ``w`` gets ``w * block + 1 .. (w + 1) * block`` for every table;
+    worker 0's range starts above ``reserved`` so the fixture ids the
+    generated scripts hard-code stay free.
+    """
+
+    def __init__(self, worker: int | None = None, block: int = DEFAULT_KEY_BLOCK, reserved: int = 1000) -> None:
+        self.worker = worker_index() if worker is None else worker
+        self.block = block
+        start = self.worker * block + 1 + (reserved if self.worker == 0 else 0)
+        self._start = start
+        self._counters: dict[str, Iterator[int]] = {}
+
+    def next(self, table: str) -> int:
+        counter = self._counters.setdefault(table, itertools.count(self._start))
+        key = next(counter)
+        if key > (self.worker + 1) * self.block:
+            raise OverflowError(f"worker {self.worker} exhausted its key block for {table}")
+        return key
+
+
+class TransactionalIsolation:
+    """Run work against a DB-API connection and throw it away afterwards."""
+
+    def __init__(self, conn: Any, dialect: str) -> None:
+        self.conn = conn
+        self.dialect = dialect
+        self._savepoints = itertools.count(1)
+
+    def _execute(self, sql: str) -> None:
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql)
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[Any]:
+        """Yield the connection inside a transaction that is always rolled back."""
+        if self.dialect == "sqlite":
+            # Take over transaction control from the sqlite3 module so its
+            # implicit COMMIT before DDL cannot end our transaction.
+            previous, self.conn.isolation_level = self.conn.isolation_level, None
+            self._execute("BEGIN")
+        else:
+            self.conn.rollback()  # start from a clean transaction
+        try:
+            yield self.conn
+        finally:
+            self.conn.rollback()
+            if self.dialect == "sqlite":
+                self.conn.isolation_level = previous
+
+    @contextmanager
+    def savepoint(self) -> Iterator[Any]:
+        """Yield the connection; everything done inside is undone on exit.
+
+        Must be used inside :meth:`transaction` (or any open transaction).
+        """
+        name = f"qa_sp_{next(self._savepoints)}"
+        self._execute(f"SAVEPOINT {name}")
+        try:
+            yield self.conn
+        finally:
+            self._execute(f"ROLLBACK TO SAVEPOINT {name}")
+            self._execute(f"RELEASE SAVEPOINT {name}")
+
+
+class MongoIsolation:
+    """Throwaway databases and collection snapshots for MongoDB tests.
+
+    Multi-document transactions need a replica set, which local ``mongod``
+    stand-ins usually are not, so isolation is by database instead.
+    """
+
+    SNAPSHOT_PREFIX = "__snapshot_"
+
+    def __init__(self, client: Any, base_name: str = "google") -> None:
+        self.client = client
+        self.base_name = base_name
+
+    @contextmanager
+    def throwaway_database(self) -> Iterator[Any]:
+        """Yield a database unique to this worker and test; drop it on exit."""
+        name = f"{self.base_name}_w{worker_index()}_{uuid.uuid4().hex[:8]}"
+        try:
+            yield self.client[name]
+        finally:
+            self.client.drop_database(name)
+
+    def snapshot(self, db: Any, collections: list[str]) -> None:
+        """Copy ``collections`` server-side so :meth:`restore` can reset them."""
+        for name in collections:
+            db[name].aggregate([{"$match": {}}, {"$out": self.SNAPSHOT_PREFIX + name}])
+
+    def restore(self, db: Any, collections: list[str]) -> None:
+        """Replace ``collections`` with their snapshots without moving data to the client."""
+        for name in collections:
+            db[self.SNAPSHOT_PREFIX + name].aggregate([{"$match": {}}, {"$out": name}])
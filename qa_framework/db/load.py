@@ -0,0 +1,355 @@
+"""Concurrent load harness for the database validation schema.
+
+The generated "concurrent access" checks are a single ``INSERT`` or one
+thread inserting ``_id: 6``.  :func:`run_load` instead drives ``workers``
+concurrent clients for a fixed duration with a read/write mix over ``users``
+and ``search_history``:
+
+* reads - a user by primary key, a user's search history (the FK lookup);
+* writes - new search-history rows, e-mail updates on random users, and new
+  users, a ``conflict_ratio`` share of which reuse existing ids on purpose.
+
+Each operation commits on its own.  Failures are classified as duplicate-key
+conflicts, deadlocks / lock timeouts or other errors, and the report gives
+throughput and p50/p95/p99 latency per operation::
+
+    python -m qa_framework.db.load sqlite:///load.db --seed-users 10000 -w 16 --driver thread --duration 10
+
+Drivers: ``thread`` (one pooled connection per thread), ``process`` (one
+pool per process, sidestepping the GIL for client-side work) and ``asyncio``
+(a coroutine per client; the DB-API calls run on a thread pool because the
+drivers are blocking).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any
+
+from qa_framework.bench import percentile
+from qa_framework.db import dialect_for, placeholder
+from qa_framework.db.isolation import KeyAllocator
+from qa_framework.db.pool import get_pool, mongo_client
+
+DRIVERS = ("thread", "process", "asyncio")
+
+OPERATIONS = ("read_user", "read_history", "insert_history", "update_user", "insert_user")
+
+
+@dataclass
+class LoadConfig:
+    url: str
+    workers: int = 8
+    driver: str = "thread"
+    duration: float = 10.0
+    read_ratio: float = 0.8
+    conflict_ratio: float = 0.05
+    users: int = 1000  # size of the users table the workload addresses
+    seed: int = 0
+    # Highest existing id per table; filled in by run_load so new keys start above it.
+    key_floor: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class OperationStats:
+    count: int = 0
+    errors: int = 0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+@dataclass
+class LoadReport:
+    config: LoadConfig
+    elapsed: float
+    operations: dict[str, OperationStats] = field(default_factory=dict)
+    duplicate_keys: int = 0
+    deadlocks: int = 0
+    other_errors: int = 0
+    error_samples: list[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(s.count for s in self.operations.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["total"] = self.total
+        data["throughput"] = self.throughput
+        return data
+
+
+def classify_error(exc: BaseException) -> str:
+    """``"duplicate_key"``, ``"deadlock"`` or ``"other"`` for a driver exception."""
+    code = getattr(exc, "pgcode", None) or getattr(exc, "sqlstate", None) or getattr(exc, "code", None)
+    if not code and getattr(exc, "args", None) and isinstance(exc.args[0], int):
+        code = exc.args[0]  # pymysql: (errno, message)
+    text = str(exc).lower()
+    if code in ("23505", 1062, 11000) or "unique constraint" in text or "duplicate" in text:
+        return "duplicate_key"
+    if code in ("40P01", "40001", 1213, 1205) or "deadlock" in text or "database is locked" in text:
+        return "deadlock"
+    return "other"
+
+
+# -- operations -------------------------------------------------------------
+
+
+class _SqlClient:
+    def __init__(self, config: LoadConfig, worker: int) -> None:
+        self.pool = _sql_pool(config.url)
+        mark = placeholder(self.pool.dialect)
+        self.sql = {
+            "read_user": f"SELECT id, email, password, language FROM users WHERE id = {mark}",
+            "read_history": f"SELECT id, search_query FROM search_history WHERE user_id = {mark}",
+            "insert_history": f"INSERT INTO search_history (id, user_id, search_query, search_results) VALUES ({mark}, {mark}, {mark}, {mark})",
+            "update_user": f"UPDATE users SET email = {mark} WHERE id = {mark}",
+            "insert_user": f"INSERT INTO users (id, email, password, language) VALUES ({mark}, {mark}, {mark}, {mark})",
+        }
+
+    def execute(self, operation: str, params: tuple) -> None:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(self.sql[operation], params)
+                if operation.startswith("read"):
+                    cursor.fetchall()
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+
+class _MongoClient:
+    def __init__(self, config: LoadConfig, worker: int) -> None:
+        from qa_framework.db import database_name
+
+        self.db = mongo_client(config.url)[database_name(config.url) or "google"]
+
+    def execute(self, operation: str, params: tuple) -> None:
+        if operation == "read_user":
+            self.db.users.find_one({"_id": params[0]})
+        elif operation == "read_history":
+            list(self.db.search_history.find({"user_id": params[0]}, {"search_query": 1}))
+        elif operation == "insert_history":
+            self.db.search_history.insert_one(dict(zip(("_id", "user_id", "search_query", "search_results"), params)))
+        elif operation == "update_user":
+            self.db.users.update_one({"_id": params[1]}, {"$set": {"email": params[0]}})
+        else:
+            self.db.users.insert_one(dict(zip(("_id", "email", "password", "language"), params)))
+
+
+def _prepare_sqlite(conn: Any) -> None:
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+
+
+def _sql_pool(url: str) -> Any:
+    return get_pool(url, on_connect=_prepare_sqlite if dialect_for(url) == "sqlite" else None)
+
+
+class _Workload:
+    """Picks the next operation and its parameters for one worker."""
+
+    def __init__(self, config: LoadConfig, worker: int) -> None:
+        self.config = config
+        self.rng = random.Random(f"{config.seed}:{worker}")
+        # Block 0 is left to the seeded data; every block sits above the
+        # rows earlier runs left behind.
+        self.keys = KeyAllocator(worker + 1, block=10_000_000)
+
+    def _new_key(self, table: str) -> int:
+        return self.config.key_floor.get(table, 0) + self.keys.next(table)
+
+    def next(self) -> tuple[str, tuple]:
+        rng, users = self.rng, max(self.config.users, 1)
+        user = rng.randint(1, users)
+        if rng.random() < self.config.read_ratio:
+            return ("read_user", (user,)) if rng.random() < 0.5 else ("read_history", (user,))
+        kind = rng.choice(("insert_history", "update_user", "insert_user"))
+        if kind == "insert_history":
+            return kind, (self._new_key("search_history"), user, "load test", "")
+        if kind == "update_user":
+            return kind, (f"u{user}.updated@example.com", user)
+        user_id = user if rng.random() < self.config.conflict_ratio else self._new_key("users")
+        return kind, (user_id, f"load{user_id}@example.com", "password", "English")
+
+
+def _record(samples: dict[str, list], operation: str, started: int, error: BaseException | None) -> None:
+    samples.setdefault(operation, []).append((time.perf_counter_ns() - started, classify_error(error) if error else None))
+    if error is not None and len(samples.setdefault("_errors", [])) < 5:
+        samples["_errors"].append(f"{operation}: {type(error).__name__}: {error}")
+
+
+def _client(config: LoadConfig, worker: int) -> Any:
+    return _MongoClient(config, worker) if dialect_for(config.url) == "mongodb" else _SqlClient(config, worker)
+
+
+def _run_worker(config: LoadConfig, worker: int) -> dict[str, list]:
+    client = _client(config, worker)
+    workload = _Workload(config, worker)
+    samples: dict[str, list] = {}
+    deadline = time.perf_counter() + config.duration
+    while time.perf_counter() < deadline:
+        operation, params = workload.next()
+        started = time.perf_counter_ns()
+        try:
+            client.execute(operation, params)
+        except Exception as exc:
+            _record(samples, operation, started, exc)
+        else:
+            _record(samples, operation, started, None)
+    return samples
+
+
+async def _run_async(config: LoadConfig) -> list[dict[str, list]]:
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(config.workers))
+
+    async def client_loop(worker: int) -> dict[str, list]:
+        client = await asyncio.to_thread(_client, config, worker)
+        workload = _Workload(config, worker)
+        samples: dict[str, list] = {}
+        deadline = time.perf_counter() + config.duration
+        while time.perf_counter() < deadline:
+            operation, params = workload.next()
+            started = time.perf_counter_ns()
+            try:
+                await asyncio.to_thread(client.execute, operation, params)
+            except Exception as exc:
+                _record(samples, operation, started, exc)
+            else:
+                _record(samples, operation, started, None)
+        return samples
+
+    return await asyncio.gather(*(client_loop(w) for w in range(config.workers)))
+
+
+def key_floor(url: str, tables: tuple[str, ...] = ("users", "search_history")) -> dict[str, int]:
+    """The highest id in each table, so inserts only conflict when the workload means them to."""
+    if dialect_for(url) == "mongodb":
+        from qa_framework.db import database_name
+
+        db = mongo_client(url)[database_name(url) or "google"]
+        floor = {}
+        for table in tables:
+            top = db[table].find_one({"_id": {"$type": "number"}}, {"_id": 1}, sort=[("_id", -1)])
+            floor[table] = int(top["_id"]) if top else 0
+        return floor
+    with _sql_pool(url).connection() as conn:
+        cursor = conn.cursor()
+        try:
+            floor = {}
+            for table in tables:
+                cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+                floor[table] = int(cursor.fetchone()[0])
+            conn.commit()
+        finally:
+            cursor.close()
+    return floor
+
+
+def run_load(config: LoadConfig) -> LoadReport:
+    if config.driver not in DRIVERS:
+        raise ValueError(f"driver must be one of {', '.join(DRIVERS)}")
+    if not config.key_floor:
+        config = replace(config, key_floor=key_floor(config.url))
+    if dialect_for(config.url) != "mongodb" and config.driver != "process":
+        # Enough connections for every concurrent client in this process.
+        pool = _sql_pool(config.url)
+        pool.config.size = max(pool.config.size, config.workers)
+    started = time.perf_counter()
+    if config.driver == "thread":
+        with ThreadPoolExecutor(config.workers) as executor:
+            results = list(executor.map(_run_worker, [config] * config.workers, range(config.workers)))
+    elif config.driver == "process":
+        with ProcessPoolExecutor(config.workers) as executor:
+            results = list(executor.map(_run_worker, [config] * config.workers, range(config.workers)))
+    else:
+        results = asyncio.run(_run_async(config))
+    report = LoadReport(config, time.perf_counter() - started)
+
+    merged: dict[str, list] = {}
+    for samples in results:
+        for operation, values in samples.items():
+            merged.setdefault(operation, []).extend(values)
+    report.error_samples = merged.pop("_errors", [])[:5]
+    for operation in OPERATIONS:
+        values = merged.get(operation, [])
+        if not values:
+            continue
+        latencies = sorted(ns / 1e6 for ns, _ in values)
+        outcomes = [outcome for _, outcome in values if outcome]
+        report.operations[operation] = OperationStats(
+            count=len(values),
+            errors=len(outcomes),
+            p50_ms=percentile(latencies, 50),
+            p95_ms=percentile(latencies, 95),
+            p99_ms=percentile(latencies, 99),
+            max_ms=latencies[-1],
+        )
+        report.duplicate_keys += outcomes.count("duplicate_key")
+        report.deadlocks += outcomes.count("deadlock")
+        report.other_errors += outcomes.count("other")
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Drive concurrent mixed read/write load against the test schema.")
+    parser.add_argument("url")
+    parser.add_argument("-w", "--workers", type=int, default=8)
+    parser.add_argument("--driver", choices=DRIVERS, default="thread")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--read-ratio", type=float, default=0.8)
+    parser.add_argument("--conflict-ratio", type=float, default=0.05, help="share of user inserts reusing an existing id")
+    parser.add_argument("--users", type=int, default=1000, help="users already in the table")
+    parser.add_argument("--seed-users", type=int, default=0, help="recreate the schema and load this many users first")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--schema", default=None, help="schema to seed: database artifact, .sql file or refined-DOM .html")
+    parser.add_argument("--json", default=None, help="write the report here")
+    args = parser.parse_args(argv)
+
+    if args.seed_users:
+        from qa_framework.db.datagen import load, plan_rows
+        from qa_framework.db.schema import load_schema
+
+        schema = load_schema(args.schema)
+        load(args.url, schema, plan_rows(schema, {"users": args.seed_users}), seed=args.seed, create=True)
+        args.users = args.seed_users
+    config = LoadConfig(
+        args.url, args.workers, args.driver, args.duration, args.read_ratio, args.conflict_ratio, args.users, args.seed
+    )
+    report = run_load(config)
+
+    print(f"{report.total} ops in {report.elapsed:.2f}s = {report.throughput:,.0f} ops/s ({config.driver}, {config.workers} workers)")
+    for operation, stats in report.operations.items():
+        print(
+            f"  {operation:<15} {stats.count:>8} ops {stats.errors:>6} err"
+            f"  p50 {stats.p50_ms:7.2f}ms  p95 {stats.p95_ms:7.2f}ms  p99 {stats.p99_ms:7.2f}ms  max {stats.max_ms:7.2f}ms"
+        )
+    print(f"  duplicate keys {report.duplicate_keys}, deadlocks/lock timeouts {report.deadlocks}, other errors {report.other_errors}")
+    for sample in report.error_samples:
+        print(f"    {sample}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
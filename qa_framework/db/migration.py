@@ -0,0 +1,265 @@
+"""Chunked, checksummed verification of table migrations.
+
+The generated migration check copies ``users`` into ``users_new`` and then
+runs ``SELECT * FROM users_new``, pulling the whole table to the client.
+:func:`verify_migration` instead splits the key space into chunks of about
+``chunk_size`` source rows, bounded by keys the source actually holds, and
+asks each database for one ``(count, sum of row hashes)`` pair per chunk, so
+only two numbers per chunk cross the wire.  Keys may be sparse or of any
+orderable type.  Chunks run in parallel on pooled connections; a chunk
+whose aggregates differ is split again and again until the ranges are small
+enough to compare row hashes key by key.
+
+Row hashes are the first 32 bits of ``MD5`` over the columns joined with
+``|``, ``NULL`` written as ``\\N`` so a value moving to a neighbouring column
+changes the hash.  They are computed by the server on PostgreSQL and MySQL
+and by a registered function on SQLite, so source and target may even be
+different dialects as long as the values render to the same text::
+
+    python -m qa_framework.db.migration sqlite:///google.db users users_new --key id -j 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from qa_framework.db import dialect_for, placeholder
+from qa_framework.db.pool import ConnectionPool, get_pool
+
+DEFAULT_CHUNK_SIZE = 100_000
+#: Ranges at most this wide are compared row by row.
+LEAF_SIZE = 256
+#: Sub-ranges a mismatching chunk is split into per drill-down step.
+FANOUT = 16
+
+
+@dataclass
+class RowDiff:
+    key: Any
+    kind: str  # "missing" (only in source), "extra" (only in target) or "changed"
+
+
+@dataclass
+class MigrationReport:
+    chunks: int = 0
+    mismatched_chunks: int = 0
+    queries: int = 0
+    source_rows: int = 0
+    target_rows: int = 0
+    diffs: list[RowDiff] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.diffs and self.source_rows == self.target_rows
+
+
+#: How a NULL column is written into the hashed text, in every dialect.
+NULL_MARKER = "\\N"
+
+#: ``NULL_MARKER`` as a MySQL expression; a ``'\\N'`` literal depends on the
+#: server's ``NO_BACKSLASH_ESCAPES`` mode.
+_MYSQL_NULL = "CONCAT(CHAR(92 USING utf8mb4), 'N')"
+
+
+def _sqlite_row_hash(*values: Any) -> int:
+    text = "|".join(NULL_MARKER if v is None else str(v) for v in values)
+    return int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _prepare(conn: Any) -> None:
+    conn.create_function("qa_row_hash", -1, _sqlite_row_hash, deterministic=True)
+
+
+def _row_hash_sql(dialect: str, columns: list[str]) -> str:
+    if dialect == "sqlite":
+        return f"qa_row_hash({', '.join(columns)})"
+    if dialect == "postgresql":
+        joined = "concat_ws('|', " + ", ".join(f"COALESCE({c}::text, '{NULL_MARKER}')" for c in columns) + ")"
+        return f"('x' || lpad(substr(md5({joined}), 1, 8), 16, '0'))::bit(64)::bigint"
+    if dialect == "mysql":
+        joined = f"CONCAT_WS('|', {', '.join(f'IFNULL({c}, {_MYSQL_NULL})' for c in columns)})"
+        return f"CAST(CONV(SUBSTRING(MD5({joined}), 1, 8), 16, 10) AS UNSIGNED)"
+    raise ValueError(f"migration verification needs a SQL database, not {dialect}")
+
+
+class _Side:
+    """One table on one database, queried through its pool."""
+
+    def __init__(self, url: str, table: str, key: str, columns: list[str]) -> None:
+        self.dialect = dialect_for(url)
+        self.pool: ConnectionPool = get_pool(url)
+        self.queries = 0
+        self._lock = threading.Lock()
+        self.table = table
+        self.key = key
+        self._mark = placeholder(self.dialect)
+        self._hashed = _row_hash_sql(self.dialect, columns)
+
+    def _where(self, low: Any, high: Any) -> tuple[str, tuple]:
+        """``low <= key < high``; a ``None`` bound is open."""
+        clauses, params = ["1 = 1"], []
+        if low is not None:
+            clauses.append(f"{self.key} >= {self._mark}")
+            params.append(low)
+        if high is not None:
+            clauses.append(f"{self.key} < {self._mark}")
+            params.append(high)
+        return " AND ".join(clauses), tuple(params)
+
+    def query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            self.queries += 1
+        with self.pool.connection() as conn:
+            if self.dialect == "sqlite":
+                # Pooled connections may predate us; registering is cheap.
+                _prepare(conn)
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+    def boundaries(self, low: Any, high: Any, every: int) -> list[Any]:
+        """Every ``every``-th key in ``[low, high)``, starting with the first."""
+        where, params = self._where(low, high)
+        return [
+            row[0]
+            for row in self.query(
+                f"SELECT {self.key} FROM (SELECT {self.key}, ROW_NUMBER() OVER (ORDER BY {self.key}) AS qa_rn"
+                f" FROM {self.table} WHERE {where}) numbered WHERE (qa_rn - 1) % {int(every)} = 0 ORDER BY {self.key}",
+                params,
+            )
+        ]
+
+    def aggregate(self, low: Any, high: Any) -> tuple[int, int]:
+        where, params = self._where(low, high)
+        count, total = self.query(f"SELECT COUNT(*), SUM({self._hashed}) FROM {self.table} WHERE {where}", params)[0]
+        return int(count), int(total or 0)
+
+    def row_hashes(self, low: Any, high: Any) -> dict[Any, int]:
+        where, params = self._where(low, high)
+        return {key: int(value) for key, value in self.query(f"SELECT {self.key}, {self._hashed} FROM {self.table} WHERE {where}", params)}
+
+
+def _split(low: Any, high: Any, cuts: list[Any]) -> list[tuple[Any, Any]]:
+    """``[low, high)`` cut at ``cuts`` (sorted keys inside it); empty pieces dropped."""
+    edges = [low] + [c for c in cuts if c != low] + [high]
+    return list(zip(edges, edges[1:]))
+
+
+def table_columns(url: str, table: str) -> list[str]:
+    with get_pool(url).connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"SELECT * FROM {table} WHERE 1 = 0")
+            return [d[0] for d in cursor.description]
+        finally:
+            cursor.close()
+
+
+def verify_migration(
+    source_url: str,
+    target_url: str,
+    source_table: str,
+    target_table: str,
+    key: str = "id",
+    columns: list[str] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 4,
+    max_diffs: int = 100,
+) -> MigrationReport:
+    """Compare two tables chunk by chunk; only differing chunks are drilled into."""
+    if columns is None:
+        target_columns = set(table_columns(target_url, target_table))
+        columns = [c for c in table_columns(source_url, source_table) if c in target_columns]
+    source = _Side(source_url, source_table, key, columns)
+    target = _Side(target_url, target_table, key, columns)
+    for side in (source, target):
+        side.pool.config.size = max(side.pool.config.size, workers)
+
+    # The first chunk is open below and the last open above, so target keys
+    # outside the source's range still land in a chunk.
+    ranges = _split(None, None, source.boundaries(None, None, chunk_size))
+    report = MigrationReport(chunks=len(ranges))
+
+    def check(bounds: tuple[Any, Any]) -> tuple[tuple[Any, Any], tuple[int, int], tuple[int, int]]:
+        return bounds, source.aggregate(*bounds), target.aggregate(*bounds)
+
+    def drill(low: Any, high: Any, before: tuple[int, int], after: tuple[int, int]) -> list[RowDiff]:
+        # Split on the keys of the side with more rows here, so every piece
+        # holds at most 1/FANOUT of them.
+        larger = source if before[0] >= after[0] else target
+        cuts = larger.boundaries(low, high, -(-max(before[0], after[0]) // FANOUT))
+        pieces = _split(low, high, cuts)
+        if max(before[0], after[0]) <= LEAF_SIZE or len(pieces) < 2:
+            old, new = source.row_hashes(low, high), target.row_hashes(low, high)
+            diffs = [RowDiff(k, "missing") for k in old if k not in new]
+            diffs += [RowDiff(k, "extra") for k in new if k not in old]
+            diffs += [RowDiff(k, "changed") for k in old if k in new and old[k] != new[k]]
+            return sorted(diffs, key=lambda d: d.key)
+        diffs = []
+        for sub in pieces:
+            sub_before, sub_after = source.aggregate(*sub), target.aggregate(*sub)
+            if sub_before != sub_after:
+                diffs.extend(drill(*sub, sub_before, sub_after))
+            if len(diffs) >= max_diffs:
+                break
+        return diffs
+
+    with ThreadPoolExecutor(workers) as executor:
+        results = list(executor.map(check, ranges))
+        mismatched = []
+        for bounds, before, after in results:
+            report.source_rows += before[0]
+            report.target_rows += after[0]
+            if before != after:
+                mismatched.append((*bounds, before, after))
+        report.mismatched_chunks = len(mismatched)
+        for diffs in executor.map(lambda m: drill(*m), mismatched):
+            report.diffs.extend(diffs[: max_diffs - len(report.diffs)])
+    report.queries = source.queries + target.queries
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify a table migration with chunked server-side hashes.")
+    parser.add_argument("source_url")
+    parser.add_argument("source_table")
+    parser.add_argument("target_table")
+    parser.add_argument("--target-url", default=None, help="defaults to the source URL")
+    parser.add_argument("--key", default="id")
+    parser.add_argument("--columns", nargs="*", default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("-j", "--workers", type=int, default=4)
+    parser.add_argument("--max-diffs", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    report = verify_migration(
+        args.source_url,
+        args.target_url or args.source_url,
+        args.source_table,
+        args.target_table,
+        args.key,
+        args.columns,
+        args.chunk_size,
+        args.workers,
+        args.max_diffs,
+    )
+    print(
+        f"{report.source_rows} source rows, {report.target_rows} target rows, "
+        f"{report.chunks} chunks ({report.mismatched_chunks} mismatched), {report.queries} queries"
+    )
+    for diff in report.diffs:
+        print(f"  {diff.kind:<8} {args.key}={diff.key}")
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""Query-plan regression checks for the generated SQL.
+
+The generated "performance testing" sections run ``EXPLAIN SELECT ...`` and
+print a wall-clock time nobody compares.  This module captures each query's
+plan in structured form (``EXPLAIN (FORMAT JSON)`` on PostgreSQL,
+``EXPLAIN FORMAT=JSON`` on MySQL, ``EXPLAIN QUERY PLAN`` on SQLite), reduces
+it to the table accesses, estimated cost and estimated rows, and compares it
+with a stored baseline.  A run fails when a table that was read through an
+index is now scanned sequentially, or when cost or rows grow beyond a ratio
+(SQLite reports neither, so only access paths are compared there).
+
+Foreign-key columns without an index whose leading column they are (such
+as ``search_history.user_id`` in the inferred schema) are reported too::
+
+    python -m qa_framework.db.plans postgresql://localhost/google --baseline plan_baselines.json
+    python -m qa_framework.db.plans postgresql://localhost/google --baseline plan_baselines.json --update
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from qa_framework.artifacts import read_code_blocks
+from qa_framework.db import connect, dialect_for
+from qa_framework.db.schema import DEFAULT_ARTIFACT, ForeignKey, Schema, Table, load_schema
+
+_EXPLAIN = re.compile(r"^\s*EXPLAIN\s+(?:\([^)]*\)\s*|ANALYZE\s+|FORMAT\s*=\s*\w+\s+)*(SELECT\b.*?);", re.IGNORECASE | re.MULTILINE | re.DOTALL)
+_SQLITE_DETAIL = re.compile(r"^(SCAN|SEARCH)\s+(?:TABLE\s+)?(\w+)(?:\s+AS\s+\w+)?(?:\s+USING\s+(COVERING\s+INDEX|INDEX|INTEGER PRIMARY KEY|PRIMARY KEY)\s*(\w+)?)?")
+
+
+@dataclass(frozen=True)
+class Access:
+    """How one table is read: ``"seq_scan"``, ``"index"`` or ``"other"``."""
+
+    table: str
+    method: str
+    index: str | None = None
+
+
+@dataclass
+class Plan:
+    query: str
+    accesses: list[Access] = field(default_factory=list)
+    cost: float | None = None
+    rows: float | None = None
+
+    def access_for(self, table: str) -> Access | None:
+        return next((a for a in self.accesses if a.table == table), None)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Plan":
+        return cls(data["query"], [Access(**a) for a in data["accesses"]], data.get("cost"), data.get("rows"))
+
+
+@dataclass(frozen=True)
+class Regression:
+    query: str
+    kind: str  # "seq-scan", "cost" or "rows"
+    message: str
+
+
+# -- capture ---------------------------------------------------------------
+
+
+def _postgres_accesses(node: dict, out: list[Access]) -> None:
+    relation = node.get("Relation Name")
+    if relation:
+        node_type = node.get("Node Type", "")
+        method = "seq_scan" if node_type == "Seq Scan" else "index" if "Index" in node_type else "other"
+        out.append(Access(relation, method, node.get("Index Name")))
+    for child in node.get("Plans", []):
+        _postgres_accesses(child, out)
+
+
+def _mysql_accesses(node: Any, out: list[Access]) -> None:
+    if isinstance(node, dict):
+        table = node.get("table")
+        if isinstance(table, dict) and "table_name" in table:
+            access_type = table.get("access_type", "")
+            method = "seq_scan" if access_type == "ALL" else "index" if access_type else "other"
+            out.append(Access(table["table_name"], method, table.get("key")))
+        for value in node.values():
+            _mysql_accesses(value, out)
+    elif isinstance(node, list):
+        for value in node:
+            _mysql_accesses(value, out)
+
+
+def _fetch(conn: Any, sql: str, params: tuple = ()) -> list[tuple]:
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def capture_plan(conn: Any, dialect: str, query: str, analyze: bool = False) -> Plan:
+    """Run the dialect's structured ``EXPLAIN`` for ``query``.
+
+    ``analyze`` executes the query (PostgreSQL ``ANALYZE``) so the plan
+    carries actual rows; it is rolled back afterwards.
+    """
+    query = query.strip().rstrip(";")
+    plan = Plan(query)
+    if dialect == "postgresql":
+        options = "ANALYZE, FORMAT JSON" if analyze else "FORMAT JSON"
+        raw = _fetch(conn, f"EXPLAIN ({options}) {query}")[0][0]
+        root = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+        _postgres_accesses(root, plan.accesses)
+        plan.cost = root.get("Total Cost")
+        plan.rows = root.get("Actual Rows", root.get("Plan Rows")) if analyze else root.get("Plan Rows")
+        conn.rollback()
+    elif dialect == "mysql":
+        document = json.loads(_fetch(conn, f"EXPLAIN FORMAT=JSON {query}")[0][0])
+        _mysql_accesses(document, plan.accesses)
+        cost = document.get("query_block", {}).get("cost_info", {}).get("query_cost")
+        plan.cost = float(cost) if cost is not None else None
+        plan.rows = float(sum(_mysql_rows(document))) or None
+    elif dialect == "sqlite":
+        for _, _, _, detail in _fetch(conn, f"EXPLAIN QUERY PLAN {query}"):
+            match = _SQLITE_DETAIL.match(detail)
+            if not match:
+                continue
+            operation, table, using, index = match.groups()
+            if operation == "SCAN" and not (using or "").endswith("INDEX"):
+                plan.accesses.append(Access(table, "seq_scan"))
+            else:
+                plan.accesses.append(Access(table, "index", index or (using or "").lower() or None))
+    else:
+        raise ValueError(f"no query plans for {dialect}")
+    return plan
+
+
+def _mysql_rows(node: Any) -> list[float]:
+    if isinstance(node, dict):
+        rows = [float(node["rows_examined_per_scan"])] if "rows_examined_per_scan" in node else []
+        return rows + [r for value in node.values() for r in _mysql_rows(value)]
+    if isinstance(node, list):
+        return [r for value in node for r in _mysql_rows(value)]
+    return []
+
+
+# -- comparison ------------------------------------------------------------
+
+
+def compare(baseline: Plan, current: Plan, cost_ratio: float = 1.5, rows_ratio: float = 2.0) -> list[Regression]:
+    regressions = []
+    for before in baseline.accesses:
+        after = current.access_for(before.table)
+        if before.method == "index" and after is not None and after.method == "seq_scan":
+            regressions.append(
+                Regression(current.query, "seq-scan", f"{before.table}: index scan on {before.index} became a sequential scan")
+            )
+    for kind, ratio, old, new in (("cost", cost_ratio, baseline.cost, current.cost), ("rows", rows_ratio, baseline.rows, current.rows)):
+        if old and new and new > old * ratio:
+            regressions.append(Regression(current.query, kind, f"estimated {kind} {old:g} -> {new:g} (> {ratio:g}x)"))
+    return regressions
+
+
+def _indexed_leading_columns(conn: Any, dialect: str, table: str) -> set[str]:
+    if dialect == "sqlite":
+        columns = {row[1] for row in _fetch(conn, f"PRAGMA table_info({table})") if row[5] == 1}
+        for index in _fetch(conn, f"PRAGMA index_list({table})"):
+            columns |= {row[2] for row in _fetch(conn, f"PRAGMA index_info({index[1]})") if row[0] == 0}
+        return columns
+    if dialect == "postgresql":
+        rows = _fetch(
+            conn,
+            "SELECT a.attname FROM pg_index i JOIN pg_attribute a"
+            " ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]"
+            " WHERE i.indrelid = %s::regclass",
+            (table,),
+        )
+        return {r[0] for r in rows}
+    rows = _fetch(
+        conn,
+        "SELECT column_name FROM information_schema.statistics"
+        " WHERE table_schema = DATABASE() AND table_name = %s AND seq_in_index = 1",
+        (table,),
+    )
+    return {r[0] for r in rows}
+
+
+def missing_fk_indexes(conn: Any, dialect: str, schema: Schema) -> list[tuple[Table, ForeignKey]]:
+    """Foreign keys whose column does not lead any index on its table."""
+    missing = []
+    for table in schema.values():
+        if not table.foreign_keys:
+            continue
+        indexed = _indexed_leading_columns(conn, dialect, table.name)
+        missing.extend((table, fk) for fk in table.foreign_keys if fk.column not in indexed)
+    return missing
+
+
+def artifact_queries(path: str | Path = DEFAULT_ARTIFACT) -> list[str]:
+    """The ``SELECT`` statements an artifact ``EXPLAIN``s, deduplicated."""
+    queries: list[str] = []
+    for block in read_code_blocks(path):
+        if block.language == "sql":
+            for match in _EXPLAIN.finditer(block.code):
+                query = " ".join(match[1].split())
+                if query not in queries:
+                    queries.append(query)
+    return queries
+
+
+def load_baseline(path: Path) -> dict[str, Plan]:
+    if not path.exists():
+        return {}
+    return {query: Plan.from_dict(plan) for query, plan in json.loads(path.read_text(encoding="utf-8")).items()}
+
+
+def save_baseline(path: Path, plans: dict[str, Plan]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({q: p.to_dict() for q, p in plans.items()}, indent=2) + "\n", encoding="utf-8")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Fail on query-plan regressions against a stored baseline.")
+    parser.add_argument("url")
+    parser.add_argument("--queries", default=None, help="SQL file of queries (default: the EXPLAINs in the database artifact)")
+    parser.add_argument("--baseline", default="plan_baselines.json")
+    parser.add_argument("--update", action="store_true", help="record the current plans as the new baseline")
+    parser.add_argument("--analyze", action="store_true", help="PostgreSQL: EXPLAIN ANALYZE")
+    parser.add_argument("--cost-ratio", type=float, default=1.5)
+    parser.add_argument("--rows-ratio", type=float, default=2.0)
+    parser.add_argument("--strict", action="store_true", help="also fail on foreign keys without an index")
+    parser.add_argument("--schema", default=None, help="database artifact, .sql file or refined-DOM .html (default: the database artifact)")
+    args = parser.parse_args(argv)
+
+    dialect = dialect_for(args.url)
+    if args.queries:
+        text = Path(args.queries).read_text(encoding="utf-8")
+        queries = [" ".join(q.split()) for q in text.split(";") if q.strip()]
+    else:
+        queries = artifact_queries()
+    baseline_path = Path(args.baseline)
+    baseline = load_baseline(baseline_path)
+    conn = connect(args.url)
+    try:
+        current = {query: capture_plan(conn, dialect, query, args.analyze) for query in queries}
+        missing = missing_fk_indexes(conn, dialect, load_schema(args.schema))
+    finally:
+        conn.close()
+
+    failures = 0
+    for query, plan in current.items():
+        accesses = ", ".join(f"{a.table}:{a.method}" + (f"({a.index})" if a.index else "") for a in plan.accesses)
+        print(f"{query}\n    {accesses}  cost={plan.cost}  rows={plan.rows}")
+        if query not in baseline:
+            continue
+        for regression in compare(baseline[query], plan, args.cost_ratio, args.rows_ratio):
+            print(f"    REGRESSION [{regression.kind}] {regression.message}")
+            failures += 1
+    for table, fk in missing:
+        print(f"missing index: {table.name}.{fk.column} references {fk.ref_table}.{fk.ref_column} but leads no index")
+        failures += args.strict
+    if args.update:
+        save_baseline(baseline_path, {**baseline, **current})
+        print(f"baseline written to {baseline_path}")
+        return 0
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""Pooled database connections shared by the database validation suite.
+
+Generated checks each opened their own connection (or a module-level
+``MongoClient``), paying a TCP + auth handshake per check.  Here every
+process gets one pool per URL from :func:`get_pool`; connections are opened
+up front to ``warm`` and lazily up to ``size``, lent out with
+:meth:`ConnectionPool.connection`, rolled back when returned, pinged before
+reuse once they have sat idle, and recycled after ``max_uses`` loans.  Pools are keyed by process
+id, so forked runner or xdist workers never share a socket with their parent.
+
+MongoDB pools connections inside ``MongoClient`` already; :func:`mongo_client`
+returns one shared client per process and URL instead of one per script.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from qa_framework.db import connect, dialect_for
+
+
+@dataclass
+class DbPoolConfig:
+    """Settings for a :class:`ConnectionPool`."""
+
+    size: int = 4
+    warm: int = 1
+    max_uses: int = 1000
+    ping_after: float = 30.0  # seconds idle before a connection is pinged on checkout
+
+    @classmethod
+    def from_env(cls) -> "DbPoolConfig":
+        """Build a config from ``QA_DB_POOL_*`` environment variables."""
+        return cls(
+            size=int(os.environ.get("QA_DB_POOL_SIZE", "4")),
+            warm=int(os.environ.get("QA_DB_POOL_WARM", "1")),
+            max_uses=int(os.environ.get("QA_DB_RECYCLE_AFTER", "1000")),
+        )
+
+
+class _PooledConnection:
+    def __init__(self, conn: Any) -> None:
+        self.conn = conn
+        self.uses = 0
+        self.returned_at = time.monotonic()
+
+
+class ConnectionPool:
+    """A bounded pool of DB-API connections to one URL.
+
+    ``on_connect`` runs once for every new connection (session settings,
+    creating the schema of an in-memory database, ...).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        config: DbPoolConfig | None = None,
+        on_connect: Callable[[Any], None] | None = None,
+    ) -> None:
+        self.url = url
+        self.dialect = dialect_for(url)
+        if self.dialect == "mongodb":
+            raise ValueError("use mongo_client() for MongoDB; MongoClient pools connections itself")
+        self.config = config or DbPoolConfig.from_env()
+        if url == "sqlite:///:memory:":
+            # Every connection would be a separate, empty database.
+            self.config.size = self.config.warm = 1
+        self.on_connect = on_connect
+        self._idle: list[_PooledConnection] = []
+        self._opened = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {"connects": 0, "loans": 0, "waits": 0}
+        self.warm_up(self.config.warm)
+
+    def _open(self) -> _PooledConnection:
+        conn = connect(self.url)
+        if self.on_connect is not None:
+            self.on_connect(conn)
+        with self._cond:
+            self.stats["connects"] += 1
+        return _PooledConnection(conn)
+
+    def warm_up(self, count: int) -> None:
+        """Open connections until ``count`` (at most ``size``) exist."""
+        while True:
+            with self._cond:
+                if self._opened >= min(count, self.config.size):
+                    return
+                self._opened += 1
+            try:
+                pooled = self._open()
+            except BaseException:
+                with self._cond:
+                    self._opened -= 1
+                raise
+            with self._cond:
+                self._idle.append(pooled)
+                self._cond.notify()
+
+    def _alive(self, pooled: _PooledConnection) -> bool:
+        if time.monotonic() - pooled.returned_at < self.config.ping_after:
+            return True
+        try:
+            cursor = pooled.conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout: float | None = None) -> _PooledConnection:
+        """Borrow a live connection, opening one if the pool has room."""
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("connection pool is closed")
+                if self._idle:
+                    pooled = self._idle.pop()
+                    self.stats["loans"] += 1
+                    break
+                if self._opened < self.config.size:
+                    self._opened += 1
+                    self.stats["loans"] += 1
+                    pooled = None
+                    break
+                self.stats["waits"] += 1
+                if not self._cond.wait(timeout):
+                    raise TimeoutError(f"no connection to {self.url} became available")
+        if pooled is not None and not self._alive(pooled):
+            _close_quietly(pooled.conn)
+            pooled = None
+        if pooled is None:
+            try:
+                pooled = self._open()
+            except BaseException:
+                with self._cond:
+                    self._opened -= 1
+                    self._cond.notify()
+                raise
+        return pooled
+
+    def release(self, pooled: _PooledConnection) -> None:
+        """Return a connection, rolling back whatever the borrower left open."""
+        pooled.uses += 1
+        healthy = pooled.uses < self.config.max_uses
+        if healthy:
+            try:
+                pooled.conn.rollback()
+            except Exception:
+                healthy = False
+        pooled.returned_at = time.monotonic()
+        with self._cond:
+            # Decided under the lock: a concurrent close() either finds the
+            # connection in ``_idle`` and closes it, or has us close it here.
+            retire = self._closed or not healthy
+            if retire:
+                self._opened -= 1
+            else:
+                self._idle.append(pooled)
+            self._cond.notify()
+        if retire:
+            _close_quietly(pooled.conn)
+
+    @contextmanager
+    def connection(self, timeout: float | None = None) -> Iterator[Any]:
+        """Yield a pooled connection for the duration of the block."""
+        pooled = self.acquire(timeout)
+        try:
+            yield pooled.conn
+        finally:
+            self.release(pooled)
+
+    def close(self) -> None:
+        """Close every idle connection; loaned ones are closed on release."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            _close_quietly(pooled.conn)
+
+
+_pools: dict[tuple[int, str], ConnectionPool] = {}
+_mongo_clients: dict[tuple[int, str], Any] = {}
+_registry_lock = threading.Lock()
+
+
+def get_pool(url: str, on_connect: Callable[[Any], None] | None = None) -> ConnectionPool:
+    """The pool for ``url`` in this process, created on first use."""
+    key = (os.getpid(), url)
+    with _registry_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(url, on_connect=on_connect)
+        return pool
+
+
+def mongo_client(url: str) -> Any:
+    """One ``MongoClient`` per process and URL, sized like the SQL pools."""
+    key = (os.getpid(), url)
+    with _registry_lock:
+        client = _mongo_clients.get(key)
+        if client is None:
+            import pymongo
+
+            config = DbPoolConfig.from_env()
+            client = _mongo_clients[key] = pymongo.MongoClient(
+                url, maxPoolSize=config.size, minPoolSize=config.warm
+            )
+        return client
+
+
+@atexit.register
+def close_all() -> None:
+    """Close the pools and clients this process created."""
+    pid = os.getpid()
+    with _registry_lock:
+        pools = [k for k in _pools if k[0] == pid]
+        clients = [k for k in _mongo_clients if k[0] == pid]
+        for key in pools:
+            _pools.pop(key).close()
+        for key in clients:
+            _close_quietly(_mongo_clients.pop(key))
+
+
+def _close_quietly(target: Any) -> None:
+    try:
+        target.close()
+    except Exception:
+        pass
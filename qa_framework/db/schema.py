@@ -0,0 +1,177 @@
+"""Relational schema parsed from the DDL in the database artifacts.
+
+The database generators emit ``CREATE TABLE`` statements for the schema they
+inferred from the page (``users``, ``search_history``, ``feedback``,
+``settings``).  :func:`parse_ddl` turns that DDL into :class:`Table` objects
+with primary keys and foreign keys, which the data generator, the consistency
+validator and the other database tools work from instead of hard-coding table
+and column names.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from qa_framework.artifacts import ARTIFACTS_DIR, read_code_blocks
+
+DEFAULT_ARTIFACT = ARTIFACTS_DIR / "database_validation_scripts_20250601_081602.py"
+
+_CREATE_TABLE = re.compile(
+    r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?[`\"]?(\w+)[`\"]?\s*\((.*?)\)\s*;",
+    re.IGNORECASE | re.DOTALL,
+)
+_COLUMN = re.compile(r"[`\"]?(\w+)[`\"]?\s+(\w+)(?:\s*\(\s*(\d+)(?:\s*,\s*\d+)?\s*\))?(.*)", re.DOTALL)
+_TABLE_PK = re.compile(r"PRIMARY\s+KEY\s*\(([^)]*)\)", re.IGNORECASE)
+_TABLE_FK = re.compile(r"FOREIGN\s+KEY\s*\(([^)]*)\)\s*REFERENCES\s+[`\"]?(\w+)[`\"]?\s*\(([^)]*)\)", re.IGNORECASE)
+_INLINE_FK = re.compile(r"REFERENCES\s+[`\"]?(\w+)[`\"]?\s*\(\s*[`\"]?(\w+)", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    type: str  # upper-cased base type, e.g. "INT", "VARCHAR", "TEXT"
+    length: int | None = None
+    nullable: bool = True
+
+    @property
+    def is_integer(self) -> bool:
+        return self.type in ("INT", "INTEGER", "BIGINT", "SMALLINT", "TINYINT", "SERIAL", "BIGSERIAL")
+
+
+@dataclass(frozen=True)
+class ForeignKey:
+    column: str
+    ref_table: str
+    ref_column: str
+
+
+@dataclass
+class Table:
+    name: str
+    columns: list[Column] = field(default_factory=list)
+    primary_key: tuple[str, ...] = ()
+    foreign_keys: list[ForeignKey] = field(default_factory=list)
+    ddl: str = ""
+
+    @property
+    def column_names(self) -> list[str]:
+        return [c.name for c in self.columns]
+
+    def column(self, name: str) -> Column:
+        for column in self.columns:
+            if column.name == name:
+                return column
+        raise KeyError(f"{self.name} has no column {name!r}")
+
+    def foreign_key(self, column: str) -> ForeignKey | None:
+        return next((fk for fk in self.foreign_keys if fk.column == column), None)
+
+
+class Schema(dict[str, Table]):
+    """Tables by name, in the order they were declared."""
+
+    def referencing(self, table: str) -> list[tuple[Table, ForeignKey]]:
+        """Every ``(child table, foreign key)`` that points at ``table``."""
+        return [(t, fk) for t in self.values() for fk in t.foreign_keys if fk.ref_table == table]
+
+    def load_order(self) -> list[Table]:
+        """Tables ordered so every referenced table precedes its children."""
+        ordered: list[Table] = []
+        done: set[str] = set()
+
+        def visit(table: Table, path: tuple[str, ...]) -> None:
+            if table.name in done or table.name in path:
+                return
+            for fk in table.foreign_keys:
+                if fk.ref_table in self and fk.ref_table != table.name:
+                    visit(self[fk.ref_table], path + (table.name,))
+            done.add(table.name)
+            ordered.append(table)
+
+        for table in self.values():
+            visit(table, ())
+        return ordered
+
+    def ddl(self) -> str:
+        return "\n\n".join(t.ddl for t in self.values()) + "\n"
+
+
+def _split_definitions(body: str) -> list[str]:
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(body):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(body[start:i].strip())
+            start = i + 1
+    parts.append(body[start:].strip())
+    return [p for p in parts if p]
+
+
+def _names(text: str) -> tuple[str, ...]:
+    return tuple(name.strip().strip('`"') for name in text.split(",") if name.strip())
+
+
+def parse_ddl(sql: str) -> Schema:
+    """Parse every ``CREATE TABLE`` statement in ``sql``."""
+    schema = Schema()
+    for match in _CREATE_TABLE.finditer(sql):
+        table = Table(match[1], ddl=match[0].strip())
+        primary_key: tuple[str, ...] = ()
+        for definition in _split_definitions(match[2]):
+            upper = definition.upper()
+            if upper.startswith(("PRIMARY KEY", "CONSTRAINT", "FOREIGN KEY", "KEY ", "INDEX ", "UNIQUE ", "CHECK")):
+                pk = _TABLE_PK.search(definition)
+                if pk:
+                    primary_key = _names(pk[1])
+                fk = _TABLE_FK.search(definition)
+                if fk:
+                    for column, ref_column in zip(_names(fk[1]), _names(fk[3])):
+                        table.foreign_keys.append(ForeignKey(column, fk[2], ref_column))
+                continue
+            column = _COLUMN.match(definition)
+            if not column:
+                continue
+            name, rest = column[1], column[4].upper()
+            is_pk = "PRIMARY KEY" in rest
+            table.columns.append(
+                Column(name, column[2].upper(), int(column[3]) if column[3] else None, "NOT NULL" not in rest and not is_pk)
+            )
+            if is_pk:
+                primary_key = (name,)
+            inline = _INLINE_FK.search(column[4])
+            if inline:
+                table.foreign_keys.append(ForeignKey(name, inline[1], inline[2]))
+        table.primary_key = primary_key
+        schema[table.name] = table
+    return schema
+
+
+def schema_from_artifact(path: str | Path = DEFAULT_ARTIFACT) -> Schema:
+    """The schema declared by the first SQL block of a database artifact that creates tables."""
+    for block in read_code_blocks(path):
+        if block.language == "sql" and _CREATE_TABLE.search(block.code):
+            return parse_ddl(block.code)
+    raise ValueError(f"{path} declares no tables")
+
+
+def load_schema(path: str | Path | None = None) -> Schema:
+    """Schema from a database artifact, a ``.sql`` file or a refined-DOM ``.html`` file.
+
+    Refined DOMs go through :mod:`qa_framework.db.infer` (and its cache).
+    Without ``path``, ``QA_SCHEMA`` names the source, and failing that the
+    default database artifact is used.
+    """
+    path = path or os.environ.get("QA_SCHEMA") or None
+    if path is None:
+        return schema_from_artifact()
+    if Path(path).suffix.lower() in (".html", ".htm"):
+        from qa_framework.db.infer import infer_schema
+
+        return infer_schema(Path(path).read_text(encoding="utf-8"))
+    return schema_from_artifact(path)
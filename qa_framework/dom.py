@@ -0,0 +1,160 @@
+"""Parsing of the refined DOM the generators are prompted with.
+
+The refined DOM is the crawler's HTML with scripts and styling stripped.
+:func:`parse_refined_dom` reduces it to the elements a test can interact
+with or assert on (form controls, links, buttons and anything carrying an id,
+role or accessible name), each with the attribute-based XPath the generated
+artifacts use as their locator, e.g. ``//textarea[@name='q']``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import asdict, dataclass
+from html.parser import HTMLParser
+
+INTERACTIVE_TAGS = frozenset({"a", "button", "input", "textarea", "select", "form", "label", "option"})
+
+# Attributes in the order they are preferred for an XPath locator.
+LOCATOR_ATTRIBUTES = ("id", "name", "aria-label", "data-testid", "href", "title", "placeholder", "value")
+
+_VOID_TAGS = frozenset({"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"})
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class DomElement:
+    tag: str
+    attrs: dict[str, str]
+    text: str = ""
+    form: str | None = None
+    label: str | None = None
+
+    @property
+    def xpath(self) -> str:
+        for attr in LOCATOR_ATTRIBUTES:
+            value = self.attrs.get(attr)
+            if value:
+                return f"//{self.tag}[@{attr}={_xpath_literal(value)}]"
+        if self.text:
+            return f"//{self.tag}[normalize-space()={_xpath_literal(self.text)}]"
+        return f"//{self.tag}"
+
+    @property
+    def accessible_name(self) -> str:
+        return self.attrs.get("aria-label") or self.label or self.text or self.attrs.get("title") or self.attrs.get("placeholder") or ""
+
+    @property
+    def identity(self) -> tuple[str, str, str]:
+        """What the element *is*, independent of how it is located.
+
+        Used to recognise an element whose locator attributes changed
+        between two crawls.
+        """
+        kind = self.attrs.get("type") or self.attrs.get("role") or ""
+        return self.tag, kind, _WHITESPACE.sub(" ", self.accessible_name).strip().lower()
+
+    def locators(self) -> dict[str, str]:
+        """Every locator a generator may have written for this element, keyed by form.
+
+        XPath forms are keyed by attribute (``"name"`` gives
+        ``//textarea[@name='q']``); ``"css"`` is the ``#id`` selector.
+        """
+        forms = {
+            attr: f"//{self.tag}[@{attr}={_xpath_literal(self.attrs[attr])}]"
+            for attr in LOCATOR_ATTRIBUTES
+            if self.attrs.get(attr)
+        }
+        if self.text:
+            forms["text"] = f"//{self.tag}[normalize-space()={_xpath_literal(self.text)}]"
+        if self.attrs.get("id"):
+            forms["css"] = f"#{self.attrs['id']}"
+        return forms
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DomElement":
+        return cls(**data)
+
+
+def _xpath_literal(value: str) -> str:
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = value.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{p}'" for p in parts) + ")"
+
+
+class _Parser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.elements: list[DomElement] = []
+        self._open: list[tuple[str, int | None]] = []
+        self._forms: list[str] = []
+        self._labels_for: dict[str, str] = {}
+        self._label_text: list[str] | None = None
+        self._label_for: str | None = None
+        self._text_target: list[int] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attributes = {k: (v or "") for k, v in attrs}
+        index = None
+        if tag in INTERACTIVE_TAGS or any(a in attributes for a in ("id", "role", "aria-label", "data-testid")):
+            form = self._forms[-1] if self._forms else None
+            element = DomElement(tag, attributes, form=form)
+            index = len(self.elements)
+            self.elements.append(element)
+        if tag == "form":
+            self._forms.append(attributes.get("id") or attributes.get("name") or attributes.get("action") or f"form{len(self.elements)}")
+        if tag == "label":
+            self._label_text, self._label_for = [], attributes.get("for")
+        if tag in _VOID_TAGS:
+            return
+        self._open.append((tag, index))
+        if index is not None:
+            self._text_target.append(index)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "form" and self._forms:
+            self._forms.pop()
+        if tag == "label" and self._label_text is not None:
+            if self._label_for:
+                self._labels_for[self._label_for] = " ".join(self._label_text).strip()
+            self._label_text = None
+        while self._open:
+            open_tag, index = self._open.pop()
+            if index is not None and self._text_target and self._text_target[-1] == index:
+                self._text_target.pop()
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        text = data.strip()
+        if not text:
+            return
+        if self._label_text is not None:
+            self._label_text.append(text)
+        if self._text_target:
+            element = self.elements[self._text_target[-1]]
+            element.text = _WHITESPACE.sub(" ", f"{element.text} {text}").strip()
+
+
+def parse_refined_dom(html: str) -> list[DomElement]:
+    """Return the interactive / addressable elements of ``html`` in document order."""
+    parser = _Parser()
+    parser.feed(html)
+    parser.close()
+    for element in parser.elements:
+        element_id = element.attrs.get("id")
+        if element_id and element_id in parser._labels_for:
+            element.label = parser._labels_for[element_id]
+    return parser.elements
+
+
+def page_hash(html: str) -> str:
+    """Stable hash of a refined DOM, insensitive to whitespace reflow."""
+    return hashlib.sha256(_WHITESPACE.sub(" ", html).strip().encode("utf-8")).hexdigest()
@@ -0,0 +1,206 @@
+"""Content-addressed cache of LLM generation results.
+
+A generation is fully determined by the artifact type, the refined DOM it
+was produced from, the prompt template and the model settings.  Hashing
+those gives a key under which the response is stored on disk, so
+regenerating an unchanged page returns instantly instead of paying for
+another LLM call::
+
+    cache = GenerationCache()
+    key = GenerationKey("playwright_automation_script_generation_python", dom, template, {"model": m, "temperature": 0})
+    text, hit = cache.get_or_generate(key, lambda: call_llm(...))
+
+Entries expire ``ttl`` seconds after they were written and the least
+recently used entries are evicted once there are more than ``max_entries``.
+A file's mtime records its last use, so eviction needs no separate index and
+several processes can share one cache directory.  Each instance keeps a
+running count of entries and only scans the directory once that count passes
+``max_entries``; the scan then trims down to ``_LOW_WATER`` of the limit so the
+next one is many writes away.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from qa_framework import CACHE_ROOT
+
+_WHITESPACE = re.compile(r"\s+")
+
+#: Fraction of ``max_entries`` kept after an eviction pass triggered by ``put``.
+_LOW_WATER = 0.9
+
+
+@dataclass(frozen=True)
+class GenerationKey:
+    artifact_type: str
+    refined_dom: str
+    prompt_template: str
+    model_settings: dict[str, Any] = field(default_factory=dict, hash=False)
+
+    def digest(self) -> str:
+        # Whitespace in the DOM dump carries no meaning for generation, so
+        # re-crawls that only reflow markup still hit the cache.
+        payload = json.dumps(
+            {
+                "artifact_type": self.artifact_type,
+                "refined_dom": _WHITESPACE.sub(" ", self.refined_dom).strip(),
+                "prompt_template": self.prompt_template,
+                "model_settings": self.model_settings,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    """LRU / TTL cache of generated artifacts, one JSON file per key."""
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_entries: int | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        self.directory = Path(directory) if directory else CACHE_ROOT / "generations"
+        self.max_entries = max_entries if max_entries is not None else int(os.environ.get("QA_GEN_CACHE_SIZE", "1000"))
+        self.ttl = ttl if ttl is not None else float(os.environ.get("QA_GEN_CACHE_TTL", str(30 * 24 * 3600)))
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._count: int | None = None
+
+    def _path(self, digest: str) -> Path:
+        return self.directory / digest[:2] / f"{digest}.json"
+
+    def get(self, key: GenerationKey) -> str | None:
+        path = self._path(key.digest())
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        if time.time() - entry["created"] > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process since the read; the artifact is still good.
+            pass
+        return entry["artifact"]
+
+    def put(self, key: GenerationKey, artifact: str) -> None:
+        path = self._path(key.digest())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "created": time.time(),
+            "artifact_type": key.artifact_type,
+            "model_settings": key.model_settings,
+            "artifact": artifact,
+        }
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry), encoding="utf-8")
+        with self._locks_guard:
+            if self._count is None:
+                self._count = len(self._entries())
+            if not path.exists():
+                self._count += 1
+            os.replace(tmp, path)
+            over = self._count > self.max_entries
+        if over:
+            self.evict(int(self.max_entries * _LOW_WATER))
+
+    def get_or_generate(self, key: GenerationKey, generate: Callable[[], str]) -> tuple[str, bool]:
+        """Return ``(artifact, hit)``, calling ``generate`` only on a miss.
+
+        Concurrent callers in one process asking for the same key share a
+        single generation.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+        digest = key.digest()
+        with self._locks_guard:
+            lock = self._locks.setdefault(digest, threading.Lock())
+        with lock:
+            cached = self.get(key)
+            if cached is not None:
+                return cached, True
+            artifact = generate()
+            self.put(key, artifact)
+            return artifact, False
+
+    def _entries(self) -> list[tuple[float, Path]]:
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                pass
+        return entries
+
+    def evict(self, keep: int | None = None) -> int:
+        """Drop least recently used entries beyond ``keep`` (default ``max_entries``)."""
+        keep = self.max_entries if keep is None else keep
+        entries = self._entries()
+        excess = max(len(entries) - keep, 0)
+        entries.sort()
+        for _, path in entries[:excess]:
+            path.unlink(missing_ok=True)
+        with self._locks_guard:
+            self._count = len(entries) - excess
+        return excess
+
+    def prune(self) -> int:
+        """Drop expired entries; returns how many were removed."""
+        removed = 0
+        now = time.time()
+        for _, path in self._entries():
+            try:
+                created = json.loads(path.read_text(encoding="utf-8"))["created"]
+            except (FileNotFoundError, ValueError, KeyError):
+                created = 0
+            if now - created > self.ttl:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        entries = self._entries()
+        return {
+            "directory": str(self.directory),
+            "entries": len(entries),
+            "bytes": sum(path.stat().st_size for _, path in entries if path.exists()),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+        }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or prune the generation cache.")
+    parser.add_argument("command", choices=["stats", "prune", "clear"])
+    parser.add_argument("--dir", default=None)
+    args = parser.parse_args(argv)
+    cache = GenerationCache(args.dir)
+    if args.command == "stats":
+        print(json.dumps(cache.stats(), indent=2))
+    elif args.command == "prune":
+        print(f"removed {cache.prune()} expired entries")
+    else:
+        cache.max_entries = 0
+        print(f"removed {cache.evict()} entries")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+"""Support for the Appium (mobile browser) artifacts.
+
+The mobile generator targets Chrome on an Android emulator and Safari on an
+iOS simulator through an Appium server; :data:`PLATFORMS` holds the
+capability sets its ``@BeforeTest`` methods build.
+"""
+
+from __future__ import annotations
+
+DEFAULT_SERVER = "http://localhost:4723"
+
+PLATFORMS: dict[str, dict[str, str]] = {
+    "android": {
+        "platformName": "Android",
+        "appium:deviceName": "Android Emulator",
+        "appium:automationName": "UiAutomator2",
+        "browserName": "Chrome",
+    },
+    "ios": {
+        "platformName": "iOS",
+        "appium:deviceName": "iPhone Simulator",
+        "appium:automationName": "XCUITest",
+        "browserName": "Safari",
+    },
+}
@@ -0,0 +1,374 @@
+"""Warm Appium sessions shared across devices and tests.
+
+Each generated Appium test class builds its capabilities and opens a new
+``RemoteWebDriver`` in ``@BeforeTest``; starting a UiAutomator2 or XCUITest
+session takes tens of seconds, far longer than the tests themselves.
+:class:`DevicePool` instead owns the emulators / simulators listed in
+``QA_DEVICES`` and keeps a session open on each:
+
+* :meth:`DevicePool.lease` hands out an idle session whose capability set
+  matches the request exactly, starts one on a free matching device, or -
+  when every matching device holds an idle session for another capability
+  set - replaces the least recently used of those;
+* on return the app state is reset (cookies, storage and ``about:blank`` for
+  browsers; terminate + activate for native apps) and the session goes back
+  to the pool; sessions of failed tests, sessions whose reset failed and
+  sessions used ``max_uses`` times are quit instead;
+* :func:`run_tests` runs tests on a thread per device, so tests spread over
+  every device that can take them.
+
+Devices are partitioned between pytest-xdist workers, so every worker owns
+its devices outright::
+
+    QA_DEVICES="android:emulator-5554,android:emulator-5556,ios:iPhone 15" pytest -n 2
+
+    python -m qa_framework.mobile.device_pool --stub --tests 24 --session-delay 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from qa_framework.db.isolation import worker_index
+from qa_framework.mobile import DEFAULT_SERVER, PLATFORMS
+from qa_framework.mobile.webdriver import Session
+
+_RESET_BROWSER_SCRIPT = "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}"
+
+
+@dataclass(frozen=True)
+class Device:
+    name: str  # udid of the emulator / name of the simulator
+    platform: str  # key of PLATFORMS
+    server: str = DEFAULT_SERVER
+
+    @property
+    def capabilities(self) -> dict[str, Any]:
+        return {**PLATFORMS[self.platform], "appium:deviceName": self.name, "appium:udid": self.name}
+
+    def satisfies(self, required: dict[str, Any]) -> bool:
+        """Whether the device can serve a session with ``required`` capabilities."""
+        own = self.capabilities
+        return all(own.get(k, v) == v for k, v in required.items())
+
+
+def devices_from_env() -> list[Device]:
+    """This worker's share of ``QA_DEVICES`` (``platform:name`` entries, comma-separated)."""
+    server = os.environ.get("QA_APPIUM_URL", DEFAULT_SERVER)
+    devices = []
+    for entry in os.environ.get("QA_DEVICES", "").split(","):
+        platform, _, name = entry.strip().partition(":")
+        if name:
+            devices.append(Device(name.strip(), platform.strip().lower(), server))
+    workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+    return devices[worker_index() % workers :: workers] if workers > 1 else devices
+
+
+@dataclass
+class DevicePoolConfig:
+    """Settings for a :class:`DevicePool`."""
+
+    max_uses: int = 50
+    lease_timeout: float | None = 600.0
+    reset: bool = True
+
+    @classmethod
+    def from_env(cls) -> "DevicePoolConfig":
+        return cls(
+            max_uses=int(os.environ.get("QA_DEVICE_RECYCLE_AFTER", "50")),
+            lease_timeout=float(os.environ.get("QA_DEVICE_LEASE_TIMEOUT", "600")),
+        )
+
+
+@dataclass
+class PoolStats:
+    sessions_started: int = 0
+    sessions_quit: int = 0
+    leases: int = 0
+    reused: int = 0
+    resets: int = 0
+    waits: int = 0
+
+
+@dataclass
+class Lease:
+    device: Device
+    session: Session
+    key: frozenset = field(repr=False)  # the capability set the session was started with
+    uses: int = 0
+    last_used: float = 0.0
+
+
+def _capability_key(required: dict[str, Any]) -> frozenset:
+    return frozenset((k, repr(v)) for k, v in required.items())
+
+
+def reset_app_state(session: Session) -> None:
+    """Return the app under test to a clean state without a new session."""
+    app = session.capabilities.get("appium:appPackage") or session.capabilities.get("appium:bundleId")
+    if app:
+        session.terminate_app(app)
+        session.activate_app(app)
+        return
+    session.delete_cookies()
+    session.execute_script(_RESET_BROWSER_SCRIPT)
+    session.get("about:blank")
+
+
+class DevicePool:
+    """Sessions on a fixed set of devices, at most one per device."""
+
+    def __init__(
+        self,
+        devices: list[Device],
+        config: DevicePoolConfig | None = None,
+        session_factory: Callable[[str, dict[str, Any]], Session] = Session.create,
+    ) -> None:
+        self.devices = list(devices)
+        self.config = config or DevicePoolConfig()
+        self.stats = PoolStats()
+        self._session_factory = session_factory
+        self._idle: dict[Device, Lease] = {}
+        self._busy: set[Device] = set()
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @staticmethod
+    def requirements(platform_or_capabilities: str | dict[str, Any]) -> dict[str, Any]:
+        """``"android"`` is shorthand for ``{"platformName": "Android"}``."""
+        if isinstance(platform_or_capabilities, str):
+            return {"platformName": PLATFORMS[platform_or_capabilities.lower()]["platformName"]}
+        return dict(platform_or_capabilities)
+
+    def acquire(self, platform_or_capabilities: str | dict[str, Any], timeout: float | None = None) -> Lease:
+        required = self.requirements(platform_or_capabilities)
+        key = _capability_key(required)
+        candidates = [d for d in self.devices if d.satisfies(required)]
+        if not candidates:
+            raise ValueError(f"no device in the pool satisfies {required}")
+        timeout = self.config.lease_timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        evict: Lease | None = None
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("device pool is closed")
+                warm = [self._idle[d] for d in candidates if d in self._idle and self._idle[d].key == key]
+                if warm:
+                    lease = self._idle.pop(warm[0].device)
+                    self._busy.add(lease.device)
+                    self.stats.leases += 1
+                    self.stats.reused += 1
+                    return lease
+                free = [d for d in candidates if d not in self._idle and d not in self._busy]
+                stale = sorted((self._idle[d] for d in candidates if d in self._idle), key=lambda lease: lease.last_used)
+                if free or stale:
+                    device = free[0] if free else stale[0].device
+                    if not free:
+                        evict = self._idle.pop(device)
+                    self._busy.add(device)
+                    break
+                self.stats.waits += 1
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if (remaining is not None and remaining <= 0) or not self._cond.wait(remaining):
+                    raise TimeoutError(f"no device for {required} became available")
+        if evict is not None:
+            self._quit(evict)
+        lease = self._start(device, required)
+        with self._cond:
+            self.stats.leases += 1
+        return lease
+
+    def _start(self, device: Device, required: dict[str, Any]) -> Lease:
+        """Open a session on a device already marked busy."""
+        try:
+            session = self._session_factory(device.server, {**device.capabilities, **required})
+        except BaseException:
+            with self._cond:
+                self._busy.discard(device)
+                self._cond.notify_all()
+            raise
+        with self._cond:
+            self.stats.sessions_started += 1
+        return Lease(device, session, _capability_key(required))
+
+    def release(self, lease: Lease, failed: bool = False) -> None:
+        """Return a session; it is reset for the next test or quit."""
+        lease.uses += 1
+        lease.last_used = time.monotonic()
+        with self._cond:
+            keep = not failed and not self._closed and lease.uses < self.config.max_uses
+        if keep and self.config.reset:
+            try:
+                reset_app_state(lease.session)
+                with self._cond:
+                    self.stats.resets += 1
+            except Exception:
+                keep = False
+        if keep:
+            with self._cond:
+                # close() may have run while the app was being reset.
+                keep = not self._closed
+                if keep:
+                    self._busy.discard(lease.device)
+                    self._idle[lease.device] = lease
+                    self._cond.notify_all()
+        if not keep:
+            self._quit(lease)
+            with self._cond:
+                self._busy.discard(lease.device)
+                self._cond.notify_all()
+
+    @contextmanager
+    def lease(self, platform_or_capabilities: str | dict[str, Any]) -> Iterator[Session]:
+        """Yield a warm session; a test that raises gets a fresh one next time."""
+        lease = self.acquire(platform_or_capabilities)
+        failed = True
+        try:
+            yield lease.session
+            failed = False
+        finally:
+            self.release(lease, failed)
+
+    def warm(self, platform_or_capabilities: str | dict[str, Any], count: int | None = None) -> int:
+        """Start sessions ahead of time on up to ``count`` free matching devices."""
+        required = self.requirements(platform_or_capabilities)
+        with self._cond:
+            free = [d for d in self.devices if d.satisfies(required) and d not in self._idle and d not in self._busy]
+            free = free[:count] if count is not None else free
+            self._busy.update(free)
+        if not free:
+            return 0
+        with ThreadPoolExecutor(len(free)) as executor:
+            leases = list(executor.map(lambda device: self._start(device, required), free))
+        with self._cond:
+            for lease in leases:
+                lease.last_used = time.monotonic()
+                self._busy.discard(lease.device)
+                self._idle[lease.device] = lease
+            self._cond.notify_all()
+        return len(leases)
+
+    def _quit(self, lease: Lease) -> None:
+        try:
+            lease.session.quit()
+        except Exception:
+            pass
+        with self._cond:
+            self.stats.sessions_quit += 1
+
+    def close(self) -> None:
+        """Quit every idle session; leased ones are quit on release."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle.values()), {}
+            self._cond.notify_all()
+        for lease in idle:
+            self._quit(lease)
+
+
+# -- scheduling ------------------------------------------------------------
+
+
+@dataclass
+class MobileTest:
+    name: str
+    fn: Callable[[Session], Any]
+    platform: str | dict[str, Any] = "android"
+
+
+@dataclass
+class TestOutcome:
+    name: str
+    device: str
+    passed: bool
+    seconds: float
+    error: str | None = None
+
+
+def run_tests(pool: DevicePool, tests: list[MobileTest], workers: int | None = None) -> list[TestOutcome]:
+    """Run ``tests`` concurrently, one at a time per device; outcomes in test order."""
+
+    def run(test: MobileTest) -> TestOutcome:
+        lease = pool.acquire(test.platform)
+        started = time.perf_counter()
+        try:
+            test.fn(lease.session)
+        except Exception as exc:
+            pool.release(lease, failed=True)
+            return TestOutcome(test.name, lease.device.name, False, time.perf_counter() - started, f"{type(exc).__name__}: {exc}")
+        pool.release(lease)
+        return TestOutcome(test.name, lease.device.name, True, time.perf_counter() - started)
+
+    with ThreadPoolExecutor(workers or len(pool.devices)) as executor:
+        return list(executor.map(run, tests))
+
+
+def _smoke(url: str) -> Callable[[Session], None]:
+    def test(session: Session) -> None:
+        session.get(url)
+        session.find_element("name", "q")
+
+    return test
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a smoke test repeatedly on a pool of warm Appium sessions.")
+    parser.add_argument("--devices", default=None, help="platform:name,... (default: QA_DEVICES)")
+    parser.add_argument("--server", default=None, help="Appium server (default: QA_APPIUM_URL)")
+    parser.add_argument("--stub", action="store_true", help="run against a local stub WebDriver server")
+    parser.add_argument("--session-delay", type=float, default=0.5, help="stub session start-up time in seconds")
+    parser.add_argument("--tests", type=int, default=12)
+    parser.add_argument("--url", default="https://www.google.com")
+    args = parser.parse_args(argv)
+
+    if args.devices is not None:
+        os.environ["QA_DEVICES"] = args.devices
+    elif args.stub and not os.environ.get("QA_DEVICES"):
+        os.environ["QA_DEVICES"] = "android:emulator-5554,android:emulator-5556,ios:iPhone 15"
+    stub = None
+    if args.stub:
+        from qa_framework.mobile.stub_server import StubWebDriverServer
+
+        stub = StubWebDriverServer(session_delay=args.session_delay).start()
+        os.environ["QA_APPIUM_URL"] = stub.base_url
+    elif args.server:
+        os.environ["QA_APPIUM_URL"] = args.server
+    devices = devices_from_env()
+    if not devices:
+        parser.error("no devices: pass --devices or set QA_DEVICES")
+
+    platforms = sorted({d.platform for d in devices})
+    tests = [MobileTest(f"smoke_{i}", _smoke(args.url), platforms[i % len(platforms)]) for i in range(args.tests)]
+    pool = DevicePool(devices, DevicePoolConfig.from_env())
+    started = time.perf_counter()
+    try:
+        outcomes = run_tests(pool, tests)
+    finally:
+        pool.close()
+        if stub is not None:
+            stub.stop()
+    elapsed = time.perf_counter() - started
+
+    per_device: dict[str, int] = {}
+    for outcome in outcomes:
+        per_device[outcome.device] = per_device.get(outcome.device, 0) + 1
+        if not outcome.passed:
+            print(f"FAILED {outcome.name} on {outcome.device}: {outcome.error}")
+    for device, count in sorted(per_device.items()):
+        print(f"{device:<24} {count} tests")
+    s = pool.stats
+    print(f"{len(outcomes)} tests in {elapsed:.2f}s, {s.sessions_started} sessions started, {s.reused} reused, {s.waits} waits")
+    return 0 if all(o.passed for o in outcomes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
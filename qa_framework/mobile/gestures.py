@@ -0,0 +1,378 @@
+"""Touch gestures as batched W3C Actions, with a replay mode that times them.
+
+The generated ``TouchGesturesTest`` uses Appium's ``TouchAction`` chains,
+which were removed from the W3C protocol and from current Appium clients.
+Here every gesture is a set of W3C pointer input sources - one per finger -
+sent as a single ``POST /session/{id}/actions``, so a two-finger pinch is one
+round-trip instead of one per step, and :func:`batch` merges a whole sequence
+of gestures into one request as well::
+
+    perform(session, pinch_open((100, 100), (200, 200)))
+    perform(session, batch([tap(100, 100), swipe((100, 100), (200, 200))]))
+
+:func:`replay` performs each gesture ``repeat`` times on a live (or stub)
+session and reports its round-trip latency next to the time its own actions
+take, so the remainder is protocol and driver overhead.  Recordings are JSON
+(:func:`save_gestures` / :func:`load_gestures`) and can be replayed against
+other devices.
+
+For the Java artifacts, :func:`emit_java` writes a ``Gestures`` class built on
+Selenium's ``PointerInput`` / ``Sequence`` and :func:`rewrite_touch_actions`
+replaces the ``TouchAction`` chains with calls to it::
+
+    python -m qa_framework.mobile.gestures java -o Gestures.java
+    python -m qa_framework.mobile.gestures rewrite generated_artifacts/<appium artifact>.py --write
+    python -m qa_framework.mobile.gestures replay --stub --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from qa_framework.bench import BenchResult, run_benchmark, write_results
+from qa_framework.mobile import DEFAULT_SERVER, PLATFORMS
+from qa_framework.mobile.webdriver import Session
+
+TAP_HOLD_MS = 50
+DOUBLE_TAP_GAP_MS = 100
+LONG_PRESS_MS = 800
+SWIPE_MS = 300
+PINCH_MS = 400
+
+Point = tuple[int, int]
+
+
+@dataclass
+class Gesture:
+    name: str
+    sources: list[dict] = field(default_factory=list)  # W3C pointer input sources, one per finger
+
+    @property
+    def expected_ms(self) -> float:
+        """How long the actions themselves take: the longest action of every tick."""
+        ticks: list[float] = []
+        for source in self.sources:
+            for i, action in enumerate(source["actions"]):
+                if i == len(ticks):
+                    ticks.append(0.0)
+                ticks[i] = max(ticks[i], float(action.get("duration", 0)))
+        return sum(ticks)
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "actions": self.sources}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Gesture":
+        return cls(data["name"], data["actions"])
+
+
+def _finger(index: int, actions: list[dict]) -> dict:
+    return {"type": "pointer", "id": f"finger{index}", "parameters": {"pointerType": "touch"}, "actions": actions}
+
+
+def _move(point: Point, duration: int = 0) -> dict:
+    return {"type": "pointerMove", "duration": duration, "origin": "viewport", "x": int(point[0]), "y": int(point[1])}
+
+
+def _down() -> dict:
+    return {"type": "pointerDown", "button": 0}
+
+
+def _up() -> dict:
+    return {"type": "pointerUp", "button": 0}
+
+
+def _pause(duration: int) -> dict:
+    return {"type": "pause", "duration": duration}
+
+
+def tap(x: int, y: int) -> Gesture:
+    return Gesture("tap", [_finger(1, [_move((x, y)), _down(), _pause(TAP_HOLD_MS), _up()])])
+
+
+def double_tap(x: int, y: int) -> Gesture:
+    actions = [_move((x, y)), _down(), _pause(TAP_HOLD_MS), _up(), _pause(DOUBLE_TAP_GAP_MS), _down(), _pause(TAP_HOLD_MS), _up()]
+    return Gesture("double_tap", [_finger(1, actions)])
+
+
+def long_press(x: int, y: int, duration: int = LONG_PRESS_MS) -> Gesture:
+    return Gesture("long_press", [_finger(1, [_move((x, y)), _down(), _pause(duration), _up()])])
+
+
+def swipe(start: Point, end: Point, duration: int = SWIPE_MS) -> Gesture:
+    return Gesture("swipe", [_finger(1, [_move(start), _down(), _move(end, duration), _up()])])
+
+
+def _midpoint(a: Point, b: Point) -> Point:
+    return (a[0] + b[0]) // 2, (a[1] + b[1]) // 2
+
+
+def pinch_open(first: Point, second: Point, duration: int = PINCH_MS) -> Gesture:
+    """Two fingers start together between ``first`` and ``second`` and spread to them."""
+    center = _midpoint(first, second)
+    return Gesture(
+        "pinch_open",
+        [_finger(i, [_move(center), _down(), _move(target, duration), _up()]) for i, target in ((1, first), (2, second))],
+    )
+
+
+def pinch_close(first: Point, second: Point, duration: int = PINCH_MS) -> Gesture:
+    """Two fingers start at ``first`` and ``second`` and meet between them."""
+    center = _midpoint(first, second)
+    return Gesture(
+        "pinch_close",
+        [_finger(i, [_move(start), _down(), _move(center, duration), _up()]) for i, start in ((1, first), (2, second))],
+    )
+
+
+def batch(gestures: list[Gesture], name: str | None = None) -> Gesture:
+    """One gesture performing ``gestures`` one after another in a single request.
+
+    Fingers idle during a gesture are padded with zero-length pauses so every
+    source stays tick-aligned.
+    """
+    ids = list(dict.fromkeys(source["id"] for gesture in gestures for source in gesture.sources))
+    merged = {i: {**next(s for g in gestures for s in g.sources if s["id"] == i), "actions": []} for i in ids}
+    for gesture in gestures:
+        own = {source["id"]: source["actions"] for source in gesture.sources}
+        ticks = max(len(actions) for actions in own.values())
+        for i in ids:
+            actions = own.get(i, [])
+            merged[i]["actions"] += actions + [_pause(0)] * (ticks - len(actions))
+    return Gesture(name or "+".join(g.name for g in gestures), list(merged.values()))
+
+
+def perform(session: Session, gesture: Gesture) -> None:
+    session.perform_actions(gesture.sources)
+
+
+# -- replay ----------------------------------------------------------------
+
+
+@dataclass
+class GestureTiming:
+    gesture: str
+    expected_ms: float
+    result: BenchResult
+
+    @property
+    def overhead_ms(self) -> float:
+        """Median round-trip minus the time the actions themselves take."""
+        return self.result.summary.median - self.expected_ms
+
+
+def replay(session: Session, gestures: list[Gesture], repeat: int = 10, warmup: int = 1) -> list[GestureTiming]:
+    """Perform every gesture ``repeat`` times and time each round-trip."""
+    timings = []
+    for index, gesture in enumerate(gestures):
+        result = run_benchmark(f"{index}:{gesture.name}", lambda: perform(session, gesture), warmup, repeat)
+        timings.append(GestureTiming(gesture.name, gesture.expected_ms, result))
+    return timings
+
+
+def save_gestures(path: str | Path, gestures: list[Gesture]) -> None:
+    Path(path).write_text(json.dumps([g.to_dict() for g in gestures], indent=1) + "\n", encoding="utf-8")
+
+
+def load_gestures(path: str | Path) -> list[Gesture]:
+    return [Gesture.from_dict(g) for g in json.loads(Path(path).read_text(encoding="utf-8"))]
+
+
+def default_gestures() -> list[Gesture]:
+    """The gestures of the generated ``TouchGesturesTest``."""
+    return [tap(100, 100), swipe((100, 100), (200, 200)), pinch_open((100, 100), (200, 200))]
+
+
+# -- Java ------------------------------------------------------------------
+
+_JAVA_GESTURES = """\
+// Gestures.java
+
+import java.time.Duration;
+import java.util.List;
+
+import org.openqa.selenium.interactions.Interactive;
+import org.openqa.selenium.interactions.Pause;
+import org.openqa.selenium.interactions.PointerInput;
+import org.openqa.selenium.interactions.Sequence;
+
+/** Touch gestures as W3C Actions; each call is a single request, whatever the number of fingers. */
+public final class Gestures {
+    private static final Duration TAP_HOLD = Duration.ofMillis(%(tap_hold)d);
+    private static final Duration DOUBLE_TAP_GAP = Duration.ofMillis(%(double_tap_gap)d);
+    private static final Duration LONG_PRESS = Duration.ofMillis(%(long_press)d);
+    private static final Duration SWIPE = Duration.ofMillis(%(swipe)d);
+    private static final Duration PINCH = Duration.ofMillis(%(pinch)d);
+
+    private Gestures() {
+    }
+
+    private static PointerInput finger(int index) {
+        return new PointerInput(PointerInput.Kind.TOUCH, "finger" + index);
+    }
+
+    private static Sequence press(PointerInput finger, int x, int y) {
+        return new Sequence(finger, 0)
+            .addAction(finger.createPointerMove(Duration.ZERO, PointerInput.Origin.viewport(), x, y))
+            .addAction(finger.createPointerDown(PointerInput.MouseButton.LEFT.asArg()));
+    }
+
+    private static Sequence drag(PointerInput finger, int fromX, int fromY, int toX, int toY, Duration duration) {
+        return press(finger, fromX, fromY)
+            .addAction(finger.createPointerMove(duration, PointerInput.Origin.viewport(), toX, toY))
+            .addAction(finger.createPointerUp(PointerInput.MouseButton.LEFT.asArg()));
+    }
+
+    public static void tap(Interactive driver, int x, int y) {
+        PointerInput finger = finger(1);
+        driver.perform(List.of(press(finger, x, y)
+            .addAction(new Pause(finger, TAP_HOLD))
+            .addAction(finger.createPointerUp(PointerInput.MouseButton.LEFT.asArg()))));
+    }
+
+    public static void doubleTap(Interactive driver, int x, int y) {
+        PointerInput finger = finger(1);
+        driver.perform(List.of(press(finger, x, y)
+            .addAction(new Pause(finger, TAP_HOLD))
+            .addAction(finger.createPointerUp(PointerInput.MouseButton.LEFT.asArg()))
+            .addAction(new Pause(finger, DOUBLE_TAP_GAP))
+            .addAction(finger.createPointerDown(PointerInput.MouseButton.LEFT.asArg()))
+            .addAction(new Pause(finger, TAP_HOLD))
+            .addAction(finger.createPointerUp(PointerInput.MouseButton.LEFT.asArg()))));
+    }
+
+    public static void longPress(Interactive driver, int x, int y) {
+        PointerInput finger = finger(1);
+        driver.perform(List.of(press(finger, x, y)
+            .addAction(new Pause(finger, LONG_PRESS))
+            .addAction(finger.createPointerUp(PointerInput.MouseButton.LEFT.asArg()))));
+    }
+
+    public static void swipe(Interactive driver, int fromX, int fromY, int toX, int toY) {
+        driver.perform(List.of(drag(finger(1), fromX, fromY, toX, toY, SWIPE)));
+    }
+
+    /** Two fingers start between the points and spread to them. */
+    public static void pinchOpen(Interactive driver, int x1, int y1, int x2, int y2) {
+        int cx = (x1 + x2) / 2;
+        int cy = (y1 + y2) / 2;
+        driver.perform(List.of(drag(finger(1), cx, cy, x1, y1, PINCH), drag(finger(2), cx, cy, x2, y2, PINCH)));
+    }
+
+    /** Two fingers start at the points and meet between them. */
+    public static void pinchClose(Interactive driver, int x1, int y1, int x2, int y2) {
+        int cx = (x1 + x2) / 2;
+        int cy = (y1 + y2) / 2;
+        driver.perform(List.of(drag(finger(1), x1, y1, cx, cy, PINCH), drag(finger(2), x2, y2, cx, cy, PINCH)));
+    }
+}
+"""
+
+_TOUCH_ACTION = re.compile(
+    r"new\s+TouchAction(?:<[^>]*>)?\(\s*(\w+)\s*\)\s*\.\s*(tap|swipe|pinchOpen|pinchClose|longPress|doubleTap)\s*\("
+    r"((?:\s*PointOption\s*\.\s*point\(\s*-?\d+\s*,\s*-?\d+\s*\)\s*,?)+)\s*\)\s*\.\s*perform\(\)\s*;"
+)
+_POINT = re.compile(r"point\(\s*(-?\d+)\s*,\s*(-?\d+)\s*\)")
+_TOUCH_IMPORTS = re.compile(r"^import\s+io\.appium\.java_client\.(?:touch\.offset\.)?(TouchAction|PointOption);[ \t]*\r?\n", re.MULTILINE)
+
+
+def emit_java() -> str:
+    """Source of the Java ``Gestures`` class, with the same timings as this module."""
+    return _JAVA_GESTURES % {
+        "tap_hold": TAP_HOLD_MS,
+        "double_tap_gap": DOUBLE_TAP_GAP_MS,
+        "long_press": LONG_PRESS_MS,
+        "swipe": SWIPE_MS,
+        "pinch": PINCH_MS,
+    }
+
+
+def rewrite_touch_actions(text: str) -> tuple[str, int]:
+    """Replace ``TouchAction`` chains with ``Gestures`` calls; returns the text and the count."""
+
+    def replace(match: re.Match) -> str:
+        coordinates = ", ".join(f"{x}, {y}" for x, y in _POINT.findall(match[3]))
+        return f"Gestures.{match[2]}({match[1]}, {coordinates});"
+
+    rewritten, count = _TOUCH_ACTION.subn(replace, text)
+    if count:
+        # Chains the pattern does not cover (press/moveTo/release ...) still
+        # need their imports.
+        code = _TOUCH_IMPORTS.sub("", rewritten)
+        rewritten = _TOUCH_IMPORTS.sub(lambda m: m[0] if re.search(rf"\b{m[1]}\b", code) else "", rewritten)
+    return rewritten, count
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="W3C Actions gestures: Java emitter, TouchAction rewrite and timed replay.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    java = commands.add_parser("java", help="write the Java Gestures class")
+    java.add_argument("-o", "--output", default=None)
+    rewrite = commands.add_parser("rewrite", help="replace TouchAction chains in an artifact")
+    rewrite.add_argument("artifact")
+    rewrite.add_argument("--write", action="store_true")
+    play = commands.add_parser("replay", help="perform gestures and report round-trip latency")
+    play.add_argument("recording", nargs="?", default=None, help="gestures JSON (default: the TouchGesturesTest gestures)")
+    play.add_argument("--stub", action="store_true", help="replay against a local stub WebDriver server")
+    play.add_argument("--server", default=DEFAULT_SERVER)
+    play.add_argument("--platform", choices=sorted(PLATFORMS), default="android")
+    play.add_argument("--repeat", type=int, default=10)
+    play.add_argument("--save", default=None, help="write the gestures as a recording")
+    play.add_argument("--json", default=None, help="write the timings as benchmark results")
+    args = parser.parse_args(argv)
+
+    if args.command == "java":
+        if args.output:
+            Path(args.output).write_text(emit_java(), encoding="utf-8")
+        else:
+            print(emit_java(), end="")
+        return 0
+    if args.command == "rewrite":
+        path = Path(args.artifact)
+        with path.open(encoding="utf-8", newline="") as f:
+            text = f.read()
+        rewritten, count = rewrite_touch_actions(text)
+        print(f"{count} TouchAction chain(s) rewritten")
+        if args.write and count:
+            with path.open("w", encoding="utf-8", newline="") as f:
+                f.write(rewritten)
+        return 0
+
+    gestures = load_gestures(args.recording) if args.recording else default_gestures()
+    if args.save:
+        save_gestures(args.save, gestures)
+    stub = None
+    server = args.server
+    if args.stub:
+        from qa_framework.mobile.stub_server import StubWebDriverServer
+
+        stub = StubWebDriverServer().start()
+        server = stub.base_url
+    session = Session.create(server, PLATFORMS[args.platform])
+    try:
+        timings = replay(session, gestures, args.repeat)
+        combined = batch(gestures)
+        batched = run_benchmark("batched", lambda: perform(session, combined), 1, args.repeat)
+    finally:
+        session.quit()
+        if stub is not None:
+            stub.stop()
+
+    print(f"{'gesture':<14} {'actions':>9} {'median':>9} {'p95':>9} {'overhead':>9}")
+    for t in timings:
+        s = t.result.summary
+        print(f"{t.gesture:<14} {t.expected_ms:7.1f}ms {s.median:7.1f}ms {s.p95:7.1f}ms {t.overhead_ms:7.1f}ms")
+    separate = sum(t.result.summary.median for t in timings)
+    print(f"one request per gesture: {separate:.1f}ms; batched into one request: {batched.summary.median:.1f}ms")
+    if args.json:
+        write_results(args.json, [t.result for t in timings] + [batched], platform=args.platform)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
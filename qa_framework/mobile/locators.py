@@ -0,0 +1,328 @@
+"""Rewrite Appium page-object locators to the cheapest stable strategy.
+
+The mobile generator locates every element with the attribute XPath it was
+given in the refined DOM and repeats it for both platforms::
+
+    @AndroidFindBy(xpath = "//textarea[@name='q']")
+    @iOSFindBy(xpath = "//textarea[@name='q']")
+    private MobileElement searchBox;
+
+XPath is the slowest lookup on UiAutomator2 and XCUITest: the driver has to
+serialize the whole view hierarchy (or the web page) and evaluate the
+expression over it.  :func:`candidates` lists the other locators the refined
+DOM supports for an element, cheapest first - accessibility id and id, then
+name, a short CSS selector (``a[href^='https://about.google/']`` instead of
+the full tracking URL) and link text - and :func:`optimize_page_objects`
+rewrites each field to the first candidate that matches exactly one element
+of the page.  In a mobile browser (the default ``web`` context) the result is
+a single Selenium ``@FindBy``; in a ``native`` context the platform
+annotations are kept and switched to ``accessibility`` or ``id``.
+
+With ``--benchmark`` the static ranking is replaced by measurement: every
+unique candidate is looked up on a live session ``--repeat`` times with
+:func:`qa_framework.bench.run_benchmark` and the lowest median wins::
+
+    python -m qa_framework.mobile.locators generated_artifacts/<appium artifact>.py google.html --write
+    python -m qa_framework.mobile.locators <artifact> google.html --benchmark --url https://www.google.com --platform android
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+from qa_framework.bench import DEFAULT_REPEAT, BenchResult, run_benchmark, write_results
+from qa_framework.dom import DomElement, parse_refined_dom
+from qa_framework.mobile import DEFAULT_SERVER, PLATFORMS
+
+CONTEXTS = ("web", "native")
+
+#: Relative lookup cost per W3C / Appium strategy, used when not benchmarking.
+STRATEGY_COST = {"accessibility id": 1, "id": 1, "name": 2, "css selector": 3, "link text": 4, "xpath": 10}
+
+# Annotation attribute per strategy: Selenium @FindBy in web contexts,
+# @AndroidFindBy / @iOSFindBy in native ones.
+_FIND_BY_ATTRIBUTES = {"id": "id", "name": "name", "css selector": "css", "link text": "linkText", "xpath": "xpath"}
+_NATIVE_ATTRIBUTES = {"accessibility id": "accessibility", "id": "id", "xpath": "xpath"}
+_FIND_BY_IMPORT = "import org.openqa.selenium.support.FindBy;"
+
+_FORM_CONTROLS = frozenset({"input", "textarea", "select"})
+_CSS_ATTRIBUTES = ("data-testid", "aria-label", "placeholder", "title", "href")
+# Framework-generated ids change between builds.
+_GENERATED_ID = re.compile(r"\d{3,}|[0-9a-f]{8,}|^[:_]|^(?:ember|react|mui|ng-)", re.IGNORECASE)
+_CSS = re.compile(r"^(\w+)\[([\w-]+)(\^?=)'((?:[^'\\]|\\.)*)'\]$")
+
+_JAVA_STRING = r'"(?:[^"\\]|\\.)*"'
+_MEMBER = re.compile(
+    rf"((?:^[ \t]*@\w+FindBy\((?:[^\"()]|{_JAVA_STRING})*\)[ \t]*\r?\n)+)[ \t]*(?:private|protected|public)\s+[\w<>]+\s+(\w+)\s*;",
+    re.MULTILINE,
+)
+_ANNOTATION = re.compile(rf"@(\w+)\(\s*(\w+)\s*=\s*({_JAVA_STRING})\s*\)")
+_IMPORT = re.compile(r"^import\s+[\w.]+;[ \t]*\r?$", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class Locator:
+    strategy: str  # the W3C / Appium ``using`` value, e.g. "accessibility id"
+    value: str
+
+    @property
+    def cost(self) -> int:
+        return STRATEGY_COST[self.strategy]
+
+    def __str__(self) -> str:
+        return f"{self.strategy}={self.value}"
+
+
+@dataclass
+class Rewrite:
+    field: str
+    before: Locator
+    after: Locator
+    timings: dict[str, float] = field(default_factory=dict)  # median ms per candidate, when benchmarked
+
+
+def _css_literal(value: str) -> str:
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def _href_css(element: DomElement) -> str:
+    href = element.attrs["href"]
+    parts = urlsplit(href)
+    if parts.query and parts.netloc:
+        # Tracking parameters change; the target page does not.
+        return f"a[href^={_css_literal(f'{parts.scheme}://{parts.netloc}{parts.path}')}]"
+    return f"a[href={_css_literal(href)}]"
+
+
+def candidates(element: DomElement, context: str = "web") -> list[Locator]:
+    """Locators for ``element`` in preference order, ending with its XPath."""
+    attrs = element.attrs
+    found: list[Locator] = []
+    if context == "native":
+        if element.accessible_name:
+            found.append(Locator("accessibility id", element.accessible_name))
+        if attrs.get("id"):
+            found.append(Locator("id", attrs["id"]))
+    else:
+        by_id = [Locator("id", attrs["id"])] if attrs.get("id") and not _GENERATED_ID.search(attrs["id"]) else []
+        by_name = [Locator("name", attrs["name"])] if attrs.get("name") else []
+        # A form control's name is the contract with the server; ids are not.
+        found += by_name + by_id if element.tag in _FORM_CONTROLS else by_id + by_name
+        for attr in _CSS_ATTRIBUTES:
+            if attrs.get(attr):
+                css = _href_css(element) if attr == "href" and element.tag == "a" else f"{element.tag}[{attr}={_css_literal(attrs[attr])}]"
+                found.append(Locator("css selector", css))
+        if element.tag == "a" and element.text:
+            found.append(Locator("link text", element.text))
+    found.append(Locator("xpath", element.xpath))
+    return found
+
+
+def matches(element: DomElement, locator: Locator) -> bool:
+    """Whether ``locator`` selects ``element`` (for the locator forms :func:`candidates` produces)."""
+    value = locator.value
+    if locator.strategy in ("id", "name"):
+        return element.attrs.get(locator.strategy) == value
+    if locator.strategy == "accessibility id":
+        return element.accessible_name == value
+    if locator.strategy == "link text":
+        return element.tag == "a" and element.text == value
+    if locator.strategy == "xpath":
+        return value in element.locators().values() or element.xpath == value
+    css = _CSS.match(value)
+    if not css:
+        return False
+    tag, attr, op, literal = css.groups()
+    literal = re.sub(r"\\(.)", r"\1", literal)
+    actual = element.attrs.get(attr)
+    if element.tag != tag or actual is None:
+        return False
+    return actual.startswith(literal) if op == "^=" else actual == literal
+
+
+def is_unique(locator: Locator, elements: list[DomElement]) -> bool:
+    """Whether ``locator`` matches exactly one element of the refined DOM."""
+    return sum(1 for e in elements if matches(e, locator)) == 1
+
+
+def element_for(xpath: str, elements: list[DomElement]) -> DomElement | None:
+    """The refined-DOM element a generated XPath locator refers to."""
+    return next((e for e in elements if matches(e, Locator("xpath", xpath))), None)
+
+
+def choose(element: DomElement, elements: list[DomElement], context: str = "web") -> Locator:
+    """The first candidate, in :func:`candidates` order, that is unique on the page."""
+    return next((c for c in candidates(element, context) if is_unique(c, elements)), Locator("xpath", element.xpath))
+
+
+def benchmark(
+    driver: Any,
+    element: DomElement,
+    elements: list[DomElement],
+    context: str = "web",
+    warmup: int = 3,
+    repeat: int = 20,
+    baseline: Locator | None = None,
+) -> tuple[Locator | None, list[BenchResult]]:
+    """Time ``driver.find_element`` for every unique candidate; returns the fastest.
+
+    ``baseline`` (the locator the artifact uses now) is timed in place of
+    the element's own XPath.  When nothing is unique and there is no baseline
+    the result is ``(None, [])``.
+    """
+    results: dict[Locator, BenchResult] = {}
+    for locator in candidates(element, context):
+        if locator.strategy == "xpath" and baseline is not None:
+            locator = baseline
+        elif not is_unique(locator, elements):
+            continue
+        results[locator] = run_benchmark(str(locator), lambda: driver.find_element(locator.strategy, locator.value), warmup, repeat)
+    if not results:
+        return baseline, []
+    winner = min(results, key=lambda c: (results[c].summary.median, c.cost))
+    return winner, list(results.values())
+
+
+# -- rewriting -------------------------------------------------------------
+
+
+def _java_unquote(literal: str) -> str:
+    return re.sub(r"\\(.)", r"\1", literal[1:-1])
+
+
+def _java_quote(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def find_by_annotations(locator: Locator, context: str = "web", indent: str = "", newline: str = "\n") -> str:
+    """The Java field annotation lines that locate an element by ``locator``."""
+    if context == "native" and locator.strategy in _NATIVE_ATTRIBUTES:
+        attr = _NATIVE_ATTRIBUTES[locator.strategy]
+        lines = [f"@{name}({attr} = {_java_quote(locator.value)})" for name in ("AndroidFindBy", "iOSFindBy")]
+    else:
+        lines = [f"@FindBy({_FIND_BY_ATTRIBUTES[locator.strategy]} = {_java_quote(locator.value)})"]
+    return "".join(f"{indent}{line}{newline}" for line in lines)
+
+
+def _add_import(text: str, before: int) -> str:
+    if _FIND_BY_IMPORT in text:
+        return text
+    imports = list(_IMPORT.finditer(text, 0, before))
+    if not imports:
+        return text
+    end = imports[-1].end()
+    newline = "\r\n" if text[end - 1 : end] == "\r" else "\n"
+    end = end - 1 if newline == "\r\n" else end
+    return text[:end] + newline + _FIND_BY_IMPORT + text[end:]
+
+
+def optimize_page_objects(
+    text: str,
+    elements: list[DomElement],
+    context: str = "web",
+    chooser: Callable[[DomElement, Locator], tuple[Locator, dict[str, float]]] | None = None,
+) -> tuple[str, list[Rewrite]]:
+    """Rewrite every XPath-located page-object field of an artifact.
+
+    ``chooser`` picks the locator for an element given its current one (and
+    may return timings);
+    it defaults to :func:`choose`.  Fields whose XPath matches no element of
+    the refined DOM, or for which nothing beats the XPath, are left alone.
+    """
+    chooser = chooser or (lambda element, _: (choose(element, elements, context), {}))
+    rewrites: list[Rewrite] = []
+    pieces: list[str] = []
+    position = 0
+    first_find_by = None
+    for member in _MEMBER.finditer(text):
+        xpath = next((_java_unquote(v) for _, attr, v in _ANNOTATION.findall(member[1]) if attr == "xpath"), None)
+        element = element_for(xpath, elements) if xpath else None
+        if element is None:
+            continue
+        before = Locator("xpath", xpath)
+        locator, timings = chooser(element, before)
+        if locator.strategy == "xpath":
+            continue
+        annotations = member[1]
+        indent = re.match(r"[ \t]*", annotations)[0]
+        newline = "\r\n" if annotations.endswith("\r\n") else "\n"
+        pieces += [text[position : member.start(1)], find_by_annotations(locator, context, indent, newline)]
+        position = member.end(1)
+        rewrites.append(Rewrite(member[2], before, locator, timings))
+        if first_find_by is None and "@FindBy" in pieces[-1]:
+            first_find_by = member.start()
+    rewritten = "".join(pieces) + text[position:]
+    if first_find_by is not None:
+        rewritten = _add_import(rewritten, first_find_by)
+    return rewritten, rewrites
+
+
+def _remote(server: str, platform: str) -> Any:
+    from appium import webdriver
+    from appium.options.common import AppiumOptions
+
+    return webdriver.Remote(server, options=AppiumOptions().load_capabilities(PLATFORMS[platform]))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Rewrite Appium page-object XPath locators to faster strategies.")
+    parser.add_argument("artifact")
+    parser.add_argument("refined_dom", help="HTML file the artifact was generated from")
+    parser.add_argument("--context", choices=CONTEXTS, default="web", help="mobile browser (web) or native app locators")
+    parser.add_argument("--write", action="store_true", help="rewrite the artifact in place")
+    parser.add_argument("--benchmark", action="store_true", help="measure lookups on a live session instead of ranking statically")
+    parser.add_argument("--url", help="page to open before benchmarking")
+    parser.add_argument("--server", default=DEFAULT_SERVER)
+    parser.add_argument("--platform", choices=sorted(PLATFORMS), default="android")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--json", default=None, help="write benchmark results here")
+    args = parser.parse_args(argv)
+
+    artifact = Path(args.artifact)
+    with artifact.open(encoding="utf-8", newline="") as f:
+        text = f.read()
+    elements = parse_refined_dom(Path(args.refined_dom).read_text(encoding="utf-8"))
+
+    chooser = None
+    driver = None
+    results: list[BenchResult] = []
+    if args.benchmark:
+        driver = _remote(args.server, args.platform)
+        if args.url:
+            driver.get(args.url)
+
+        def chooser(element: DomElement, before: Locator) -> tuple[Locator, dict[str, float]]:
+            winner, measured = benchmark(driver, element, elements, args.context, repeat=args.repeat, baseline=before)
+            results.extend(measured)
+            if len(measured) < 2:
+                print(f"{before.value}: no unique strategy")
+            return winner or before, {r.name: r.summary.median for r in measured}
+
+    try:
+        rewritten, rewrites = optimize_page_objects(text, elements, args.context, chooser)
+    finally:
+        if driver is not None:
+            driver.quit()
+    for rewrite in rewrites:
+        print(f"{rewrite.field:<24} {rewrite.before.value}")
+        print(f"{'':<24} -> {rewrite.after}")
+        for name, median in rewrite.timings.items():
+            print(f"{'':<27} {median:8.3f}ms  {name}")
+    if not rewrites:
+        print("no locators to improve")
+    if args.json and results:
+        write_results(args.json, results, platform=args.platform, context=args.context)
+    if args.write and rewritten != text:
+        with artifact.open("w", encoding="utf-8", newline="") as f:
+            f.write(rewritten)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""A local stand-in for an Appium server, for exercising the mobile tooling.
+
+:class:`StubWebDriverServer` speaks enough of the W3C WebDriver protocol
+(plus Appium's orientation and app-lifecycle extensions) for
+:mod:`qa_framework.mobile.device_pool` and generated tests to run without
+emulators.  It behaves like a real server where it matters to a scheduler:
+
+* one session per device at a time - a second ``POST /session`` for a busy
+  ``appium:udid`` fails with ``session not created``;
+* session creation is slow (``session_delay``), commands are not
+  (``command_delay``);
+* with a refined DOM, element lookups resolve against it and unknown
+  locators fail with ``no such element``;
+* ``POST /actions`` validates the input sources and takes as long as the
+  actions' durations add up to, scaled by ``action_scale``.
+
+Like :class:`qa_framework.mock_sites.MockSiteServer` it runs in a background
+thread::
+
+    with StubWebDriverServer(session_delay=0.5) as server:
+        session = Session.create(server.base_url, PLATFORMS["android"])
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from qa_framework.dom import parse_refined_dom
+from qa_framework.mobile.locators import Locator, matches
+from qa_framework.mobile.webdriver import ELEMENT_KEY
+
+_SESSION_PATH = re.compile(r"^/session/([^/]+)(/.*)?$")
+_SOURCE_TYPES = {
+    "pointer": {"pause", "pointerDown", "pointerUp", "pointerMove", "pointerCancel"},
+    "key": {"pause", "keyDown", "keyUp"},
+    "none": {"pause"},
+    "wheel": {"pause", "scroll"},
+}
+
+
+@dataclass
+class StubSession:
+    session_id: str
+    capabilities: dict[str, Any]
+    url: str = "about:blank"
+    orientation: str = "PORTRAIT"
+    cookies: list[dict] = field(default_factory=list)
+    running_apps: set[str] = field(default_factory=set)
+    commands: int = 0
+
+
+def _device(capabilities: dict[str, Any]) -> str:
+    return capabilities.get("appium:udid") or capabilities.get("appium:deviceName", "")
+
+
+def _actions_duration(sources: Any) -> float:
+    """Milliseconds a W3C actions payload takes: the longest action of every tick."""
+    if not isinstance(sources, list) or not sources:
+        raise _Failure(400, "invalid argument", "actions must be a non-empty list of input sources")
+    ticks: list[float] = []
+    for source in sources:
+        if not isinstance(source, dict) or source.get("type") not in _SOURCE_TYPES or not isinstance(source.get("actions"), list):
+            raise _Failure(400, "invalid argument", f"malformed input source {source!r}")
+        for i, action in enumerate(source["actions"]):
+            if action.get("type") not in _SOURCE_TYPES[source["type"]]:
+                raise _Failure(400, "invalid argument", f"{action.get('type')!r} is not a {source['type']} action")
+            if i == len(ticks):
+                ticks.append(0.0)
+            ticks[i] = max(ticks[i], float(action.get("duration") or 0))
+    return sum(ticks)
+
+
+class _Failure(Exception):
+    def __init__(self, status: int, error: str, message: str = "") -> None:
+        super().__init__(message)
+        self.status, self.error, self.message = status, error, message
+
+
+class StubWebDriverServer:
+    """Serve a fake Appium endpoint on localhost in a background thread."""
+
+    def __init__(
+        self,
+        refined_dom: str | None = None,
+        session_delay: float = 0.0,
+        command_delay: float = 0.0,
+        action_scale: float = 1.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.elements = parse_refined_dom(refined_dom) if refined_dom is not None else None
+        self.session_delay = session_delay
+        self.command_delay = command_delay
+        self.action_scale = action_scale
+        self.sessions: dict[str, StubSession] = {}
+        self.sessions_created = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like a real server
+            disable_nagle_algorithm = True  # headers and body are written separately
+
+            def _handle(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else {}
+                try:
+                    status, value = 200, stub.dispatch(method, self.path, body)
+                except _Failure as failure:
+                    status, value = failure.status, {"error": failure.error, "message": failure.message}
+                payload = json.dumps({"value": value}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self) -> None:
+                self._handle("GET")
+
+            def do_POST(self) -> None:
+                self._handle("POST")
+
+            def do_DELETE(self) -> None:
+                self._handle("DELETE")
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # -- protocol ----------------------------------------------------------
+
+    def dispatch(self, method: str, path: str, body: dict) -> Any:
+        if path == "/status":
+            return {"ready": True, "message": "stub WebDriver server"}
+        if method == "POST" and path == "/session":
+            return self._new_session(body)
+        match = _SESSION_PATH.match(path)
+        if not match:
+            raise _Failure(404, "unknown command", f"{method} {path}")
+        with self._lock:
+            session = self.sessions.get(match[1])
+        if session is None:
+            raise _Failure(404, "invalid session id", match[1])
+        if self.command_delay:
+            time.sleep(self.command_delay)
+        session.commands += 1
+        return self._command(session, method, match[2] or "", body)
+
+    def _new_session(self, body: dict) -> dict:
+        capabilities = dict(body.get("capabilities", {}).get("alwaysMatch", {}))
+        first = body.get("capabilities", {}).get("firstMatch") or [{}]
+        capabilities.update(first[0])
+        device = _device(capabilities)
+        with self._lock:
+            if any(_device(s.capabilities) == device for s in self.sessions.values()):
+                raise _Failure(500, "session not created", f"device {device!r} is already in use")
+            session = StubSession(uuid.uuid4().hex, capabilities)
+            self.sessions[session.session_id] = session
+            self.sessions_created += 1
+        if self.session_delay:
+            time.sleep(self.session_delay)
+        return {"sessionId": session.session_id, "capabilities": capabilities}
+
+    def _find(self, body: dict) -> list[dict]:
+        locator = Locator(body.get("using", ""), body.get("value", ""))
+        if self.elements is None:
+            return [{ELEMENT_KEY: f"{locator.strategy}:{locator.value}"}]
+        return [{ELEMENT_KEY: f"e{i}"} for i, element in enumerate(self.elements) if matches(element, locator)]
+
+    def _command(self, session: StubSession, method: str, command: str, body: dict) -> Any:
+        if method == "DELETE" and command == "":
+            with self._lock:
+                self.sessions.pop(session.session_id, None)
+            return None
+        if command == "/url":
+            if method == "POST":
+                session.url = body["url"]
+                return None
+            return session.url
+        if command in ("/element", "/elements"):
+            found = self._find(body)
+            if command == "/elements":
+                return found
+            if not found:
+                raise _Failure(404, "no such element", f"{body.get('using')}={body.get('value')}")
+            return found[0]
+        if command.startswith("/element/"):
+            return None  # click, value, clear ...
+        if command == "/cookie":
+            if method == "DELETE":
+                session.cookies.clear()
+                return None
+            if method == "POST":
+                session.cookies.append(body["cookie"])
+                return None
+            return session.cookies
+        if command == "/actions":
+            if method == "POST":
+                time.sleep(_actions_duration(body.get("actions")) / 1000 * self.action_scale)
+            return None
+        if command == "/execute/sync":
+            return None
+        if command == "/timeouts":
+            return {"implicit": 0, "pageLoad": 300000, "script": 30000}
+        if command == "/orientation":
+            if method == "POST":
+                session.orientation = body["orientation"]
+                return None
+            return session.orientation
+        if command == "/appium/device/terminate_app":
+            app = body.get("appId") or body.get("bundleId")
+            running = app in session.running_apps
+            session.running_apps.discard(app)
+            return running
+        if command == "/appium/device/activate_app":
+            session.running_apps.add(body.get("appId") or body.get("bundleId"))
+            return None
+        raise _Failure(404, "unknown command", f"{method} {command}")
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self) -> "StubWebDriverServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubWebDriverServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
@@ -0,0 +1,181 @@
+"""A minimal W3C WebDriver client for Appium servers.
+
+Just the commands the device pool, the gesture library and generated tests
+need, spoken over one keep-alive HTTP connection per session and with no
+dependency beyond the standard library::
+
+    session = Session.create("http://localhost:4723", PLATFORMS["android"])
+    session.get("https://www.google.com")
+    session.click(session.find_element("name", "q"))
+    session.quit()
+
+Errors the server reports come back as :class:`WebDriverError` carrying the
+W3C error code (``"no such element"``, ``"session not created"`` ...).
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+from typing import Any
+from urllib.parse import urlsplit
+
+#: The key a W3C server uses for element references.
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+DEFAULT_TIMEOUT = 300.0
+
+#: Commands that can be repeated when the connection drops before a response.
+IDEMPOTENT_METHODS = frozenset({"GET", "DELETE"})
+
+
+class WebDriverError(Exception):
+    def __init__(self, status: int, error: str, message: str = "") -> None:
+        super().__init__(f"{error}: {message}" if message else error)
+        self.status = status
+        self.error = error
+
+
+class _Connection:
+    """A keep-alive HTTP connection to one server, safe to share between threads."""
+
+    def __init__(self, server: str, timeout: float = DEFAULT_TIMEOUT) -> None:
+        parts = urlsplit(server)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.prefix = parts.path.rstrip("/")
+        self._factory = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._timeout = timeout
+        self._conn: http.client.HTTPConnection | None = None
+        self._lock = threading.Lock()
+
+    def request(self, method: str, path: str, body: Any = None) -> Any:
+        payload = json.dumps({} if body is None else body).encode("utf-8") if method == "POST" else None
+        headers = {"Content-Type": "application/json; charset=utf-8", "Accept": "application/json"}
+        with self._lock:
+            for attempt in (1, 2):
+                if self._conn is None:
+                    self._conn = self._factory(self.host, self.port, timeout=self._timeout)
+                try:
+                    self._conn.request(method, self.prefix + path, payload, headers)
+                except (ConnectionResetError, BrokenPipeError):
+                    # The server closed an idle keep-alive connection before
+                    # the command went out; any command can be sent again.
+                    self._discard()
+                    if attempt == 2:
+                        raise
+                    continue
+                try:
+                    response = self._conn.getresponse()
+                    status, raw = response.status, response.read()
+                    break
+                except (http.client.RemoteDisconnected, ConnectionResetError):
+                    # The server may already have acted on the command, so
+                    # only repeat the ones that are safe to repeat.
+                    self._discard()
+                    if attempt == 2 or method not in IDEMPOTENT_METHODS:
+                        raise
+        data = json.loads(raw) if raw else {}
+        value = data.get("value") if isinstance(data, dict) else None
+        if status >= 400 or (isinstance(value, dict) and "error" in value):
+            error = value if isinstance(value, dict) else {}
+            raise WebDriverError(status, error.get("error", "unknown error"), error.get("message", ""))
+        return value
+
+    def _discard(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._discard()
+
+
+class Session:
+    """One WebDriver session."""
+
+    def __init__(self, connection: _Connection, session_id: str, capabilities: dict[str, Any]) -> None:
+        self._connection = connection
+        self.session_id = session_id
+        self.capabilities = capabilities
+
+    @classmethod
+    def create(cls, server: str, capabilities: dict[str, Any], timeout: float = DEFAULT_TIMEOUT) -> "Session":
+        connection = _Connection(server, timeout)
+        try:
+            value = connection.request("POST", "/session", {"capabilities": {"alwaysMatch": capabilities, "firstMatch": [{}]}})
+        except BaseException:
+            connection.close()
+            raise
+        return cls(connection, value["sessionId"], {**capabilities, **value.get("capabilities", {})})
+
+    def command(self, method: str, path: str = "", body: Any = None) -> Any:
+        return self._connection.request(method, f"/session/{self.session_id}{path}", body)
+
+    # -- navigation and elements ------------------------------------------
+
+    def get(self, url: str) -> None:
+        self.command("POST", "/url", {"url": url})
+
+    @property
+    def current_url(self) -> str:
+        return self.command("GET", "/url")
+
+    def find_element(self, using: str, value: str) -> str:
+        """The id of the first element matching the locator."""
+        return self.command("POST", "/element", {"using": using, "value": value})[ELEMENT_KEY]
+
+    def find_elements(self, using: str, value: str) -> list[str]:
+        return [e[ELEMENT_KEY] for e in self.command("POST", "/elements", {"using": using, "value": value})]
+
+    def click(self, element: str) -> None:
+        self.command("POST", f"/element/{element}/click")
+
+    def send_keys(self, element: str, text: str) -> None:
+        self.command("POST", f"/element/{element}/value", {"text": text})
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        return self.command("POST", "/execute/sync", {"script": script, "args": list(args)})
+
+    def delete_cookies(self) -> None:
+        self.command("DELETE", "/cookie")
+
+    def perform_actions(self, actions: list[dict]) -> None:
+        """Run W3C input source sequences (all ticks) in one request."""
+        self.command("POST", "/actions", {"actions": actions})
+
+    def release_actions(self) -> None:
+        self.command("DELETE", "/actions")
+
+    # -- Appium extensions -------------------------------------------------
+
+    @property
+    def orientation(self) -> str:
+        return self.command("GET", "/orientation")
+
+    @orientation.setter
+    def orientation(self, value: str) -> None:
+        self.command("POST", "/orientation", {"orientation": value})
+
+    def terminate_app(self, app_id: str) -> bool:
+        return self.command("POST", "/appium/device/terminate_app", {"appId": app_id, "bundleId": app_id})
+
+    def activate_app(self, app_id: str) -> None:
+        self.command("POST", "/appium/device/activate_app", {"appId": app_id, "bundleId": app_id})
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def is_alive(self) -> bool:
+        try:
+            self.command("GET", "/timeouts")
+            return True
+        except (WebDriverError, OSError):
+            return False
+
+    def quit(self) -> None:
+        try:
+            self.command("DELETE")
+        finally:
+            self._connection.close()
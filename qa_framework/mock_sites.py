@@ -0,0 +1,205 @@
+"""Offline replay of the sites the generated suites target.
+
+Every host the artifacts reference has a HAR 1.2 recording under
+``qa_framework/recordings/``.  :class:`HarStore` indexes those entries in
+memory and can serve them two ways:
+
+* :func:`install` / :func:`install_async` register a ``context.route``
+  handler that fulfils matching requests from memory and aborts everything
+  else, so a browser never touches the network;
+* :class:`MockSiteServer` serves the same entries over ``http://127.0.0.1``
+  for clients that cannot be routed, mapping
+  ``https://www.rediff.com/x`` to ``http://127.0.0.1:<port>/www.rediff.com/x``.
+
+The practicetestautomation.com recording reproduces the TC_001-TC_004 login
+flows (success redirect, username / password / empty-field errors).
+Recordings can be refreshed from the live sites with :func:`record`.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterable
+from urllib.parse import urlsplit
+
+RECORDINGS_DIR = Path(__file__).resolve().parent / "recordings"
+
+
+@dataclass(frozen=True)
+class RecordedResponse:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+
+def _key(method: str, url: str) -> tuple[str, str, str]:
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if not path.endswith("/") and "." not in path.rsplit("/", 1)[-1]:
+        path += "/"
+    return method.upper(), parts.hostname or "", path
+
+
+class HarStore:
+    """In-memory index of HAR entries keyed by method, host and path.
+
+    Query strings are ignored and a missing trailing slash is tolerated, so
+    ``https://www.toysrus.com`` and ``https://www.toysrus.com/`` hit the same
+    entry.  Later entries for the same key override earlier ones.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[str, str, str], RecordedResponse] = {}
+
+    @classmethod
+    def from_directory(cls, directory: str | Path = RECORDINGS_DIR) -> "HarStore":
+        store = cls()
+        for path in sorted(Path(directory).glob("*.har")):
+            store.load(path)
+        return store
+
+    def load(self, path: str | Path) -> None:
+        har = json.loads(Path(path).read_text(encoding="utf-8"))
+        for entry in har["log"]["entries"]:
+            request, response = entry["request"], entry["response"]
+            content = response.get("content", {})
+            text = content.get("text", "")
+            if content.get("encoding") == "base64":
+                body = base64.b64decode(text)
+            else:
+                body = text.encode("utf-8")
+            headers = {h["name"]: h["value"] for h in response.get("headers", []) if h["name"].lower() != "content-length"}
+            self._entries[_key(request["method"], request["url"])] = RecordedResponse(response["status"], headers, body)
+
+    @property
+    def hosts(self) -> set[str]:
+        return {host for _, host, _ in self._entries}
+
+    def lookup(self, method: str, url: str) -> RecordedResponse | None:
+        return self._entries.get(_key(method, url))
+
+
+_default_store: HarStore | None = None
+
+
+def default_store() -> HarStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = HarStore.from_directory()
+    return _default_store
+
+
+def _handler(store: HarStore) -> Any:
+    def handle(route: Any) -> Any:
+        request = route.request
+        recorded = store.lookup(request.method, request.url)
+        if recorded is None:
+            return route.abort("internetdisconnected")
+        return route.fulfill(status=recorded.status, headers=recorded.headers, body=recorded.body)
+
+    return handle
+
+
+def install(context: Any, store: HarStore | None = None) -> None:
+    """Serve every request of a sync ``BrowserContext`` from ``store``."""
+    context.route("**/*", _handler(store or default_store()))
+
+
+async def install_async(context: Any, store: HarStore | None = None) -> None:
+    """:func:`install` for ``async_api`` contexts."""
+    handle = _handler(store or default_store())
+
+    async def handle_async(route: Any) -> None:
+        await handle(route)
+
+    await context.route("**/*", handle_async)
+
+
+class MockSiteServer:
+    """Serve a :class:`HarStore` on localhost in a background thread."""
+
+    def __init__(self, store: HarStore | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.store = store or default_store()
+        store_ref = self.store
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                host, _, path = self.path.lstrip("/").partition("/")
+                recorded = store_ref.lookup("GET", f"http://{host}/{path}")
+                if recorded is None:
+                    self.send_error(404, "not recorded")
+                    return
+                self.send_response(recorded.status)
+                for name, value in recorded.headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(recorded.body)))
+                self.end_headers()
+                self.wfile.write(recorded.body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, url: str) -> str:
+        """Map a live-site URL to its localhost equivalent."""
+        parts = urlsplit(url)
+        return f"{self.base_url}/{parts.hostname}{parts.path or '/'}"
+
+    def start(self) -> "MockSiteServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockSiteServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+def record(browser: Any, urls: Iterable[str], har_path: str | Path) -> None:
+    """Re-record ``urls`` from the live sites into ``har_path``."""
+    context = browser.new_context(record_har_path=str(har_path), record_har_content="embed")
+    try:
+        page = context.new_page()
+        for url in urls:
+            page.goto(url)
+    finally:
+        context.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the recorded sites on localhost.")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    server = MockSiteServer(port=args.port)
+    print(f"serving {', '.join(sorted(server.store.hosts))} at {server.base_url}/<host>/")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,180 @@
+"""pytest fixtures that run generated Playwright tests on the shared pool.
+
+Enable from a ``conftest.py`` with::
+
+    pytest_plugins = ["qa_framework.pytest_plugin"]
+
+Fixtures:
+
+``browser_pool``
+    Session-scoped :class:`~qa_framework.browser_pool.BrowserPool`.
+``context``
+    A fresh ``BrowserContext`` per test.
+``page``
+    A new page in that context.
+``browser``
+    A :class:`~qa_framework.browser_pool.BorrowedBrowser` for generated tests
+    that open their own contexts and call ``browser.close()``.
+``logged_in_context`` / ``logged_in_page``
+    A context already carrying a cached login (see
+    :mod:`qa_framework.auth_state`).  Pick the account with
+    ``@pytest.mark.login_as(username, password, recipe=...)``; the default is
+    the practicetestautomation.com ``student`` account.
+``db_pool``
+    The worker's :class:`~qa_framework.db.pool.ConnectionPool` for
+    ``QA_DB_URL`` (default: an in-memory SQLite copy of the artifact schema).
+``db``
+    A pooled connection inside a transaction rolled back after the test.
+``db_keys``
+    A :class:`~qa_framework.db.isolation.KeyAllocator` handing out primary
+    keys no other xdist worker uses.
+``mongo_db``
+    A throwaway database on ``QA_MONGO_URL`` via the worker's shared
+    ``MongoClient``, dropped after the test.
+``device_pool``
+    Session-scoped :class:`~qa_framework.mobile.device_pool.DevicePool` over
+    this worker's share of ``QA_DEVICES``.
+``mobile_session``
+    A warm Appium :class:`~qa_framework.mobile.webdriver.Session`, reset after
+    the test.  Pick the platform with ``@pytest.mark.platform("ios")``; the
+    default is Android.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Iterator
+
+import pytest
+
+from qa_framework.auth_state import PRACTICE_TEST_AUTOMATION, StorageStateCache
+from qa_framework.browser_pool import BorrowedBrowser, BrowserPool, PoolConfig
+from qa_framework.db import database_name
+from qa_framework.db.isolation import KeyAllocator, MongoIsolation, TransactionalIsolation
+from qa_framework.db.pool import ConnectionPool, get_pool, mongo_client
+from qa_framework.mobile.device_pool import DevicePool, DevicePoolConfig, devices_from_env
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "login_as(username, password, recipe=None): account used by logged_in_context"
+    )
+    config.addinivalue_line("markers", "platform(name_or_capabilities): device requested by mobile_session")
+
+
+@pytest.fixture(scope="session")
+def browser_pool() -> Iterator[BrowserPool]:
+    from playwright.sync_api import sync_playwright
+
+    playwright = sync_playwright().start()
+    pool = BrowserPool(playwright, PoolConfig.from_env())
+    try:
+        yield pool
+    finally:
+        pool.close()
+        playwright.stop()
+
+
+@pytest.fixture
+def context(browser_pool: BrowserPool) -> Iterator[Any]:
+    with browser_pool.context() as ctx:
+        yield ctx
+
+
+@pytest.fixture
+def page(context: Any) -> Iterator[Any]:
+    page = context.new_page()
+    yield page
+    page.close()
+
+
+@pytest.fixture
+def browser(browser_pool: BrowserPool) -> Iterator[BorrowedBrowser]:
+    pooled = browser_pool.acquire()
+    borrowed = BorrowedBrowser(pooled.browser, browser_pool.config.context_options, browser_pool.config.offline)
+    try:
+        yield borrowed
+    finally:
+        borrowed.close()
+        browser_pool.release(pooled)
+
+
+@pytest.fixture(scope="session")
+def storage_state_cache() -> StorageStateCache:
+    return StorageStateCache()
+
+
+@pytest.fixture
+def logged_in_context(request: pytest.FixtureRequest, browser_pool: BrowserPool, storage_state_cache: StorageStateCache) -> Iterator[Any]:
+    marker = request.node.get_closest_marker("login_as")
+    username, password = marker.args if marker else ("student", "Password123")
+    recipe = (marker.kwargs.get("recipe") if marker else None) or PRACTICE_TEST_AUTOMATION
+    pooled = browser_pool.acquire()
+    try:
+        state = storage_state_cache.ensure(pooled.browser, recipe, username, password, offline=browser_pool.config.offline)
+    finally:
+        browser_pool.release(pooled)
+    with browser_pool.context(storage_state=str(state)) as ctx:
+        yield ctx
+
+
+@pytest.fixture
+def logged_in_page(logged_in_context: Any) -> Iterator[Any]:
+    page = logged_in_context.new_page()
+    yield page
+    page.close()
+
+
+def _db_url() -> str:
+    return os.environ.get("QA_DB_URL", "sqlite:///:memory:")
+
+
+def _create_artifact_schema(conn: Any) -> None:
+    from qa_framework.db.datagen import create_schema
+    from qa_framework.db.schema import load_schema
+
+    create_schema(conn, "sqlite", load_schema())
+
+
+@pytest.fixture(scope="session")
+def db_pool() -> ConnectionPool:
+    url = _db_url()
+    return get_pool(url, on_connect=_create_artifact_schema if url == "sqlite:///:memory:" else None)
+
+
+@pytest.fixture
+def db(db_pool: ConnectionPool) -> Iterator[Any]:
+    with db_pool.connection() as conn:
+        with TransactionalIsolation(conn, db_pool.dialect).transaction():
+            yield conn
+
+
+@pytest.fixture(scope="session")
+def db_keys() -> KeyAllocator:
+    return KeyAllocator()
+
+
+@pytest.fixture
+def mongo_db() -> Iterator[Any]:
+    url = os.environ.get("QA_MONGO_URL", "mongodb://localhost:27017/google")
+    with MongoIsolation(mongo_client(url), database_name(url) or "google").throwaway_database() as database:
+        yield database
+
+
+@pytest.fixture(scope="session")
+def device_pool() -> Iterator[DevicePool]:
+    devices = devices_from_env()
+    if not devices:
+        pytest.skip("QA_DEVICES lists no devices for this worker")
+    pool = DevicePool(devices, DevicePoolConfig.from_env())
+    try:
+        yield pool
+    finally:
+        pool.close()
+
+
+@pytest.fixture
+def mobile_session(request: pytest.FixtureRequest, device_pool: DevicePool) -> Iterator[Any]:
+    marker = request.node.get_closest_marker("platform")
+    with device_pool.lease(marker.args[0] if marker else "android") as session:
+        yield session
@@ -0,0 +1,168 @@
+"""Event-driven readiness for generated tests, and a lint that enforces it.
+
+Generated code should wait for the thing it is about to check, not for the
+network to go quiet.  The helpers here wrap Playwright's web-first
+assertions and ``wait_for_url`` with per-selector time budgets::
+
+    budgets = WaitBudgets(default_ms=5000, per_selector={"#error": 2000})
+    click_and_wait_for_url(page, "#submit", "**/logged-in-successfully/**", budgets)
+    expect_visible(page, "#wp-logout", budgets)
+
+:func:`lint_waits` rejects the patterns these replace: ``networkidle`` (and
+invalid states such as Puppeteer's ``networkidle2``), fixed sleeps, bare
+``wait_for_load_state()`` calls and polling assertions built on
+``count() > 0`` or ``text_content() ==``.  Run it over artifacts with::
+
+    python -m qa_framework.readiness generated_artifacts tests
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from qa_framework.artifacts import iter_artifacts, read_code_blocks
+
+VALID_LOAD_STATES = ("load", "domcontentloaded", "commit")
+
+
+@dataclass
+class WaitBudgets:
+    """Timeouts in milliseconds, overridable per selector or URL pattern."""
+
+    default_ms: float = 5000
+    navigation_ms: float = 10000
+    per_selector: dict[str, float] = field(default_factory=dict)
+
+    def for_selector(self, selector: str) -> float:
+        return self.per_selector.get(selector, self.default_ms)
+
+    def for_url(self, pattern: str) -> float:
+        return self.per_selector.get(pattern, self.navigation_ms)
+
+
+DEFAULT_BUDGETS = WaitBudgets()
+
+
+def _expect() -> Any:
+    from playwright.sync_api import expect
+
+    return expect
+
+
+def expect_visible(page: Any, selector: str, budgets: WaitBudgets = DEFAULT_BUDGETS) -> None:
+    _expect()(page.locator(selector)).to_be_visible(timeout=budgets.for_selector(selector))
+
+
+def expect_text(page: Any, selector: str, text: str, budgets: WaitBudgets = DEFAULT_BUDGETS, exact: bool = False) -> None:
+    assertion = _expect()(page.locator(selector))
+    timeout = budgets.for_selector(selector)
+    if exact:
+        assertion.to_have_text(text, timeout=timeout)
+    else:
+        assertion.to_contain_text(text, timeout=timeout)
+
+
+def expect_url(page: Any, pattern: Any, budgets: WaitBudgets = DEFAULT_BUDGETS) -> None:
+    _expect()(page).to_have_url(pattern, timeout=budgets.for_url(str(pattern)))
+
+
+def click_and_wait_for_url(page: Any, selector: str, pattern: Any, budgets: WaitBudgets = DEFAULT_BUDGETS) -> None:
+    """Click and return as soon as the URL matches; the new page may still be loading."""
+    page.click(selector, timeout=budgets.for_selector(selector))
+    page.wait_for_url(pattern, wait_until="commit", timeout=budgets.for_url(str(pattern)))
+
+
+def goto_ready(page: Any, url: str, ready_selector: str | None = None, budgets: WaitBudgets = DEFAULT_BUDGETS) -> None:
+    """Navigate, waiting for DOMContentLoaded and optionally one element."""
+    page.goto(url, wait_until="domcontentloaded", timeout=budgets.navigation_ms)
+    if ready_selector:
+        page.locator(ready_selector).wait_for(state="visible", timeout=budgets.for_selector(ready_selector))
+
+
+# -- lint -----------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class WaitIssue:
+    path: str
+    line: int
+    rule: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}: {self.rule}: {self.message}"
+
+
+_LOAD_STATE = re.compile(r"""(?:wait_for_load_state|waitForLoadState)\(\s*(?:state\s*=\s*)?(?:['"](?P<state>[^'"]*)['"])?""")
+_WAIT_UNTIL = re.compile(r"""(?:wait_until\s*=|waitUntil\s*:)\s*['"](?P<state>[^'"]+)['"]""")
+
+_RULES: list[tuple[str, re.Pattern[str], str]] = [
+    ("fixed-sleep", re.compile(r"\b(?:time\.sleep|asyncio\.sleep|wait_for_timeout|waitForTimeout|Thread\.sleep)\("), "fixed sleep; wait for a locator, URL or assertion instead"),
+    ("fixed-sleep", re.compile(r"new Promise\(\s*\(?\w*\)?\s*=>\s*setTimeout"), "fixed sleep; wait for a locator, URL or assertion instead"),
+    ("polling-assert", re.compile(r"assert\s+.*\.count\(\)\s*(?:>|>=|!=)\s*0"), "count() polling; use expect(locator).to_be_visible() or to_have_count()"),
+    ("polling-assert", re.compile(r"assert\s+.*\.(?:text_content|inner_text)\(\)\s*=="), "snapshot text check; use expect(locator).to_have_text()"),
+    ("polling-assert", re.compile(r"assert\s+.*\.is_visible\(\)"), "snapshot visibility check; use expect(locator).to_be_visible()"),
+    ("polling-assert", re.compile(r"expect\(\s*await\s+.*\.count\(\)\s*\)\s*\.toBeGreaterThan"), "count() polling; use expect(locator).toBeVisible() or toHaveCount()"),
+]
+
+
+def lint_waits(code: str, path: str = "<code>", first_line: int = 1) -> list[WaitIssue]:
+    """Return the wait anti-patterns found in ``code``."""
+    issues = []
+    for offset, line in enumerate(code.splitlines()):
+        lineno = first_line + offset
+        stripped = line.strip()
+        if stripped.startswith(("#", "//")):
+            continue
+        for match in _LOAD_STATE.finditer(line):
+            state = match["state"]
+            if state is None:
+                issues.append(WaitIssue(path, lineno, "load-state", "bare load-state wait; wait for the URL or an element instead"))
+            else:
+                issues.extend(_check_state(path, lineno, state))
+        for match in _WAIT_UNTIL.finditer(line):
+            issues.extend(_check_state(path, lineno, match["state"]))
+        for rule, pattern, message in _RULES:
+            if pattern.search(line):
+                issues.append(WaitIssue(path, lineno, rule, message))
+    return issues
+
+
+def _check_state(path: str, lineno: int, state: str) -> list[WaitIssue]:
+    if state.startswith("networkidle"):
+        message = "networkidle waits for all traffic to stop; wait for the element or URL the test needs"
+        if state != "networkidle":
+            message = f"'{state}' is not a Playwright load state; " + message
+        return [WaitIssue(path, lineno, "networkidle", message)]
+    if state not in VALID_LOAD_STATES:
+        return [WaitIssue(path, lineno, "invalid-state", f"'{state}' is not a Playwright load state")]
+    return []
+
+
+def lint_paths(paths: Iterable[str | Path]) -> list[WaitIssue]:
+    issues = []
+    for root in paths:
+        for path in iter_artifacts(root):
+            for block in read_code_blocks(path):
+                if block.language in ("python", "typescript", "javascript", ""):
+                    issues.extend(lint_waits(block.code, str(path), block.start_line))
+    return issues
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Reject networkidle / sleep-style waits in generated code.")
+    parser.add_argument("paths", nargs="+")
+    args = parser.parse_args(argv)
+    issues = lint_paths(args.paths)
+    for issue in issues:
+        print(issue)
+    return 1 if issues else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
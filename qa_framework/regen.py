@@ -0,0 +1,268 @@
+"""Incremental regeneration driven by refined-DOM diffs.
+
+Each artifact keeps the refined DOM it was generated from next to it as
+``<artifact>.dom.json``.  When a page is crawled again, :func:`diff_dom`
+compares the two snapshots element by element:
+
+* an element whose locator attributes changed but whose identity (tag, type
+  and accessible name) did not is *changed* - its locators are rewritten in
+  place and no LLM call is needed;
+* an element that disappeared is *removed* - the page-object members and
+  tests that use it, and everything depending on those, must be
+  regenerated;
+* an element that appeared is *added* - it is reported as new coverage.
+
+Artifacts are split into units (Java page-object fields, methods and
+``@Test`` methods; Python functions) so only the affected units are sent
+back to the generator::
+
+    python -m qa_framework.regen generated_artifacts/<artifact>.py new_dom.html --write
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from qa_framework.artifacts import extract_code_blocks
+from qa_framework.dom import DomElement, page_hash, parse_refined_dom
+
+
+@dataclass
+class DomDiff:
+    added: list[DomElement] = field(default_factory=list)
+    removed: list[DomElement] = field(default_factory=list)
+    changed: list[tuple[DomElement, DomElement]] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+@dataclass
+class Unit:
+    """A separately regenerable piece of an artifact."""
+
+    kind: str  # "member", "method" or "test"
+    name: str
+    text: str
+
+
+@dataclass
+class RegenerationPlan:
+    diff: DomDiff
+    patched: list[str] = field(default_factory=list)
+    regenerate: list[str] = field(default_factory=list)
+
+    @property
+    def new_elements(self) -> list[DomElement]:
+        return self.diff.added
+
+    @property
+    def up_to_date(self) -> bool:
+        return self.diff.empty
+
+
+# -- snapshots ------------------------------------------------------------
+
+
+def snapshot_path(artifact: str | Path) -> Path:
+    artifact = Path(artifact)
+    return artifact.with_name(artifact.name + ".dom.json")
+
+
+def save_snapshot(artifact: str | Path, refined_dom: str) -> Path:
+    path = snapshot_path(artifact)
+    payload = {
+        "page_hash": page_hash(refined_dom),
+        "elements": [e.to_dict() for e in parse_refined_dom(refined_dom)],
+    }
+    path.write_text(json.dumps(payload, indent=1, ensure_ascii=False) + "\n", encoding="utf-8")
+    return path
+
+
+def load_snapshot(artifact: str | Path) -> tuple[str, list[DomElement]] | None:
+    path = snapshot_path(artifact)
+    if not path.exists():
+        return None
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    return payload["page_hash"], [DomElement.from_dict(e) for e in payload["elements"]]
+
+
+# -- diff -----------------------------------------------------------------
+
+
+def _keyed(elements: list[DomElement]) -> dict[tuple[str, int], DomElement]:
+    # Pages repeat locators (a header and a footer "Gmail" link share
+    # //a[normalize-space()='Gmail']), so the n-th occurrence is its own key.
+    seen: dict[str, int] = {}
+    keyed = {}
+    for element in elements:
+        xpath = element.xpath
+        keyed[xpath, seen.get(xpath, 0)] = element
+        seen[xpath] = seen.get(xpath, 0) + 1
+    return keyed
+
+
+def diff_dom(old: list[DomElement], new: list[DomElement]) -> DomDiff:
+    """Structural diff of two element lists keyed by preferred locator and occurrence."""
+    old_by_key = _keyed(old)
+    new_by_key = _keyed(new)
+    removed = [e for k, e in old_by_key.items() if k not in new_by_key]
+    added = [e for k, e in new_by_key.items() if k not in old_by_key]
+
+    diff = DomDiff()
+    unmatched_added = {id(e): e for e in added}
+    for gone in removed:
+        match = next((e for e in unmatched_added.values() if e.identity == gone.identity and gone.identity[2]), None)
+        if match is None:
+            diff.removed.append(gone)
+        else:
+            diff.changed.append((gone, match))
+            del unmatched_added[id(match)]
+    diff.added = list(unmatched_added.values())
+
+    # Same preferred locator, but a secondary locator the artifact may use
+    # (e.g. @name when @id is preferred) changed.
+    for key, before in old_by_key.items():
+        after = new_by_key.get(key)
+        if after is not None and before.locators() != after.locators():
+            diff.changed.append((before, after))
+    return diff
+
+
+# -- units ----------------------------------------------------------------
+
+_JAVA_MEMBER = re.compile(r"((?:[ \t]*@\w+FindBy\([^)]*\)\s*)+)[ \t]*(?:private|protected|public)\s+[\w<>]+\s+(\w+)\s*;")
+_JAVA_METHOD = re.compile(r"((?:@\w+\s*)*)(?:public|private|protected)\s+(?:static\s+)?[\w<>\[\]]+\s+(\w+)\s*\([^)]*\)\s*(?:throws\s+[\w.,\s]+)?\{")
+
+
+def _brace_body(text: str, open_index: int) -> str:
+    depth = 0
+    for i in range(open_index, len(text)):
+        if text[i] == "{":
+            depth += 1
+        elif text[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return text[open_index : i + 1]
+    return text[open_index:]
+
+
+def split_units(artifact_text: str) -> list[Unit]:
+    """Split the Java and Python blocks of an artifact into units."""
+    units: list[Unit] = []
+    for block in extract_code_blocks(artifact_text):
+        if block.language == "java":
+            for match in _JAVA_MEMBER.finditer(block.code):
+                units.append(Unit("member", match[2], match[0]))
+            for match in _JAVA_METHOD.finditer(block.code):
+                kind = "test" if "@Test" in match[1] else "method"
+                units.append(Unit(kind, match[2], match[0] + _brace_body(block.code, match.end() - 1)[1:]))
+        elif block.language == "python":
+            try:
+                tree = ast.parse(block.code)
+            except SyntaxError:
+                continue
+            for node in tree.body:
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    kind = "test" if node.name.startswith("test") else "method"
+                    units.append(Unit(kind, node.name, ast.get_source_segment(block.code, node) or ""))
+    return units
+
+
+def _quoted(locator: str) -> tuple[str, str]:
+    return f'"{locator}"', f"'{locator}'"
+
+
+def _references(text: str, element: DomElement) -> bool:
+    return any(q in text for form in element.locators().values() for q in _quoted(form))
+
+
+def _dependents(units: list[Unit], names: set[str]) -> set[str]:
+    """Close ``names`` over "unit text mentions that name"."""
+    result = set(names)
+    changed = True
+    while changed:
+        changed = False
+        for unit in units:
+            if unit.name in result:
+                continue
+            if any(re.search(rf"\b{re.escape(name)}\b", unit.text) for name in result):
+                result.add(unit.name)
+                changed = True
+    return result
+
+
+def rewrite_locators(text: str, changed: list[tuple[DomElement, DomElement]]) -> str:
+    """Replace quoted old locators with the new element's equivalent form."""
+    for before, after in changed:
+        new_forms = after.locators()
+        for form, old_locator in before.locators().items():
+            new_locator = new_forms.get(form) or (after.xpath if form != "css" else None)
+            if not new_locator or new_locator == old_locator:
+                continue
+            for old_q, new_q in zip(_quoted(old_locator), _quoted(new_locator)):
+                text = text.replace(old_q, new_q)
+    return text
+
+
+def plan_regeneration(artifact_text: str, diff: DomDiff) -> tuple[RegenerationPlan, str]:
+    """Return the plan and the artifact text with changed locators patched."""
+    units = split_units(artifact_text)
+    plan = RegenerationPlan(diff)
+    patched_names = {u.name for u in units if any(_references(u.text, b) for b, _ in diff.changed)}
+    broken = {u.name for u in units if any(_references(u.text, e) for e in diff.removed)}
+    plan.regenerate = [u.name for u in units if u.name in _dependents(units, broken)]
+    plan.patched = [u.name for u in units if u.name in patched_names and u.name not in plan.regenerate]
+    return plan, rewrite_locators(artifact_text, diff.changed)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Plan incremental regeneration of an artifact from a new refined DOM.")
+    parser.add_argument("artifact")
+    parser.add_argument("refined_dom", help="HTML file with the newly crawled refined DOM")
+    parser.add_argument("--write", action="store_true", help="apply locator rewrites and update the snapshot")
+    args = parser.parse_args(argv)
+
+    artifact = Path(args.artifact)
+    new_html = Path(args.refined_dom).read_text(encoding="utf-8")
+    snapshot = load_snapshot(artifact)
+    if snapshot is None:
+        print(f"no snapshot for {artifact}; run with --write to record one", file=sys.stderr)
+        if args.write:
+            save_snapshot(artifact, new_html)
+        return 2
+    old_hash, old_elements = snapshot
+    if old_hash == page_hash(new_html):
+        print("refined DOM unchanged; nothing to regenerate")
+        return 0
+
+    with artifact.open(encoding="utf-8", newline="") as f:
+        text = f.read()
+    plan, patched = plan_regeneration(text, diff_dom(old_elements, parse_refined_dom(new_html)))
+    for before, after in plan.diff.changed:
+        old_forms, new_forms = before.locators(), after.locators()
+        for form in old_forms:
+            if old_forms[form] != new_forms.get(form):
+                print(f"changed  {old_forms[form]} -> {new_forms.get(form, after.xpath)}")
+    for element in plan.diff.removed:
+        print(f"removed  {element.xpath}")
+    for element in plan.new_elements:
+        print(f"added    {element.xpath}")
+    print(f"patched in place: {', '.join(plan.patched) or '-'}")
+    print(f"regenerate:       {', '.join(plan.regenerate) or '-'}")
+    if args.write:
+        with artifact.open("w", encoding="utf-8", newline="") as f:
+            f.write(patched)
+        save_snapshot(artifact, new_html)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
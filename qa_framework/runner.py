@@ -0,0 +1,318 @@
+"""Parallel runner for the Python Playwright artifacts.
+
+Discovers every ``test_*`` function in the Python code blocks under
+``generated_artifacts/``, shards the tests across a process pool and merges
+the outcomes into one JSON / JUnit report::
+
+    python -m qa_framework.runner generated_artifacts -n 8 --junit test-results/results.xml
+
+Each worker process starts a single Playwright driver and a one-browser
+:class:`~qa_framework.browser_pool.BrowserPool`; every test gets its own
+``BrowserContext``.  Only imports, constant assignments and function / class
+definitions are taken from a block, so the module-level ``with
+sync_playwright()`` and ``main()`` drivers the LLM tends to append are never
+executed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from multiprocessing.util import Finalize
+from pathlib import Path
+from typing import Any, Callable, Iterable
+from xml.etree import ElementTree as ET
+
+from qa_framework.artifacts import ARTIFACTS_DIR, CodeBlock, iter_artifacts, read_code_blocks
+
+FIXTURE_NAMES = ("page", "context", "browser")
+
+_KEPT_NODES = (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+@dataclass(frozen=True)
+class TestItem:
+    """A discovered test function."""
+
+    path: str
+    block: int
+    name: str
+    params: tuple[str, ...]
+    is_async: bool = False
+
+    @property
+    def test_id(self) -> str:
+        return f"{self.path}::block{self.block}::{self.name}"
+
+
+@dataclass
+class TestResult:
+    test_id: str
+    outcome: str
+    duration: float
+    message: str = ""
+    worker: int = 0
+
+
+@dataclass
+class RunReport:
+    results: list[TestResult] = field(default_factory=list)
+    workers: int = 1
+    wall_time: float = 0.0
+
+    @property
+    def counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for result in self.results:
+            counts[result.outcome] = counts.get(result.outcome, 0) + 1
+        return counts
+
+    @property
+    def ok(self) -> bool:
+        return all(r.outcome in ("passed", "skipped") for r in self.results)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "wall_time": self.wall_time,
+            "counts": self.counts,
+            "results": [asdict(r) for r in self.results],
+        }
+
+    def write_json(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+    def write_junit(self, path: str | Path) -> None:
+        counts = self.counts
+        suite = ET.Element(
+            "testsuite",
+            name="generated_artifacts",
+            tests=str(len(self.results)),
+            failures=str(counts.get("failed", 0)),
+            errors=str(counts.get("error", 0)),
+            skipped=str(counts.get("skipped", 0)),
+            time=f"{self.wall_time:.3f}",
+        )
+        for result in self.results:
+            classname, _, name = result.test_id.rpartition("::")
+            case = ET.SubElement(suite, "testcase", classname=classname, name=name, time=f"{result.duration:.3f}")
+            if result.outcome in ("failed", "error"):
+                tag = "failure" if result.outcome == "failed" else "error"
+                ET.SubElement(case, tag, message=result.message.strip().splitlines()[-1] if result.message else "").text = result.message
+            elif result.outcome == "skipped":
+                ET.SubElement(case, "skipped", message=result.message)
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def harvest_module(code: str) -> ast.Module:
+    """Parse ``code`` keeping only side-effect-free top-level statements."""
+    tree = ast.parse(code)
+    tree.body = [node for node in tree.body if isinstance(node, _KEPT_NODES) or _is_constant_assignment(node)]
+    return tree
+
+
+def _is_constant_assignment(node: ast.stmt) -> bool:
+    # ``BASE_URL = "..."`` is kept; ``client = MongoClient(...)`` would connect
+    # at import time, so anything that is not a literal or a plain name is not.
+    if not isinstance(node, (ast.Assign, ast.AnnAssign)):
+        return False
+    if node.value is None or isinstance(node.value, ast.Name):
+        return True
+    try:
+        ast.literal_eval(node.value)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return False
+    return True
+
+
+def discover(paths: Iterable[str | Path] = (ARTIFACTS_DIR,), keyword: str | None = None) -> list[TestItem]:
+    """Find runnable ``test_*`` functions in the Python blocks of ``paths``."""
+    items: list[TestItem] = []
+    for root in paths:
+        for path in iter_artifacts(root):
+            if path.suffix != ".py":
+                continue
+            for block in read_code_blocks(path):
+                items.extend(_discover_block(path, block, keyword))
+    return items
+
+
+def _discover_block(path: Path, block: CodeBlock, keyword: str | None) -> list[TestItem]:
+    if block.language != "python":
+        return []
+    try:
+        tree = harvest_module(block.code)
+    except SyntaxError:
+        return []
+    found = []
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) or not node.name.startswith("test_"):
+            continue
+        params = tuple(arg.arg for arg in node.args.args)
+        if any(p not in FIXTURE_NAMES for p in params):
+            continue
+        item = TestItem(_display_path(path), block.index, node.name, params, isinstance(node, ast.AsyncFunctionDef))
+        if keyword is None or keyword in item.test_id:
+            found.append(item)
+    return found
+
+
+def _display_path(path: Path) -> str:
+    try:
+        return str(path.resolve().relative_to(Path.cwd()))
+    except ValueError:
+        return str(path)
+
+
+_namespaces: dict[tuple[str, int], dict[str, Any]] = {}
+
+
+def load_test(item: TestItem) -> Callable[..., Any]:
+    """Compile the block holding ``item`` (once per process) and return the test."""
+    key = (item.path, item.block)
+    namespace = _namespaces.get(key)
+    if namespace is None:
+        block = read_code_blocks(item.path)[item.block]
+        tree = harvest_module(block.code)
+        namespace = {"__name__": f"generated_block_{item.block}", "__file__": item.path}
+        exec(compile(tree, f"{item.path}#block{item.block}", "exec"), namespace)
+        _namespaces[key] = namespace
+    return namespace[item.name]
+
+
+# -- worker side ----------------------------------------------------------
+
+_worker_state: dict[str, Any] = {}
+
+
+def _init_worker(pool_config: dict[str, Any]) -> None:
+    from playwright.sync_api import sync_playwright
+
+    from qa_framework.browser_pool import BrowserPool, PoolConfig
+
+    playwright = sync_playwright().start()
+    pool = BrowserPool(playwright, PoolConfig(**pool_config))
+    _worker_state["pool"] = pool
+    # Worker processes leave via os._exit, which skips atexit handlers.
+    Finalize(None, _shutdown_worker, args=(pool, playwright), exitpriority=10)
+
+
+def _shutdown_worker(pool: Any, playwright: Any) -> None:
+    pool.close()
+    playwright.stop()
+
+
+def _run_one(item: TestItem) -> TestResult:
+    from qa_framework.browser_pool import BorrowedBrowser
+
+    if item.is_async:
+        return TestResult(item.test_id, "skipped", 0.0, "async test; run with --async", os.getpid())
+    pool = _worker_state["pool"]
+    start = time.perf_counter()
+    try:
+        test = load_test(item)
+        pooled = pool.acquire()
+        borrowed = BorrowedBrowser(pooled.browser, pool.config.context_options, pool.config.offline)
+        try:
+            context = borrowed.new_context()
+            fixtures = {"browser": borrowed, "context": context}
+            if "page" in item.params:
+                fixtures["page"] = context.new_page()
+            test(**{name: fixtures[name] for name in item.params})
+        finally:
+            borrowed.close()
+            pool.release(pooled)
+        outcome, message = "passed", ""
+    except AssertionError:
+        outcome, message = "failed", traceback.format_exc()
+    except Exception:
+        outcome, message = "error", traceback.format_exc()
+    return TestResult(item.test_id, outcome, time.perf_counter() - start, message, os.getpid())
+
+
+def run(items: list[TestItem], workers: int | None = None, pool_config: dict[str, Any] | None = None) -> RunReport:
+    """Run ``items`` across ``workers`` processes and merge the results."""
+    workers = max(1, min(workers or os.cpu_count() or 1, len(items) or 1))
+    pool_config = {"size": 1, **(pool_config or {})}
+    chunksize = max(1, len(items) // (workers * 4))
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(pool_config,)) as executor:
+        results = list(executor.map(_run_one, items, chunksize=chunksize))
+    return RunReport(results, workers, time.perf_counter() - start)
+
+
+def run_async_mode(
+    items: list[TestItem],
+    workers: int | None = None,
+    concurrency: int | None = None,
+    pool_config: dict[str, Any] | None = None,
+) -> RunReport:
+    """Run ``items`` on the async API: one event loop per worker process."""
+    from qa_framework.async_runner import DEFAULT_CONCURRENCY, run_shard
+
+    concurrency = concurrency or DEFAULT_CONCURRENCY
+    workers = max(1, min(workers or 1, len(items) or 1))
+    shards = [items[i::workers] for i in range(workers)]
+    start = time.perf_counter()
+    if workers == 1:
+        results = run_shard(items, concurrency, pool_config)
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [executor.submit(run_shard, shard, concurrency, pool_config) for shard in shards]
+            by_id = {r.test_id: r for f in futures for r in f.result()}
+        results = [by_id[item.test_id] for item in items]
+    return RunReport(results, workers, time.perf_counter() - start)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=[str(ARTIFACTS_DIR)])
+    parser.add_argument("-n", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("-k", "--keyword", help="only run tests whose id contains this string")
+    parser.add_argument("--headed", action="store_true", help="show browser windows")
+    parser.add_argument("--offline", action="store_true", help="serve pages from qa_framework/recordings instead of the network")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="run on the async API, many contexts per event loop")
+    parser.add_argument("-c", "--concurrency", type=int, default=None, help="tests in flight per event loop with --async (default: 8)")
+    parser.add_argument("--json", dest="json_path", help="write a JSON report here")
+    parser.add_argument("--junit", help="write a JUnit XML report here")
+    parser.add_argument("--collect-only", action="store_true")
+    args = parser.parse_args(argv)
+
+    items = discover(args.paths, args.keyword)
+    if args.collect_only:
+        for item in items:
+            print(item.test_id)
+        return 0
+    if not items:
+        print("no tests found", file=sys.stderr)
+        return 5
+
+    pool_config = {"headless": not args.headed, "offline": args.offline}
+    if args.use_async:
+        report = run_async_mode(items, args.workers, args.concurrency, pool_config)
+    else:
+        report = run(items, args.workers, pool_config)
+    for result in report.results:
+        print(f"{result.outcome.upper():7} {result.test_id} ({result.duration:.2f}s)")
+    summary = ", ".join(f"{n} {outcome}" for outcome, n in sorted(report.counts.items()))
+    print(f"\n{summary} in {report.wall_time:.2f}s on {report.workers} worker(s)")
+    if args.json_path:
+        report.write_json(args.json_path)
+    if args.junit:
+        report.write_junit(args.junit)
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
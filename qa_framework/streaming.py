@@ -0,0 +1,195 @@
+"""Write LLM responses to typed files while they are still streaming.
+
+Instead of saving the whole response as one blob once it completes,
+:class:`StreamingArtifactWriter` consumes the token stream, writes each
+fenced code block to its own file (``.py``, ``.sql``, ``.java``, ``.ts`` ...)
+the moment its closing fence arrives, appends the prose to ``<stem>.md``,
+and submits every finished block to :func:`qa_framework.validate.check_block`
+on a thread pool while the model keeps producing the rest::
+
+    with StreamingArtifactWriter("generated_artifacts/database_validation_scripts_20250601_081602") as writer:
+        for token in llm_stream:
+            writer.feed(token)
+    result = writer.result
+
+Java blocks are named after the class they declare when it can be found and
+go in a ``<stem>/`` directory of their own, so two artifacts written to the
+same output directory never overwrite each other's classes.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterable, Callable, Iterable
+
+from qa_framework.artifacts import CodeBlock, closes_fence, match_fence, normalize_language
+
+EXTENSIONS = {
+    "python": "py",
+    "sql": "sql",
+    "java": "java",
+    "typescript": "ts",
+    "javascript": "js",
+    "bash": "sh",
+    "markdown": "md",
+    "json": "json",
+    "yaml": "yaml",
+}
+
+_JAVA_CLASS = re.compile(r"^\s*(?://\s*(\w+)\.java|public\s+(?:final\s+|abstract\s+)?class\s+(\w+))", re.MULTILINE)
+
+
+@dataclass
+class WrittenBlock:
+    block: CodeBlock
+    path: Path
+    closed_at: float
+
+
+@dataclass
+class StreamResult:
+    prose_path: Path
+    blocks: list[WrittenBlock] = field(default_factory=list)
+    issues: list = field(default_factory=list)
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    @property
+    def time_to_first_block(self) -> float | None:
+        return self.blocks[0].closed_at - self.started_at if self.blocks else None
+
+    @property
+    def ok(self) -> bool:
+        return not any(issue.severity == "error" for issue in self.issues)
+
+
+class StreamingArtifactWriter:
+    """Incrementally split a streamed Markdown response into typed files.
+
+    ``stem`` is the output path without extension; block files are written
+    as ``<stem>_<n>.<ext>`` next to it, named Java classes as
+    ``<stem>/<Class>.java``.  ``on_block`` is called from the
+    feeding thread as each block is written.
+    """
+
+    def __init__(
+        self,
+        stem: str | Path,
+        validate: bool = True,
+        on_block: Callable[[WrittenBlock], None] | None = None,
+        max_workers: int = 4,
+    ) -> None:
+        self.stem = Path(stem)
+        self.stem.parent.mkdir(parents=True, exist_ok=True)
+        self.on_block = on_block
+        self._executor = ThreadPoolExecutor(max_workers) if validate else None
+        self._futures: list[Future] = []
+        self._pending = ""
+        self._line_no = 0
+        self._fence: str | None = None
+        self._lang = ""
+        self._block_start = 0
+        self._body: list[str] = []
+        self._used_names: set[str] = set()
+        self._prose = (self.stem.parent / f"{self.stem.name}.md").open("w", encoding="utf-8")
+        self.result = StreamResult(Path(self._prose.name), started_at=time.perf_counter())
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next piece of the stream; it may split lines anywhere."""
+        self._pending += chunk
+        *lines, self._pending = self._pending.split("\n")
+        for line in lines:
+            self._line(line.rstrip("\r"))
+
+    def _line(self, line: str) -> None:
+        self._line_no += 1
+        if self._fence is None:
+            opened = match_fence(line)
+            if opened:
+                self._fence, self._lang = opened
+                self._block_start, self._body = self._line_no + 1, []
+            else:
+                self._prose.write(line + "\n")
+            return
+        if closes_fence(line, self._fence):
+            self._finish_block(closed=True)
+        else:
+            self._body.append(line)
+
+    def _block_path(self, block: CodeBlock) -> Path:
+        extension = EXTENSIONS.get(block.language, block.language or "txt")
+        name = f"{self.stem.name}_{block.index}"
+        if block.language == "java":
+            match = _JAVA_CLASS.search(block.code)
+            if match and (match[1] or match[2]) not in self._used_names:
+                # javac wants the file named after the class, so the artifact
+                # gets its own directory instead of a prefix.
+                self._used_names.add(match[1] or match[2])
+                directory = self.stem.parent / self.stem.name
+                directory.mkdir(exist_ok=True)
+                return directory / f"{match[1] or match[2]}.{extension}"
+        self._used_names.add(name)
+        return self.stem.parent / f"{name}.{extension}"
+
+    def _finish_block(self, closed: bool) -> None:
+        code = "\n".join(self._body) + "\n" if self._body else ""
+        block = CodeBlock(normalize_language(self._lang), code, self._block_start, len(self.result.blocks), closed)
+        path = self._block_path(block)
+        path.write_text(code, encoding="utf-8")
+        written = WrittenBlock(block, path, time.perf_counter())
+        self.result.blocks.append(written)
+        self._fence = None
+        if self._executor is not None:
+            from qa_framework.validate import check_block
+
+            # Validate the block as the file it now is, so reported lines match it.
+            as_file = dataclasses.replace(block, start_line=1)
+            self._futures.append(self._executor.submit(check_block, as_file, str(path), True))
+        if self.on_block is not None:
+            self.on_block(written)
+
+    def close(self) -> StreamResult:
+        """Flush the tail of the stream and wait for outstanding validation."""
+        if self._pending:
+            self._line(self._pending.rstrip("\r"))
+            self._pending = ""
+        if self._fence is not None:
+            self._finish_block(closed=False)
+        self._prose.close()
+        if self._executor is not None:
+            for future in self._futures:
+                self.result.issues.extend(future.result())
+            self._executor.shutdown()
+        self.result.finished_at = time.perf_counter()
+        return self.result
+
+    def __enter__(self) -> "StreamingArtifactWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def write_stream(tokens: Iterable[str], stem: str | Path, **options) -> StreamResult:
+    writer = StreamingArtifactWriter(stem, **options)
+    try:
+        for token in tokens:
+            writer.feed(token)
+    finally:
+        result = writer.close()
+    return result
+
+
+async def write_async_stream(tokens: AsyncIterable[str], stem: str | Path, **options) -> StreamResult:
+    writer = StreamingArtifactWriter(stem, **options)
+    try:
+        async for token in tokens:
+            writer.feed(token)
+    finally:
+        result = writer.close()
+    return result
@@ -0,0 +1,376 @@
+"""A queryable store of the test cases in generated Markdown.
+
+``test_case_generation_*.md`` artifacts describe each case as a heading and
+a list of bold-labelled bullets::
+
+    ### Test Case 1: Positive Login Test
+
+    * **Test Case ID:** TC_001
+    * **Steps:**
+      1. Open the Test Login page
+    * **Priority:** High
+    * **Category:** Functional
+
+:func:`parse_test_cases` turns a document into :class:`TestCase` records and
+:class:`TestCaseStore` keeps them in SQLite, indexed by case ID, priority,
+category and target host, so selecting cases is an index lookup rather than
+another pass over the Markdown (or another LLM call)::
+
+    store = TestCaseStore()
+    store.ingest_all()
+    store.query(priority="High", category="Functional", url="practicetestautomation.com")
+
+Ingestion is incremental: a document whose content hash has not changed
+since it was last ingested is skipped, and a changed one has its cases
+replaced.  The target URL is the one given at ingest time or, failing that,
+the site the document's cases mention most.  From the command line::
+
+    python -m qa_framework.testcases ingest --url https://practicetestautomation.com/practice-test-login/
+    python -m qa_framework.testcases query --priority High --category Functional --url practicetestautomation.com
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import urlsplit
+
+from qa_framework import CACHE_ROOT
+from qa_framework.artifacts import ARTIFACTS_DIR, closes_fence, iter_artifacts, match_fence
+
+DEFAULT_DB = CACHE_ROOT / "testcases.sqlite3"
+ARTIFACT_PATTERN = "test_case_generation_*.md"
+
+_HEADING = re.compile(r"^#{2,6}\s*Test Case\s+(\d+)\s*[:.)-]?\s*(.*?)\s*#*\s*$", re.IGNORECASE)
+_FIELD = re.compile(r"^[*-]\s+\*\*(?P<label>[^*]+?)\s*:?\s*\*\*\s*:?\s*(?P<value>.*)$")
+_STEP = re.compile(r"^\s*(?:\d+[.)]|[*-])\s+(.*)$")
+_HOST = re.compile(r"(?:https?://)?((?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+(?:com|org|net|io|dev|app|edu|gov|co|uk|de))\b", re.IGNORECASE)
+
+_LABELS = {
+    "test case id": "case_id",
+    "id": "case_id",
+    "description": "description",
+    "preconditions": "preconditions",
+    "precondition": "preconditions",
+    "steps": "steps",
+    "test steps": "steps",
+    "expected result": "expected",
+    "expected results": "expected",
+    "priority": "priority",
+    "category": "category",
+    "type": "category",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    digest TEXT NOT NULL,
+    url TEXT NOT NULL,
+    ingested REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cases (
+    document INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    case_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    preconditions TEXT NOT NULL,
+    steps TEXT NOT NULL,
+    expected TEXT NOT NULL,
+    priority TEXT NOT NULL COLLATE NOCASE,
+    category TEXT NOT NULL COLLATE NOCASE,
+    url TEXT NOT NULL,
+    host TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (document, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cases_case_id ON cases(case_id);
+CREATE INDEX IF NOT EXISTS cases_selection ON cases(host, priority, category);
+CREATE INDEX IF NOT EXISTS cases_priority ON cases(priority, category);
+CREATE INDEX IF NOT EXISTS cases_category ON cases(category);
+"""
+
+_COLUMNS = ("case_id", "title", "description", "preconditions", "steps", "expected", "priority", "category", "url")
+
+
+@dataclass
+class TestCase:
+    __test__ = False  # not a pytest test class
+
+    case_id: str
+    title: str
+    description: str = ""
+    preconditions: str = ""
+    steps: list[str] = field(default_factory=list)
+    expected: str = ""
+    priority: str = ""
+    category: str = ""
+    url: str = ""
+    document: str = ""
+
+    @property
+    def host(self) -> str:
+        return normalize_host(self.url)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def normalize_host(url: str) -> str:
+    """``https://www.Example.com/x`` and ``example.com`` both become ``example.com``."""
+    url = url.strip()
+    if not url:
+        return ""
+    host = urlsplit(url if "//" in url else f"//{url}").hostname or ""
+    return host.removeprefix("www.")
+
+
+def _normalize_priority(value: str) -> str:
+    value = value.strip().strip("*").strip()
+    return value[:1].upper() + value[1:].lower()
+
+
+def _mentioned_hosts(case: TestCase) -> list[str]:
+    text = "\n".join([case.description, case.preconditions, *case.steps, case.expected])
+    return [normalize_host(m) for m in _HOST.findall(text)]
+
+
+def parse_test_cases(text: str, url: str | None = None, document: str = "") -> list[TestCase]:
+    """The test cases in one Markdown document, in document order.
+
+    Headings inside fenced blocks (such as a trailing table of contents) are
+    ignored.  A case without a ``Test Case ID`` bullet gets ``TC_<nnn>`` from
+    its heading number.  ``url`` is the target page; without it every case
+    gets the host the document mentions most.
+    """
+    cases: list[TestCase] = []
+    current: TestCase | None = None
+    label: str | None = None
+    fence: str | None = None
+    for line in text.splitlines():
+        if fence is not None:
+            if closes_fence(line, fence):
+                fence = None
+            continue
+        opened = match_fence(line)
+        if opened:
+            fence, label = opened[0], None
+            continue
+        heading = _HEADING.match(line)
+        if heading:
+            current = TestCase(f"TC_{int(heading[1]):03d}", heading[2], document=document)
+            cases.append(current)
+            label = None
+            continue
+        if current is None or not line.strip():
+            continue
+        if line.startswith("#"):
+            current = label = None
+            continue
+        bullet = _FIELD.match(line)
+        if bullet:
+            label = _LABELS.get(bullet["label"].strip().lower())
+            value = bullet["value"].strip()
+            if label == "steps":
+                if value:
+                    current.steps.append(value)
+            elif label == "priority":
+                current.priority = _normalize_priority(value)
+            elif label is not None:
+                setattr(current, label, value)
+            continue
+        if label == "steps":
+            step = _STEP.match(line)
+            if step:
+                current.steps.append(step[1].strip())
+            elif current.steps:
+                current.steps[-1] += " " + line.strip()
+        elif label in ("description", "preconditions", "expected"):
+            previous = getattr(current, label)
+            setattr(current, label, f"{previous} {line.strip()}".strip())
+
+    if url:
+        target = url.strip()
+    else:
+        mentioned = Counter(host for case in cases for host in _mentioned_hosts(case))
+        target = mentioned.most_common(1)[0][0] if mentioned else ""
+    for case in cases:
+        case.url = target
+    return cases
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.replace("\r\n", "\n").encode("utf-8")).hexdigest()
+
+
+class TestCaseStore:
+    """Test cases from any number of documents in one SQLite file."""
+
+    __test__ = False
+
+    def __init__(self, path: str | Path = DEFAULT_DB) -> None:
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(_SCHEMA)
+
+    # -- ingestion ---------------------------------------------------------
+
+    def ingest(self, path: str | Path, url: str | None = None) -> int | None:
+        """Parse ``path`` into the store; returns the number of cases, or None if unchanged.
+
+        A document is re-parsed when its content or its target ``url``
+        changed; its previous cases are replaced.
+        """
+        with self._conn:
+            return self._ingest(Path(path), url)
+
+    def ingest_all(self, root: str | Path = ARTIFACTS_DIR, url: str | None = None) -> dict[str, int | None]:
+        """Ingest every test-case document under ``root`` in one transaction; see :meth:`ingest`."""
+        with self._conn:
+            return {str(path): self._ingest(path, url) for path in iter_artifacts(root, ARTIFACT_PATTERN)}
+
+    def _ingest(self, path: Path, url: str | None) -> int | None:
+        key = str(path.resolve())
+        text = path.read_text(encoding="utf-8")
+        digest = _digest(text)
+        row = self._conn.execute("SELECT id, digest, url FROM documents WHERE path = ?", (key,)).fetchone()
+        if row is not None and row[1] == digest and (url is None or url == row[2]):
+            return None
+        cases = parse_test_cases(text, url if url is not None else (row[2] if row else None), document=key)
+        target = cases[0].url if cases else (url or "")
+        if row is not None:
+            self._conn.execute("DELETE FROM documents WHERE id = ?", (row[0],))
+        document = self._conn.execute(
+            "INSERT INTO documents (path, digest, url, ingested) VALUES (?, ?, ?, ?)",
+            (key, digest, target, time.time()),
+        ).lastrowid
+        self._conn.executemany(
+            f"INSERT INTO cases (document, position, {', '.join(_COLUMNS)}, host) VALUES ({', '.join('?' * (len(_COLUMNS) + 3))})",
+            [
+                (document, i, c.case_id, c.title, c.description, c.preconditions, "\n".join(c.steps),
+                 c.expected, c.priority, c.category, c.url, c.host)
+                for i, c in enumerate(cases)
+            ],
+        )
+        return len(cases)
+
+    def prune(self) -> int:
+        """Forget documents whose files no longer exist."""
+        missing = [(d,) for d, path in self._conn.execute("SELECT id, path FROM documents") if not Path(path).exists()]
+        with self._conn:
+            self._conn.executemany("DELETE FROM documents WHERE id = ?", missing)
+        return len(missing)
+
+    # -- queries -----------------------------------------------------------
+
+    def query(
+        self,
+        priority: str | None = None,
+        category: str | None = None,
+        url: str | None = None,
+        case_id: str | None = None,
+        limit: int | None = None,
+    ) -> list[TestCase]:
+        """Cases matching every given filter, in document order.
+
+        Priority and category compare case-insensitively; ``url`` may be a
+        full URL or a host and matches on the host.
+        """
+        where, params = [], []
+        for column, value in (("host", normalize_host(url) if url else None), ("priority", priority),
+                              ("category", category), ("case_id", case_id)):
+            if value is not None:
+                where.append(f"c.{column} = ?")
+                params.append(value)
+        sql = f"SELECT {', '.join('c.' + c for c in _COLUMNS)}, d.path FROM cases c JOIN documents d ON d.id = c.document"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY c.document, c.position"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._case(row) for row in self._conn.execute(sql, params)]
+
+    def count(self, by: str) -> dict[str, int]:
+        """Number of cases per ``priority``, ``category`` or ``host``."""
+        if by not in ("priority", "category", "host"):
+            raise ValueError(f"cannot count by {by!r}")
+        return dict(self._conn.execute(f"SELECT {by}, COUNT(*) FROM cases GROUP BY {by} ORDER BY {by}").fetchall())
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM cases").fetchone()[0]
+
+    @staticmethod
+    def _case(row: tuple) -> TestCase:
+        values = dict(zip(_COLUMNS, row))
+        values["steps"] = values["steps"].split("\n") if values["steps"] else []
+        return TestCase(**values, document=row[-1])
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "TestCaseStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _print_cases(cases: Iterable[TestCase]) -> None:
+    for case in cases:
+        print(f"{case.case_id:<8} {case.priority:<7} {case.category:<14} {case.host:<28} {case.title}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Parse generated test-case Markdown into a queryable store.")
+    parser.add_argument("--db", default=str(DEFAULT_DB), help="SQLite file of the store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="parse test-case documents into the store")
+    ingest.add_argument("paths", nargs="*", default=[str(ARTIFACTS_DIR)], help="documents or directories")
+    ingest.add_argument("--url", default=None, help="target page of the documents (default: inferred)")
+    ingest.add_argument("--prune", action="store_true", help="forget documents that were deleted")
+    query = commands.add_parser("query", help="select stored test cases")
+    query.add_argument("--priority", default=None)
+    query.add_argument("--category", default=None)
+    query.add_argument("--url", default=None, help="target URL or host")
+    query.add_argument("--id", dest="case_id", default=None)
+    query.add_argument("--limit", type=int, default=None)
+    query.add_argument("--json", action="store_true", help="print the cases as JSON")
+    stats = commands.add_parser("stats", help="count stored cases")
+    stats.add_argument("--by", choices=("priority", "category", "host"), default="priority")
+    args = parser.parse_args(argv)
+
+    with TestCaseStore(args.db) as store:
+        if args.command == "ingest":
+            for root in args.paths:
+                for path, count in store.ingest_all(root, args.url).items():
+                    print(f"{path}: {'unchanged' if count is None else f'{count} case(s)'}")
+            if args.prune:
+                print(f"pruned {store.prune()} document(s)")
+            print(f"{len(store)} case(s) in {args.db}")
+        elif args.command == "query":
+            cases = store.query(args.priority, args.category, args.url, args.case_id, args.limit)
+            if args.json:
+                print(json.dumps([c.to_dict() for c in cases], indent=2))
+            else:
+                _print_cases(cases)
+        else:
+            for key, count in store.count(args.by).items():
+                print(f"{key or '(none)':<28} {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
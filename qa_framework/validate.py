@@ -0,0 +1,387 @@
+"""Pre-CI validation gate for generated artifacts.
+
+Extracts every code block, checks it statically and rejects artifacts that
+can only fail, before CI pays for ``npx playwright install --with-deps``::
+
+    python -m qa_framework.validate generated_artifacts tests --emit-valid valid_specs.txt
+
+Checks, per block language:
+
+python
+    ``compile()`` for syntax, then every method call on a Playwright object
+    (fixture parameters and the pages, locators ... created from them) is
+    resolved against :data:`PLAYWRIGHT_PY_SYMBOLS`; properties called as methods
+    (``page.url()``) are reported too.
+typescript / javascript
+    A lexical scan for unterminated strings, unbalanced brackets and stray
+    Markdown fences, ``expect`` used without being imported, and
+    ``page.*`` / ``expect(...).*`` calls resolved against
+    :data:`PLAYWRIGHT_TS_SYMBOLS`.
+sql / java
+    Unterminated quotes and unbalanced brackets.
+
+Every finding of :func:`qa_framework.readiness.lint_waits` (``networkidle``,
+invalid load states, fixed sleeps, bare load-state waits and polling
+assertions) is an error, so the readiness helpers are enforced wherever this
+gate runs.  Files are checked in a
+process pool once there are enough of them to amortise the start-up cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from qa_framework.artifacts import CodeBlock, iter_artifacts, language_for_suffix, read_code_blocks
+from qa_framework.codegen.async_variant import AWAITABLE_METHODS, root_name
+from qa_framework.readiness import lint_waits
+
+PLAYWRIGHT_PY_PROPERTIES = frozenset(
+    {
+        "url", "keyboard", "mouse", "touchscreen", "request", "context", "frames", "main_frame",
+        "viewport_size", "video", "first", "last", "chromium", "firefox", "webkit", "devices",
+        "selectors", "browser_type", "contexts", "pages", "version", "clock", "tracing",
+    }
+)
+
+PLAYWRIGHT_PY_SYMBOLS = AWAITABLE_METHODS | frozenset(
+    {
+        "locator", "get_by_role", "get_by_text", "get_by_label", "get_by_placeholder",
+        "get_by_test_id", "get_by_alt_text", "get_by_title", "frame_locator", "frame", "nth",
+        "filter", "and_", "or_", "on", "once", "remove_listener", "expect_navigation",
+        "expect_response", "expect_request", "expect_popup", "expect_download", "expect_event",
+        "expect_file_chooser", "set_default_timeout", "set_default_navigation_timeout",
+        "is_connected", "new_cdp_session", "start", "to_have_screenshot", "not_to_be_hidden",
+        "not_to_be_checked", "not_to_be_enabled", "not_to_have_count", "not_to_have_value",
+        "not_to_have_attribute", "not_to_have_title", "not_to_be_attached", "connect",
+        "launch_persistent_context", "set_extra_http_headers", "grant_permissions",
+    }
+)
+
+#: Methods whose result is itself a Playwright object (a page, locator, handle ...).
+PLAYWRIGHT_PY_FACTORIES = frozenset(
+    {
+        "locator", "get_by_role", "get_by_text", "get_by_label", "get_by_placeholder",
+        "get_by_test_id", "get_by_alt_text", "get_by_title", "frame_locator", "frame", "nth",
+        "filter", "and_", "or_", "new_page", "new_context", "launch", "launch_persistent_context",
+        "connect", "connect_over_cdp", "query_selector", "wait_for_selector", "start",
+    }
+)
+
+#: Properties whose value is a Playwright object, or a list of them.
+PLAYWRIGHT_PY_OBJECT_PROPERTIES = PLAYWRIGHT_PY_PROPERTIES - {"url", "viewport_size", "version", "devices"}
+_PLAYWRIGHT_PY_LISTS = frozenset({"frames", "pages", "contexts"})
+
+PLAYWRIGHT_TS_PAGE_SYMBOLS = frozenset(
+    {
+        "goto", "reload", "goBack", "goForward", "close", "content", "title", "url", "screenshot",
+        "pdf", "evaluate", "evaluateHandle", "setContent", "setViewportSize", "viewportSize",
+        "waitForURL", "waitForLoadState", "waitForSelector", "waitForTimeout", "waitForFunction",
+        "waitForEvent", "waitForResponse", "waitForRequest", "click", "dblclick", "fill", "type",
+        "press", "check", "uncheck", "selectOption", "hover", "focus", "tap", "setInputFiles",
+        "textContent", "innerText", "innerHTML", "inputValue", "getAttribute", "isVisible",
+        "isHidden", "isEnabled", "isDisabled", "isChecked", "isEditable", "locator", "getByRole",
+        "getByText", "getByLabel", "getByPlaceholder", "getByTestId", "getByAltText", "getByTitle",
+        "frameLocator", "frame", "route", "unroute", "routeFromHAR", "on", "once", "off",
+        "context", "bringToFront", "addInitScript", "exposeFunction", "setDefaultTimeout",
+        "setDefaultNavigationTimeout", "dragAndDrop", "dispatchEvent", "emulateMedia",
+        "keyboard", "mouse", "mainFrame", "frames", "video", "pause", "isClosed",
+    }
+)
+
+PLAYWRIGHT_TS_MATCHERS = frozenset(
+    {
+        "toBeVisible", "toBeHidden", "toBeEnabled", "toBeDisabled", "toBeChecked", "toBeEditable",
+        "toBeEmpty", "toBeFocused", "toBeAttached", "toBeInViewport", "toHaveURL", "toHaveTitle",
+        "toHaveText", "toContainText", "toHaveValue", "toHaveValues", "toHaveCount",
+        "toHaveAttribute", "toHaveClass", "toHaveId", "toHaveCSS", "toHaveScreenshot",
+        "toHaveAccessibleName", "toHaveAccessibleDescription", "toHaveJSProperty", "toBeOK",
+        "toBe", "toEqual", "toStrictEqual", "toBeTruthy", "toBeFalsy", "toBeDefined",
+        "toBeUndefined", "toBeNull", "toContain", "toMatch", "toBeGreaterThan",
+        "toBeGreaterThanOrEqual", "toBeLessThan", "toBeLessThanOrEqual", "toHaveLength",
+        "toHaveProperty", "toThrow", "toMatchObject", "toBeCloseTo", "toBeInstanceOf",
+        "toMatchSnapshot", "toPass",
+    }
+)
+
+PLAYWRIGHT_TS_SYMBOLS = PLAYWRIGHT_TS_PAGE_SYMBOLS | PLAYWRIGHT_TS_MATCHERS
+
+_PY_FIXTURES = frozenset({"page", "context", "browser", "playwright"})
+
+@dataclass(frozen=True)
+class Issue:
+    path: str
+    line: int
+    severity: str
+    rule: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}: {self.severity}: {self.rule}: {self.message}"
+
+
+@dataclass
+class ArtifactReport:
+    path: str
+    issues: list[Issue] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not any(issue.severity == "error" for issue in self.issues)
+
+
+# -- python ---------------------------------------------------------------
+
+
+class _PlaywrightCallChecker(ast.NodeVisitor):
+    """Resolve method calls made on Playwright objects.
+
+    A value is a Playwright object when it is a fixture parameter, a
+    ``sync_playwright()`` handle, a Playwright property or the result of a
+    :data:`PLAYWRIGHT_PY_FACTORIES` call on one of those.  Calls on anything
+    else (``page.title().lower()``) are plain Python and left alone.
+    """
+
+    def __init__(self, path: str, first_line: int) -> None:
+        self.path = path
+        self.offset = first_line - 1
+        self.tracked: set[str] = set()
+        self.issues: list[Issue] = []
+
+    def _issue(self, node: ast.AST, rule: str, message: str) -> None:
+        self.issues.append(Issue(self.path, node.lineno + self.offset, "error", rule, message))
+
+    def _is_playwright(self, node: ast.AST) -> bool:
+        if isinstance(node, ast.Await):
+            return self._is_playwright(node.value)
+        if isinstance(node, ast.Name):
+            return node.id in self.tracked
+        if isinstance(node, ast.Attribute):
+            return node.attr in PLAYWRIGHT_PY_OBJECT_PROPERTIES - _PLAYWRIGHT_PY_LISTS and self._is_playwright(node.value)
+        if isinstance(node, ast.Subscript):
+            value = node.value
+            return isinstance(value, ast.Attribute) and value.attr in _PLAYWRIGHT_PY_LISTS and self._is_playwright(value.value)
+        if isinstance(node, ast.Call):
+            func = node.func
+            if isinstance(func, ast.Name):
+                return func.id in ("expect", "sync_playwright", "async_playwright")
+            return isinstance(func, ast.Attribute) and func.attr in PLAYWRIGHT_PY_FACTORIES and self._is_playwright(func.value)
+        return False
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        saved = set(self.tracked)
+        self.tracked |= {arg.arg for arg in node.args.args if arg.arg in _PY_FIXTURES}
+        self.generic_visit(node)
+        self.tracked = saved
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_With(self, node: ast.With) -> None:
+        for item in node.items:
+            if isinstance(item.optional_vars, ast.Name) and root_name(item.context_expr) in (
+                "sync_playwright", "async_playwright",
+            ):
+                self.tracked.add(item.optional_vars.id)
+        self.generic_visit(node)
+
+    visit_AsyncWith = visit_With
+
+    def _bind(self, targets: list[ast.expr], value: ast.AST | None) -> None:
+        names = {t.id for t in targets if isinstance(t, ast.Name)}
+        if value is not None and self._is_playwright(value):
+            self.tracked |= names
+        else:
+            self.tracked -= names
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        self.generic_visit(node)
+        self._bind(node.targets, node.value)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        self.generic_visit(node)
+        self._bind([node.target], node.value)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        self.generic_visit(node)
+        func = node.func
+        if not isinstance(func, ast.Attribute) or not self._is_playwright(func.value):
+            return
+        if func.attr in PLAYWRIGHT_PY_PROPERTIES:
+            self._issue(node, "property-call", f"'{func.attr}' is a property, not a method")
+        elif func.attr not in PLAYWRIGHT_PY_SYMBOLS:
+            self._issue(node, "unknown-api", f"'{func.attr}' is not a Playwright API")
+
+
+def check_python(block: CodeBlock, path: str) -> list[Issue]:
+    try:
+        tree = ast.parse(block.code)
+    except SyntaxError as exc:
+        line = block.start_line + (exc.lineno or 1) - 1
+        return [Issue(path, line, "error", "syntax", exc.msg)]
+    checker = _PlaywrightCallChecker(path, block.start_line)
+    checker.visit(tree)
+    return checker.issues
+
+
+# -- lexical checks for brace languages -----------------------------------
+
+_PAIRS = {")": "(", "]": "[", "}": "{"}
+
+
+def _scan(code: str, path: str, first_line: int, quotes: str, template: bool, line_comment: str) -> list[Issue]:
+    issues: list[Issue] = []
+    stack: list[tuple[str, int]] = []
+    line = first_line
+    i = 0
+    n = len(code)
+    while i < n:
+        ch = code[i]
+        if ch == "\n":
+            line += 1
+        elif code.startswith(line_comment, i):
+            i = code.find("\n", i)
+            if i < 0:
+                break
+            continue
+        elif code.startswith("/*", i):
+            end = code.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            line += code.count("\n", i, end)
+            i = end
+            continue
+        elif ch in quotes or (template and ch == "`"):
+            start_line = line
+            j = i + 1
+            while j < n and code[j] != ch:
+                if code[j] == "\\":
+                    j += 1
+                elif code[j] == "\n":
+                    if ch != "`":
+                        break
+                    line += 1
+                j += 1
+            if j >= n or code[j] != ch:
+                issues.append(Issue(path, start_line, "error", "unterminated-string", f"string opened with {ch} is never closed"))
+                i = j
+                continue
+            i = j
+        elif ch in "([{":
+            stack.append((ch, line))
+        elif ch in _PAIRS:
+            if not stack or stack[-1][0] != _PAIRS[ch]:
+                issues.append(Issue(path, line, "error", "unbalanced", f"unexpected '{ch}'"))
+            else:
+                stack.pop()
+        i += 1
+    for opener, opened_at in stack:
+        issues.append(Issue(path, opened_at, "error", "unbalanced", f"'{opener}' is never closed"))
+    return issues
+
+
+_FENCE_LINE = re.compile(r"^\s*(`{3,}|~{3,})")
+_TS_PAGE_CALL = re.compile(r"\bpage\.(\w+)\s*\(")
+_TS_MATCHER = re.compile(r"\bexpect\((?:[^()]|\([^()]*\))*\)\s*(?:\.not)?\.(\w+)\s*\(")
+_TS_EXPECT_IMPORT = re.compile(r"(?:import\s*\{[^}]*\bexpect\b[^}]*\}|\bexpect\b\s*(?:=|,|\})[^;\n]*require\(|const\s+\{[^}]*\bexpect\b)")
+
+
+def check_typescript(block: CodeBlock, path: str, whole_file: bool) -> list[Issue]:
+    code = block.code
+    issues: list[Issue] = []
+    if whole_file:
+        for offset, text in enumerate(code.splitlines()):
+            if _FENCE_LINE.match(text):
+                issues.append(Issue(path, block.start_line + offset, "error", "markdown-fence", "Markdown fence in a source file"))
+        code = "\n".join("" if _FENCE_LINE.match(t) else t for t in code.splitlines())
+    issues.extend(_scan(code, path, block.start_line, "'\"", True, "//"))
+    if re.search(r"\bexpect\(", code) and not _TS_EXPECT_IMPORT.search(code):
+        line = block.start_line + code[: re.search(r"\bexpect\(", code).start()].count("\n")
+        issues.append(Issue(path, line, "error", "undefined-name", "'expect' is used but never imported"))
+    for pattern, symbols in ((_TS_PAGE_CALL, PLAYWRIGHT_TS_PAGE_SYMBOLS), (_TS_MATCHER, PLAYWRIGHT_TS_MATCHERS)):
+        for match in pattern.finditer(code):
+            if match[1] not in symbols:
+                line = block.start_line + code[: match.start()].count("\n")
+                issues.append(Issue(path, line, "error", "unknown-api", f"'{match[1]}' is not a Playwright API"))
+    return issues
+
+
+def check_block(block: CodeBlock, path: str, whole_file: bool = False) -> list[Issue]:
+    language = block.language
+    if language == "python":
+        issues = check_python(block, path)
+    elif language in ("typescript", "javascript"):
+        issues = check_typescript(block, path, whole_file)
+    elif language == "java":
+        issues = _scan(block.code, path, block.start_line, "\"'", False, "//")
+    elif language == "sql":
+        issues = _scan(block.code, path, block.start_line, "'\"", False, "--")
+    else:
+        return []
+    if not block.closed:
+        issues.append(Issue(path, block.start_line, "error", "unterminated-block", "code fence is never closed"))
+    if language in ("python", "typescript", "javascript"):
+        issues.extend(
+            Issue(w.path, w.line, "error", w.rule, w.message)
+            for w in lint_waits(block.code, path, block.start_line)
+        )
+    return issues
+
+
+def validate_file(path: str | Path) -> ArtifactReport:
+    path = Path(path)
+    report = ArtifactReport(str(path))
+    text = path.read_text(encoding="utf-8")
+    is_source = language_for_suffix(path) in ("typescript", "javascript")
+    if is_source:
+        # Spec files are run as-is, so fences make them invalid even if the
+        # code between them is fine.
+        block = CodeBlock(language_for_suffix(path), text, 1, 0)
+        report.issues.extend(check_block(block, str(path), whole_file=True))
+        return report
+    blocks = read_code_blocks(path)
+    if path.suffix == ".py" and blocks and blocks[0].code != text:
+        report.issues.append(Issue(str(path), 1, "warning", "markdown-wrapped", "artifact is Markdown with fenced code, not importable Python"))
+    for block in blocks:
+        report.issues.extend(check_block(block, str(path)))
+    return report
+
+
+def validate(paths: Iterable[str | Path], jobs: int | None = None) -> list[ArtifactReport]:
+    """Validate every artifact under ``paths``, in parallel when it pays off."""
+    files = [p for root in paths for p in iter_artifacts(root)]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(files) >= jobs * 4:
+        with ProcessPoolExecutor(jobs) as executor:
+            return list(executor.map(validate_file, files, chunksize=8))
+    return [validate_file(path) for path in files]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Reject generated artifacts that cannot run.")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    parser.add_argument("--emit-valid", metavar="FILE", help="write the Playwright spec files that passed, one per line")
+    parser.add_argument("-q", "--quiet", action="store_true", help="hide warnings")
+    args = parser.parse_args(argv)
+
+    reports = validate(args.paths, args.jobs)
+    for report in reports:
+        for issue in report.issues:
+            if issue.severity == "error" or not args.quiet:
+                print(issue)
+    rejected = [r.path for r in reports if not r.ok]
+    if args.emit_valid:
+        valid = [r.path for r in reports if r.ok and r.path.endswith((".spec.ts", ".spec.js", ".test.ts", ".test.js"))]
+        Path(args.emit_valid).write_text("".join(f"{p}\n" for p in valid), encoding="utf-8")
+    print(f"{len(reports) - len(rejected)} valid, {len(rejected)} rejected", file=sys.stderr)
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
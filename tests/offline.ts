@@ -0,0 +1,28 @@
+// Playwright Test fixtures for the generated specs.
+//
+// With QA_OFFLINE=1 every browser context is served from the HAR recordings
+// in qa_framework/recordings/, the way qa_framework.mock_sites.install does
+// for the Python suites: recorded requests are fulfilled from the HAR files
+// and everything else is aborted, so no request leaves the machine.
+import * as fs from 'fs';
+import * as path from 'path';
+import { test as base, expect } from '@playwright/test';
+
+const RECORDINGS = path.resolve(__dirname, '..', 'qa_framework', 'recordings');
+const OFFLINE = !['', '0', 'false', 'no'].includes(process.env.QA_OFFLINE ?? '0');
+
+export const test = base.extend({
+  context: async ({ context }, use) => {
+    if (OFFLINE) {
+      // Routes are tried newest first, so this one only sees requests no
+      // recording answered.
+      await context.route('**/*', route => route.abort('internetdisconnected'));
+      for (const har of fs.readdirSync(RECORDINGS).filter(name => name.endsWith('.har')).sort()) {
+        await context.routeFromHAR(path.join(RECORDINGS, har), { notFound: 'fallback' });
+      }
+    }
+    await use(context);
+  },
+});
+
+export { expect };
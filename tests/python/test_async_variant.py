@@ -0,0 +1,76 @@
+import ast
+from pathlib import Path
+
+import pytest
+
+from qa_framework.artifacts import read_code_blocks
+from qa_framework.codegen.async_variant import to_async
+from qa_framework.validate import validate_file
+
+ARTIFACTS = Path(__file__).resolve().parents[2] / "generated_artifacts"
+
+SYNC = '''
+from playwright.sync_api import sync_playwright, expect
+
+def login(page, user):
+    page.fill("#username", user)
+    page.click("#submit")
+
+def heading(page):
+    return page.locator("h1")
+
+def test_login(page):
+    login(page, "student")
+    expect(heading(page)).to_have_text("Logged In Successfully")
+    assert page.title().startswith("Logged")
+
+with sync_playwright() as p:
+    browser = p.chromium.launch()
+    page = browser.new_page()
+    test_login(page)
+    browser.close()
+'''
+
+ASYNC = '''
+import asyncio
+from playwright.async_api import async_playwright, expect
+
+async def login(page, user):
+    await page.fill("#username", user)
+    await page.click("#submit")
+
+def heading(page):
+    return page.locator("h1")
+
+async def test_login(page):
+    await login(page, "student")
+    await expect(heading(page)).to_have_text("Logged In Successfully")
+    assert (await page.title()).startswith("Logged")
+
+async def _main():
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        page = await browser.new_page()
+        await test_login(page)
+        await browser.close()
+
+if __name__ == "__main__":
+    asyncio.run(_main())
+'''
+
+
+def test_to_async_awaits_io_and_leaves_locator_builders_alone():
+    assert ast.dump(ast.parse(to_async(SYNC))) == ast.dump(ast.parse(ASYNC))
+
+
+@pytest.mark.parametrize("artifact", sorted(ARTIFACTS.glob("playwright_*_python_*.py")), ids=lambda p: p.stem[-6:])
+def test_shipped_artifacts_convert_to_valid_async_code(artifact, tmp_path):
+    for block in read_code_blocks(artifact):
+        if block.language != "python" or "def test_" not in block.code:
+            continue
+        converted = to_async(block.code)
+        tree = ast.parse(converted)
+        assert not any(isinstance(node, ast.FunctionDef) and node.name.startswith("test_") for node in ast.walk(tree))
+        out = tmp_path / f"block_{block.index}.py"
+        out.write_text(converted)
+        assert validate_file(out).ok, validate_file(out).issues
@@ -0,0 +1,68 @@
+import json
+
+from qa_framework.auth_state import PRACTICE_TEST_AUTOMATION, StorageStateCache
+
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+        self.visited = []
+
+    def route(self, pattern, handler):
+        self.routes.append(pattern)
+
+    def new_page(self):
+        return FakePage(self)
+
+    def storage_state(self, path):
+        with open(path, "w") as f:
+            json.dump({"cookies": [], "origins": []}, f)
+
+    def close(self):
+        pass
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+
+    def goto(self, url):
+        # Record whether the request would have left the machine.
+        self.context.visited.append((url, bool(self.context.routes)))
+
+    def fill(self, selector, value):
+        pass
+
+    def click(self, selector):
+        pass
+
+    def wait_for_url(self, pattern):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, **options):
+        self.contexts.append(FakeContext())
+        return self.contexts[-1]
+
+
+def test_offline_login_is_served_from_the_recordings(tmp_path):
+    browser = FakeBrowser()
+    cache = StorageStateCache(tmp_path, ttl=60)
+
+    path = cache.ensure(browser, PRACTICE_TEST_AUTOMATION, "student", "Password123", offline=True)
+
+    assert path.exists()
+    assert browser.contexts[0].visited == [(PRACTICE_TEST_AUTOMATION.url, True)]
+    # A fresh entry is reused without another login.
+    assert cache.ensure(browser, PRACTICE_TEST_AUTOMATION, "student", "Password123", offline=True) == path
+    assert len(browser.contexts) == 1
+
+
+def test_online_login_installs_no_routes(tmp_path):
+    browser = FakeBrowser()
+    StorageStateCache(tmp_path, ttl=60).ensure(browser, PRACTICE_TEST_AUTOMATION, "student", "Password123")
+    assert browser.contexts[0].routes == []
@@ -0,0 +1,57 @@
+import sqlite3
+
+from qa_framework.db import backup as backup_module
+from qa_framework.db.backup import backup, checksum_file, main, restore, verify
+from qa_framework.db.schema import parse_ddl
+
+DDL = """
+CREATE TABLE users (id INT PRIMARY KEY, email VARCHAR(255), nickname VARCHAR(64));
+CREATE TABLE search_history (id INT PRIMARY KEY, user_id INT REFERENCES users(id), query TEXT);
+"""
+
+
+def make_source(tmp_path):
+    path = tmp_path / "source.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(DDL)
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?)", [(i, f"u{i}@example.test", None if i % 3 else f"n{i}") for i in range(1, 51)])
+    conn.executemany("INSERT INTO search_history VALUES (?, ?, ?)", [(i, i % 50 + 1, f"query {i}") for i in range(1, 201)])
+    conn.commit()
+    conn.close()
+    return f"sqlite:///{path}"
+
+
+def test_backup_restore_round_trip(tmp_path):
+    schema = parse_ddl(DDL)
+    source = make_source(tmp_path)
+
+    manifest = backup(source, tmp_path / "backup", schema, batch_size=16)
+    assert {t: e["rows"] for t, e in manifest["tables"].items()} == {"users": 50, "search_history": 200}
+    assert checksum_file(tmp_path / "backup" / "users.jsonl.gz", mongo=False).hexdigest == manifest["tables"]["users"]["checksum"]
+
+    restore(f"sqlite:///{tmp_path / 'restored.db'}", tmp_path / "backup", schema, batch_size=16)
+    conn = sqlite3.connect(tmp_path / "restored.db")
+    assert conn.execute("SELECT COUNT(*), COUNT(nickname) FROM users").fetchone() == (50, 16)
+    conn.close()
+
+    checks = verify(source, f"sqlite:///{tmp_path / 'scratch.db'}", tmp_path / "verify", schema, batch_size=16)
+    assert [(c.table, c.rows, c.ok) for c in checks] == [("users", 50, True), ("search_history", 200, True)]
+
+
+def test_corrupted_restore_is_reported(tmp_path, monkeypatch, capsys):
+    (tmp_path / "schema.sql").write_text(DDL, encoding="utf-8")
+    source = make_source(tmp_path)
+    bulk_insert = backup_module.bulk_insert
+
+    def corrupting_insert(conn, dialect, table, rows):
+        if table.name == "search_history":
+            rows = [rows[0][:2] + ("tampered",)] + rows[1:]
+        bulk_insert(conn, dialect, table, rows)
+
+    monkeypatch.setattr(backup_module, "bulk_insert", corrupting_insert)
+    status = main(["verify", source, f"sqlite:///{tmp_path / 'scratch.db'}", str(tmp_path / "backup"), "--schema", str(tmp_path / "schema.sql")])
+
+    out = capsys.readouterr().out
+    assert status == 1
+    assert "users" in out and "ok" in out
+    assert [line.split()[0] for line in out.splitlines() if line.endswith("MISMATCH")] == ["search_history"]
@@ -0,0 +1,103 @@
+import pytest
+
+from qa_framework.browser_pool import BorrowedBrowser, BrowserPool, PoolConfig
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+        self.routes = []
+
+    def route(self, pattern, handler):
+        self.routes.append(pattern)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+        self.contexts = []
+        self.on_health_check = None
+
+    def is_connected(self):
+        if self.on_health_check:
+            self.on_health_check()
+        return not self.closed
+
+    def new_context(self, **options):
+        self.contexts.append(FakeContext())
+        return self.contexts[-1]
+
+    def close(self):
+        self.closed = True
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.launched = []
+
+    @property
+    def chromium(self):
+        return self
+
+    def launch(self, **options):
+        self.launched.append(FakeBrowser())
+        return self.launched[-1]
+
+
+def test_browsers_are_reused_then_recycled_after_max_uses():
+    playwright = FakePlaywright()
+    pool = BrowserPool(playwright, PoolConfig(size=1, max_uses=3))
+    for _ in range(3):
+        pool.release(pool.acquire())
+    assert len(playwright.launched) == 1 and playwright.launched[0].closed
+    pool.release(pool.acquire())
+    assert len(playwright.launched) == 2 and not playwright.launched[1].closed
+
+
+def test_disconnected_browsers_are_replaced():
+    playwright = FakePlaywright()
+    pool = BrowserPool(playwright, PoolConfig(size=1))
+    pooled = pool.acquire()
+    pooled.browser.closed = True
+    pool.release(pooled)
+    assert pool.acquire().browser is not pooled.browser
+
+
+def test_full_pool_times_out():
+    pool = BrowserPool(FakePlaywright(), PoolConfig(size=1))
+    pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+
+
+def test_context_is_closed_and_routed_when_offline():
+    playwright = FakePlaywright()
+    pool = BrowserPool(playwright, PoolConfig(offline=True))
+    with pool.context() as context:
+        assert context.routes == ["**/*"]
+    assert context.closed
+    assert not playwright.launched[0].closed
+
+
+def test_borrowed_browser_close_only_closes_its_contexts():
+    browser = FakeBrowser()
+    borrowed = BorrowedBrowser(browser)
+    first = borrowed.new_context()
+    borrowed.close()
+    assert first.closed and not browser.closed
+    assert borrowed.is_connected()
+
+
+def test_release_overlapping_close_does_not_leak_the_browser():
+    pool = BrowserPool(FakePlaywright(), PoolConfig(size=2))
+    pooled = pool.acquire()
+    # close() runs while release() is health-checking the browser.
+    pooled.browser.on_health_check = pool.close
+    pool.release(pooled)
+    assert pooled.browser.closed
+    assert pool._idle == []
+    with pytest.raises(RuntimeError):
+        pool.acquire()
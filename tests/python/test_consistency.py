@@ -0,0 +1,59 @@
+import sqlite3
+
+from qa_framework.db.consistency import derive_checks, main, validate_consistency
+from qa_framework.db.schema import parse_ddl
+
+DDL = """
+CREATE TABLE users (id INT PRIMARY KEY, email VARCHAR(255));
+CREATE TABLE search_history (id INT PRIMARY KEY, user_id INT REFERENCES users(id), query TEXT);
+CREATE TABLE feedback (id INT PRIMARY KEY, email VARCHAR(255) REFERENCES users(email), comment TEXT);
+"""
+
+# The same tables without constraints, as a bulk load would leave them.
+LOOSE_DDL = """
+CREATE TABLE users (id INT, email VARCHAR(255));
+CREATE TABLE search_history (id INT, user_id INT, query TEXT);
+CREATE TABLE feedback (id INT, email VARCHAR(255), comment TEXT);
+"""
+
+
+def make_db(tmp_path):
+    path = tmp_path / "google.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(LOOSE_DDL)
+    users = [(i, f"u{i}@example.test") for i in range(1, 11)] + [(3, "again@example.test")]
+    conn.executemany("INSERT INTO users VALUES (?, ?)", users)
+    conn.executemany("INSERT INTO search_history VALUES (?, ?, ?)", [(i, i % 10 + 1, "q") for i in range(1, 21)] + [(21, 99, "orphan")])
+    conn.executemany("INSERT INTO feedback VALUES (?, ?, ?)", [(1, "u1@example.test", "ok"), (2, "u2@example.test", "ok")])
+    conn.commit()
+    conn.close()
+    return f"sqlite:///{path}"
+
+
+def test_fanout_is_only_checked_for_non_key_references():
+    checks = {(c.kind, c.name) for c in derive_checks(parse_ddl(DDL))}
+    assert ("join-fanout", "feedback.email -> users.email") in checks
+    assert not any(kind == "join-fanout" and "users.id" in name for kind, name in checks)
+
+
+def test_orphans_and_duplicate_keys_are_reported(tmp_path):
+    url = make_db(tmp_path)
+    violations = validate_consistency(url, parse_ddl(DDL), workers=2)
+    found = sorted((v.check.kind, v.check.name, v.count, v.samples) for v in violations)
+    assert found == [
+        ("duplicate-keys", "users.id", 1, [3]),
+        ("orphans", "search_history.user_id -> users.id", 1, [21]),
+    ]
+
+
+def test_duplicated_referenced_values_fan_out(tmp_path, capsys):
+    url = make_db(tmp_path)
+    conn = sqlite3.connect(url.split(":///", 1)[1])
+    conn.execute("INSERT INTO users VALUES (11, 'u1@example.test')")
+    conn.commit()
+    conn.close()
+    (tmp_path / "schema.sql").write_text(DDL, encoding="utf-8")
+
+    assert main([url, "--schema", str(tmp_path / "schema.sql")]) == 1
+    out = capsys.readouterr().out
+    assert "join-fanout     feedback.email -> users.email: 1 violation(s), e.g. u1@example.test" in out
@@ -0,0 +1,61 @@
+import sqlite3
+
+from qa_framework.db.datagen import DataGenerator, load, main, plan_rows
+from qa_framework.db.schema import load_schema
+
+
+def dump(path, schema):
+    conn = sqlite3.connect(path)
+    try:
+        return {t: conn.execute(f"SELECT * FROM {t} ORDER BY id").fetchall() for t in schema}
+    finally:
+        conn.close()
+
+
+def test_plan_rows_applies_fanout():
+    schema = load_schema()
+    assert plan_rows(schema, {"users": 100}, {"feedback": 3}) == {"users": 100, "search_history": 500, "feedback": 300, "settings": 200}
+
+
+def test_chunks_depend_only_on_seed_table_and_offset():
+    schema = load_schema()
+    rows = plan_rows(schema, {"users": 100})
+    table = schema["search_history"]
+    chunks = list(DataGenerator(schema, rows, seed=7).chunks(table, chunk_size=120))
+    assert [len(c) for c in chunks] == [120, 120, 120, 120, 20]
+    # Any chunk can be regenerated on its own.
+    assert DataGenerator(schema, rows, seed=7).chunk(table, 240, 360) == chunks[2]
+    assert [row[0] for row in chunks[2]] == list(range(241, 361))
+    assert DataGenerator(schema, rows, seed=8).chunk(table, 240, 360) != chunks[2]
+
+
+def test_same_seed_loads_identical_rows(tmp_path):
+    schema = load_schema()
+    rows = plan_rows(schema, {"users": 300})
+    for name in ("a.db", "b.db"):
+        load(f"sqlite:///{tmp_path / name}", schema, rows, seed=42, chunk_size=64, create=True)
+    load(f"sqlite:///{tmp_path / 'c.db'}", schema, rows, seed=43, chunk_size=64, create=True)
+
+    first = dump(tmp_path / "a.db", schema)
+    assert {t: len(r) for t, r in first.items()} == rows
+    assert dump(tmp_path / "b.db", schema) == first
+    assert dump(tmp_path / "c.db", schema) != first
+
+
+def test_loaded_foreign_keys_have_no_orphans(tmp_path, capsys):
+    assert main([f"sqlite:///{tmp_path / 'load.db'}", "--create", "--rows", "users=500", "--chunk-size", "128"]) == 0
+    assert "total" in capsys.readouterr().out
+
+    schema = load_schema()
+    conn = sqlite3.connect(tmp_path / "load.db")
+    try:
+        for table in schema.values():
+            for fk in table.foreign_keys:
+                orphans = conn.execute(
+                    f"SELECT COUNT(*) FROM {table.name} c LEFT JOIN {fk.ref_table} p ON p.{fk.ref_column} = c.{fk.column}"
+                    f" WHERE p.{fk.ref_column} IS NULL"
+                ).fetchone()[0]
+                assert orphans == 0, f"{table.name}.{fk.column}"
+        assert conn.execute("SELECT COUNT(*) FROM search_history").fetchone()[0] == 2500
+    finally:
+        conn.close()
@@ -0,0 +1,89 @@
+import pytest
+
+from qa_framework.db import pool as pool_module
+from qa_framework.db.pool import ConnectionPool, DbPoolConfig, get_pool
+
+
+@pytest.fixture
+def url(tmp_path):
+    return f"sqlite:///{tmp_path / 'pool.db'}"
+
+
+def test_pool_warms_up_and_never_exceeds_its_size(url):
+    pool = ConnectionPool(url, DbPoolConfig(size=2, warm=1))
+    assert pool.stats["connects"] == 1
+    first, second = pool.acquire(), pool.acquire()
+    assert pool.stats["connects"] == 2
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+    pool.release(first)
+    assert pool.acquire(timeout=0.01) is first
+    pool.close()
+
+
+def test_in_memory_databases_get_a_single_connection():
+    pool = ConnectionPool("sqlite:///:memory:", DbPoolConfig(size=8, warm=4))
+    assert (pool.config.size, pool.stats["connects"]) == (1, 1)
+
+
+def test_release_rolls_back_uncommitted_work(url):
+    pool = ConnectionPool(url, DbPoolConfig(size=1, warm=1), on_connect=lambda c: c.execute("CREATE TABLE IF NOT EXISTS t (x INT)"))
+    with pool.connection() as conn:
+        conn.execute("INSERT INTO t VALUES (1)")
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone() == (0,)
+
+
+def test_connections_are_recycled_after_max_uses(url):
+    pool = ConnectionPool(url, DbPoolConfig(size=1, warm=1, max_uses=2))
+    seen = []
+    for _ in range(4):
+        with pool.connection() as conn:
+            seen.append(conn)
+    assert seen[0] is seen[1] and seen[2] is seen[3] and seen[1] is not seen[2]
+    assert pool.stats["connects"] == 2
+
+
+def test_dead_idle_connections_are_replaced(url):
+    pool = ConnectionPool(url, DbPoolConfig(size=1, warm=1, ping_after=0))
+    with pool.connection() as conn:
+        pass
+    conn.close()
+    with pool.connection() as fresh:
+        assert fresh is not conn
+        fresh.execute("SELECT 1")
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.on_rollback = None
+
+    def rollback(self):
+        if self.on_rollback:
+            self.on_rollback()
+
+    def close(self):
+        self.closed = True
+
+
+def test_release_overlapping_close_does_not_leak_the_connection(monkeypatch):
+    monkeypatch.setattr(pool_module, "connect", lambda url: FakeConnection())
+    pool = ConnectionPool("sqlite:///fake.db", DbPoolConfig(size=2, warm=0))
+    pooled = pool.acquire()
+    # close() runs while release() is rolling the connection back.
+    pooled.conn.on_rollback = pool.close
+    pool.release(pooled)
+    assert pooled.conn.closed
+    assert pool._idle == [] and pool._opened == 0
+
+
+def test_pools_are_per_process(url, monkeypatch):
+    parent = get_pool(url)
+    assert get_pool(url) is parent
+    monkeypatch.setattr(pool_module.os, "getpid", lambda: -1)
+    child = get_pool(url)
+    assert child is not parent
+    pool_module.close_all()
+    monkeypatch.undo()
+    assert get_pool(url) is parent
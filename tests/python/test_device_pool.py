@@ -0,0 +1,99 @@
+import http.client
+import socket
+import threading
+
+import pytest
+
+from qa_framework.mobile.device_pool import Device, DevicePool, DevicePoolConfig
+from qa_framework.mobile.stub_server import StubWebDriverServer
+from qa_framework.mobile.webdriver import _Connection
+
+
+@pytest.fixture
+def server():
+    with StubWebDriverServer() as stub:
+        yield stub
+
+
+def _pool(server, **config):
+    return DevicePool([Device("emulator-5554", "android", server.base_url)], DevicePoolConfig(lease_timeout=5, **config))
+
+
+def test_released_sessions_are_reset_and_reused(server):
+    pool = _pool(server)
+    with pool.lease("android") as session:
+        session.get("https://www.google.com")
+        session.command("POST", "/cookie", {"cookie": {"name": "sid", "value": "1"}})
+        first = session.session_id
+    with pool.lease("android") as session:
+        assert session.session_id == first
+        assert session.current_url == "about:blank"
+        assert server.sessions[first].cookies == []
+    pool.close()
+
+    assert (pool.stats.sessions_started, pool.stats.reused, pool.stats.resets) == (1, 1, 2)
+    assert server.sessions == {}
+
+
+def test_other_capabilities_evict_the_idle_session(server):
+    pool = _pool(server)
+    with pool.lease("android") as session:
+        first = session.session_id
+    with pool.lease({"platformName": "Android", "appium:autoGrantPermissions": True}) as session:
+        assert session.session_id != first
+        assert list(server.sessions) == [session.session_id]
+    pool.close()
+
+    assert (pool.stats.sessions_started, pool.stats.sessions_quit) == (2, 2)
+
+
+def test_failed_and_worn_out_sessions_are_quit(server):
+    pool = _pool(server, max_uses=2)
+    with pytest.raises(AssertionError):
+        with pool.lease("android"):
+            raise AssertionError
+    for _ in range(2):
+        with pool.lease("android"):
+            pass
+    assert pool.stats.sessions_started == 2
+    assert pool.stats.sessions_quit == 2
+    assert server.sessions == {}
+
+
+def test_release_after_close_quits_the_session(server):
+    pool = _pool(server)
+    lease = pool.acquire("android")
+    pool.close()
+    pool.release(lease)
+    assert server.sessions == {}
+
+
+@pytest.fixture
+def hangup_server():
+    """Reads one request per connection and closes it without answering."""
+    listener = socket.create_server(("127.0.0.1", 0))
+    received = []
+
+    def serve():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            with conn:
+                received.append(conn.recv(65536).split(b" ", 1)[0].decode())
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield f"http://127.0.0.1:{listener.getsockname()[1]}", received
+    listener.close()
+
+
+def test_only_idempotent_commands_are_retried(hangup_server):
+    url, received = hangup_server
+    connection = _Connection(url, timeout=5)
+    with pytest.raises(http.client.RemoteDisconnected):
+        connection.request("POST", "/session/x/element/e1/click")
+    assert received == ["POST"]
+    with pytest.raises(http.client.RemoteDisconnected):
+        connection.request("GET", "/session/x/url")
+    assert received == ["POST", "GET", "GET"]
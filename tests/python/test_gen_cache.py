@@ -0,0 +1,82 @@
+import os
+
+from qa_framework import gen_cache
+from qa_framework.gen_cache import GenerationCache, GenerationKey
+
+
+def key(dom):
+    return GenerationKey("playwright_automation_script_generation_python", dom, "template", {"temperature": 0})
+
+
+def test_miss_then_hit(tmp_path):
+    cache = GenerationCache(tmp_path)
+    calls = []
+
+    def generate():
+        calls.append(1)
+        return "script"
+
+    assert cache.get(key("<a>")) is None
+    assert cache.get_or_generate(key("<a>"), generate) == ("script", False)
+    assert cache.get_or_generate(key("  <a>\n"), generate) == ("script", True)
+    assert len(calls) == 1
+    assert cache.get(key("<b>")) is None
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(gen_cache.time, "time", lambda: now[0])
+    cache = GenerationCache(tmp_path, ttl=60)
+    cache.put(key("<a>"), "script")
+
+    now[0] += 59
+    assert cache.get(key("<a>")) == "script"
+    now[0] += 2
+    assert cache.get(key("<a>")) is None
+    assert not list(tmp_path.rglob("*.json"))
+
+
+def test_get_survives_a_concurrent_eviction(tmp_path, monkeypatch):
+    cache = GenerationCache(tmp_path)
+    cache.put(key("<a>"), "script")
+
+    def evicted(path):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(gen_cache.os, "utime", evicted)
+    assert cache.get(key("<a>")) == "script"
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path):
+    cache = GenerationCache(tmp_path, max_entries=4)
+    for i, dom in enumerate(["<a>", "<b>", "<c>", "<d>"]):
+        cache.put(key(dom), dom)
+        path = cache._path(key(dom).digest())
+        os.utime(path, (100 + i, 100 + i))
+    # Reading <a> makes it the most recently used entry.
+    assert cache.get(key("<a>")) == "<a>"
+
+    cache.put(key("<e>"), "<e>")
+
+    # Over the limit: trimmed to 90% of four, dropping <b> and <c>.
+    assert [cache.get(key(dom)) for dom in ["<a>", "<b>", "<c>", "<d>", "<e>"]] == ["<a>", None, None, "<d>", "<e>"]
+
+
+def test_put_scans_the_directory_only_past_the_limit(tmp_path, monkeypatch):
+    cache = GenerationCache(tmp_path, max_entries=10)
+    scans = []
+    entries = cache._entries
+
+    def counting_entries():
+        scans.append(1)
+        return entries()
+
+    monkeypatch.setattr(cache, "_entries", counting_entries)
+    for i in range(10):
+        cache.put(key(f"<p{i}>"), "script")
+    cache.put(key("<p0>"), "rewritten")
+    assert len(scans) == 1
+
+    cache.put(key("<p10>"), "script")
+    assert len(scans) == 2
+    assert len(list(tmp_path.rglob("*.json"))) == 9
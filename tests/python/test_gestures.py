@@ -0,0 +1,105 @@
+from pathlib import Path
+
+from qa_framework.mobile import PLATFORMS
+from qa_framework.mobile.gestures import (
+    batch,
+    default_gestures,
+    double_tap,
+    load_gestures,
+    long_press,
+    pinch_close,
+    pinch_open,
+    replay,
+    rewrite_touch_actions,
+    save_gestures,
+    swipe,
+    tap,
+)
+from qa_framework.mobile.stub_server import StubWebDriverServer
+from qa_framework.mobile.webdriver import Session
+
+ARTIFACT = Path(__file__).resolve().parents[2] / "generated_artifacts" / "mobile_automation_scripts_appium_20250601_081508.py"
+
+
+def test_expected_ms_is_the_longest_action_of_every_tick():
+    assert tap(1, 2).expected_ms == 50
+    assert double_tap(1, 2).expected_ms == 200
+    assert long_press(1, 2, duration=1200).expected_ms == 1200
+    assert swipe((0, 0), (10, 10)).expected_ms == 300
+    # Both fingers move at once, so a pinch takes one move, not two.
+    assert pinch_open((100, 100), (200, 200)).expected_ms == 400
+    assert pinch_close((100, 100), (200, 200)).expected_ms == 400
+
+
+def test_pinch_fingers_move_between_the_midpoint_and_the_targets():
+    first, second = pinch_open((100, 100), (200, 300)).sources
+    assert (first["actions"][0]["x"], first["actions"][0]["y"]) == (150, 200)
+    assert (first["actions"][2]["x"], second["actions"][2]["y"]) == (100, 300)
+
+
+def test_batch_pads_idle_fingers_to_stay_tick_aligned():
+    gestures = [tap(10, 10), pinch_open((100, 100), (200, 200)), swipe((0, 0), (0, 50))]
+    merged = batch(gestures)
+
+    assert merged.name == "tap+pinch_open+swipe"
+    assert [s["id"] for s in merged.sources] == ["finger1", "finger2"]
+    finger1, finger2 = (s["actions"] for s in merged.sources)
+    assert len(finger1) == len(finger2) == 12
+    assert finger2[:4] == finger2[8:] == [{"type": "pause", "duration": 0}] * 4
+    assert finger2[4:8] == gestures[1].sources[1]["actions"]
+    assert merged.expected_ms == sum(g.expected_ms for g in gestures)
+
+
+def test_recordings_round_trip(tmp_path):
+    save_gestures(tmp_path / "gestures.json", default_gestures())
+    assert load_gestures(tmp_path / "gestures.json") == default_gestures()
+
+
+def test_touch_action_chains_in_the_artifact_are_rewritten():
+    with ARTIFACT.open(encoding="utf-8", newline="") as f:
+        text = f.read()
+
+    rewritten, count = rewrite_touch_actions(text)
+
+    assert count == 3
+    assert "Gestures.tap(driver, 100, 100);" in rewritten
+    assert "Gestures.swipe(driver, 100, 100, 200, 200);" in rewritten
+    assert "Gestures.pinchOpen(driver, 100, 100, 200, 200);" in rewritten
+    assert "TouchAction" not in rewritten and "PointOption" not in rewritten
+    assert "import io.appium.java_client.MobileElement;\r\n\r\npublic class TouchGesturesTest" in rewritten
+    assert rewrite_touch_actions(rewritten) == (rewritten, 0)
+
+
+def test_imports_stay_while_a_chain_is_left_unrewritten():
+    text = (
+        "import io.appium.java_client.TouchAction;\n"
+        "new TouchAction(driver).tap(PointOption.point(1, 2)).perform();\n"
+        "new TouchAction(driver).press(PointOption.point(1, 2)).moveTo(PointOption.point(3, 4)).release().perform();\n"
+    )
+    rewritten, count = rewrite_touch_actions(text)
+    assert count == 1
+    assert rewritten.startswith("import io.appium.java_client.TouchAction;\nGestures.tap(driver, 1, 2);\n")
+
+
+def test_replay_sends_one_actions_request_per_gesture():
+    gestures = default_gestures()
+    with StubWebDriverServer(action_scale=0) as stub:
+        posted = []
+        dispatch = stub.dispatch
+
+        def recording_dispatch(method, path, body):
+            if method == "POST" and path.endswith("/actions"):
+                posted.append(body["actions"])
+            return dispatch(method, path, body)
+
+        stub.dispatch = recording_dispatch
+        session = Session.create(stub.base_url, PLATFORMS["android"])
+        try:
+            timings = replay(session, gestures, repeat=3, warmup=1)
+        finally:
+            session.quit()
+
+    assert [(t.gesture, t.expected_ms) for t in timings] == [("tap", 50), ("swipe", 300), ("pinch_open", 400)]
+    assert len(posted) == 4 * len(gestures)
+    assert posted == [g.sources for g in gestures for _ in range(4)]
+
@@ -0,0 +1,73 @@
+import sqlite3
+
+import pytest
+
+from qa_framework.db.datagen import create_schema
+from qa_framework.db.isolation import KeyAllocator, TransactionalIsolation
+from qa_framework.db.schema import load_schema
+
+pytest_plugins = ["pytester"]
+
+# Both tests write user 1 and create the same table; each fails if it can see
+# anything the other one did, whichever runs first.
+ISOLATED_TESTS = """
+import pytest
+from qa_framework.db.isolation import TransactionalIsolation
+
+pytest_plugins = ["qa_framework.pytest_plugin"]
+
+
+def visible(db):
+    users = db.execute("SELECT email FROM users WHERE id = 1").fetchall()
+    tables = db.execute("SELECT name FROM sqlite_master WHERE name = 'scratch'").fetchall()
+    return users, tables
+
+
+@pytest.mark.parametrize("writer", ["first", "second"])
+def test_write_the_same_row(db, writer):
+    assert visible(db) == ([], [])
+
+    db.execute("CREATE TABLE scratch (id INT PRIMARY KEY, writer TEXT)")
+    db.execute("INSERT INTO scratch VALUES (1, ?)", (writer,))
+    db.execute("INSERT INTO users (id, email) VALUES (1, ?)", (writer + "@example.com",))
+    with TransactionalIsolation(db, "sqlite").savepoint():
+        db.execute("UPDATE users SET email = 'savepoint@example.com' WHERE id = 1")
+        db.execute("DROP TABLE scratch")
+    assert visible(db) == ([(writer + "@example.com",)], [("scratch",)])
+    assert db.execute("SELECT writer FROM scratch").fetchall() == [(writer,)]
+"""
+
+
+def test_tests_do_not_see_each_others_writes(pytester, tmp_path, monkeypatch):
+    path = tmp_path / "google.db"
+    conn = sqlite3.connect(path)
+    create_schema(conn, "sqlite", load_schema())
+    conn.close()
+    monkeypatch.setenv("QA_DB_URL", f"sqlite:///{path}")
+    pytester.makepyfile(test_isolated=ISOLATED_TESTS)
+
+    pytester.runpytest("-p", "no:cacheprovider").assert_outcomes(passed=2)
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM users").fetchone() == (0,)
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'scratch'").fetchone() == (0,)
+    conn.close()
+
+
+def test_sqlite_transaction_survives_the_modules_implicit_commit(tmp_path):
+    conn = sqlite3.connect(tmp_path / "implicit.db")
+    isolation = TransactionalIsolation(conn, "sqlite")
+    with isolation.transaction():
+        conn.execute("CREATE TABLE t (id INT)")
+        conn.execute("INSERT INTO t VALUES (1)")
+    assert conn.isolation_level == ""
+    assert conn.execute("SELECT name FROM sqlite_master").fetchall() == []
+    conn.close()
+
+
+def test_key_blocks_are_disjoint_per_worker():
+    first, second = KeyAllocator(worker=0, block=10, reserved=5), KeyAllocator(worker=1, block=10)
+    assert [first.next("users") for _ in range(5)] == [6, 7, 8, 9, 10]
+    assert [second.next("users"), second.next("feedback")] == [11, 11]
+    with pytest.raises(OverflowError):
+        first.next("users")
@@ -0,0 +1,22 @@
+from qa_framework.db.datagen import load, plan_rows
+from qa_framework.db.load import LoadConfig, key_floor, run_load
+from qa_framework.db.schema import load_schema
+
+
+def test_reruns_only_conflict_at_the_configured_ratio(tmp_path):
+    url = f"sqlite:///{tmp_path / 'load.db'}"
+    schema = load_schema()
+    load(url, schema, plan_rows(schema, {"users": 200}), seed=0, create=True)
+    config = LoadConfig(url, workers=2, duration=0.5, read_ratio=0.2, conflict_ratio=0.05, users=200)
+
+    first = run_load(config)
+    floor = key_floor(url)
+    assert floor["users"] > 200
+    second = run_load(config)
+
+    for report in (first, second):
+        inserts = report.operations["insert_user"]
+        assert report.operations["insert_history"].errors == 0
+        assert report.duplicate_keys == inserts.errors
+        assert inserts.errors <= max(5, inserts.count * 0.2)
+    assert key_floor(url)["users"] > floor["users"]
@@ -0,0 +1,34 @@
+from qa_framework.dom import DomElement
+from qa_framework.mobile.locators import Locator, benchmark
+
+
+class FakeDriver:
+    def __init__(self):
+        self.lookups = []
+
+    def find_element(self, strategy, value):
+        self.lookups.append((strategy, value))
+
+
+TWINS = [DomElement("input", {"name": "q"}), DomElement("input", {"name": "q"})]
+PAGE = [DomElement("input", {"name": "q"}), DomElement("input", {"id": "email", "name": "email"})]
+
+
+def test_no_unique_candidate_without_baseline():
+    driver = FakeDriver()
+    assert benchmark(driver, TWINS[0], TWINS, warmup=0, repeat=2) == (None, [])
+    assert driver.lookups == []
+
+
+def test_no_unique_candidate_keeps_the_baseline():
+    baseline = Locator("xpath", "(//input[@name='q'])[1]")
+    winner, measured = benchmark(FakeDriver(), TWINS[0], TWINS, warmup=0, repeat=2, baseline=baseline)
+    assert winner == baseline
+    assert [r.name for r in measured] == [str(baseline)]
+
+
+def test_only_unique_candidates_are_timed():
+    driver = FakeDriver()
+    winner, measured = benchmark(driver, PAGE[1], PAGE, warmup=0, repeat=2)
+    assert {r.name for r in measured} == {"name=email", "id=email", "xpath=//input[@id='email']"}
+    assert winner in {Locator("name", "email"), Locator("id", "email"), Locator("xpath", "//input[@id='email']")}
@@ -0,0 +1,64 @@
+import sqlite3
+
+import pytest
+
+from qa_framework.db import migration
+from qa_framework.db.migration import verify_migration
+
+
+def _db(path, tables):
+    conn = sqlite3.connect(path)
+    for name, (key_type, rows) in tables.items():
+        conn.execute(f"CREATE TABLE {name} (id {key_type} PRIMARY KEY, email TEXT, password TEXT)")
+        conn.executemany(f"INSERT INTO {name} VALUES (?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+    return f"sqlite:///{path}"
+
+
+def test_value_moved_into_a_null_neighbour_is_a_mismatch(tmp_path):
+    url = _db(tmp_path / "m.db", {"users": ("INT", [(1, "x", None)]), "users_new": ("INT", [(1, None, "x")])})
+    report = verify_migration(url, url, "users", "users_new")
+    assert not report.ok
+    assert [(d.key, d.kind) for d in report.diffs] == [(1, "changed")]
+    assert migration.main([url, "users", "users_new"]) == 1
+
+
+def test_identical_tables_pass(tmp_path):
+    rows = [(i, f"u{i}@example.com", None if i % 3 else "pw") for i in range(1, 501)]
+    url = _db(tmp_path / "m.db", {"users": ("INT", rows), "users_new": ("INT", rows)})
+    report = verify_migration(url, url, "users", "users_new", chunk_size=100)
+    assert report.ok
+    assert (report.source_rows, report.target_rows, report.mismatched_chunks) == (500, 500, 0)
+
+
+def test_drill_down_finds_missing_extra_and_changed_keys(tmp_path, monkeypatch):
+    monkeypatch.setattr(migration, "LEAF_SIZE", 8)
+    monkeypatch.setattr(migration, "FANOUT", 4)
+    rows = [(i, f"u{i}@example.com", "pw") for i in range(1, 2001)]
+    target = [r for r in rows if r[0] != 700]
+    target = [(i, "changed@example.com", p) if i == 1234 else (i, e, p) for i, e, p in target] + [(5000, "new@example.com", "pw")]
+    url = _db(tmp_path / "m.db", {"users": ("INT", rows), "users_new": ("INT", target)})
+
+    report = verify_migration(url, url, "users", "users_new", chunk_size=500)
+
+    assert sorted((d.key, d.kind) for d in report.diffs) == [(700, "missing"), (1234, "changed"), (5000, "extra")]
+    assert report.chunks == 5
+    # Drilling touches the mismatching chunks only, not every row.
+    assert report.queries < report.source_rows / 10
+
+
+@pytest.mark.parametrize(
+    "key_type, keys",
+    [("INT", [1, 10**6, 10**12, 10**15]), ("TEXT", ["alice", "bob", "carol", "dave"])],
+    ids=["sparse", "text"],
+)
+def test_sparse_and_text_keys(tmp_path, key_type, keys):
+    rows = [(k, f"{k}@example.com", None) for k in keys]
+    target = rows[:2] + [(rows[2][0], "other@example.com", None)] + rows[3:]
+    url = _db(tmp_path / "m.db", {"users": (key_type, rows), "users_new": (key_type, target)})
+
+    report = verify_migration(url, url, "users", "users_new", chunk_size=2)
+
+    assert report.chunks == 3
+    assert [(d.key, d.kind) for d in report.diffs] == [(keys[2], "changed")]
@@ -0,0 +1,96 @@
+import base64
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from qa_framework import mock_sites
+from qa_framework.mock_sites import HarStore, MockSiteServer
+
+
+def _har(path, entries):
+    path.write_text(json.dumps({"log": {"version": "1.2", "entries": entries}}))
+    return path
+
+
+def _entry(url, body, status=200, base64_body=False):
+    content = {"mimeType": "text/html", "text": base64.b64encode(body).decode() if base64_body else body.decode()}
+    if base64_body:
+        content["encoding"] = "base64"
+    headers = [{"name": "Content-Type", "value": "text/html"}, {"name": "Content-Length", "value": "999"}]
+    return {"request": {"method": "GET", "url": url}, "response": {"status": status, "headers": headers, "content": content}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HarStore()
+    store.load(_har(tmp_path / "a.har", [
+        _entry("https://www.example.com/", b"<h1>home</h1>"),
+        _entry("https://www.example.com/login?next=/", b"\x89PNG", base64_body=True),
+    ]))
+    store.load(_har(tmp_path / "b.har", [_entry("https://www.example.com/", b"<h1>newer</h1>")]))
+    return store
+
+
+def test_store_matches_on_method_host_and_path(store):
+    assert store.hosts == {"www.example.com"}
+    assert store.lookup("GET", "https://www.example.com").body == b"<h1>newer</h1>"
+    login = store.lookup("get", "https://www.example.com/login?utm=x")
+    assert login.body == b"\x89PNG"
+    assert "Content-Length" not in login.headers
+    assert store.lookup("POST", "https://www.example.com/") is None
+    assert store.lookup("GET", "https://other.example.com/") is None
+
+
+def test_shipped_recordings_cover_the_artifact_sites():
+    assert {"www.google.com", "practicetestautomation.com", "www.rediff.com", "www.rediffmail.com", "www.toysrus.com"} <= mock_sites.default_store().hosts
+
+
+def test_server_serves_recordings_and_404s_the_rest(store):
+    with MockSiteServer(store) as server:
+        with urllib.request.urlopen(server.url_for("https://www.example.com/")) as response:
+            assert (response.status, response.read()) == (200, b"<h1>newer</h1>")
+        with pytest.raises(urllib.error.HTTPError) as missing:
+            urllib.request.urlopen(server.url_for("https://www.example.com/nope"))
+        assert missing.value.code == 404
+
+
+class FakeRoute:
+    def __init__(self, method, url):
+        self.request = type("Request", (), {"method": method, "url": url})()
+        self.outcome = None
+
+    def fulfill(self, status, headers, body):
+        self.outcome = ("fulfill", status, body)
+
+    def abort(self, reason):
+        self.outcome = ("abort", reason)
+
+
+class FakeContext:
+    def __init__(self):
+        self.handlers = []
+
+    def route(self, pattern, handler):
+        self.handlers.append((pattern, handler))
+
+
+def test_routes_fulfil_recorded_requests_and_abort_the_rest(store):
+    context = FakeContext()
+    mock_sites.install(context, store)
+    (pattern, handle), = context.handlers
+    assert pattern == "**/*"
+
+    recorded, unrecorded = FakeRoute("GET", "https://www.example.com/"), FakeRoute("GET", "https://cdn.example.net/x.js")
+    handle(recorded)
+    handle(unrecorded)
+    assert recorded.outcome == ("fulfill", 200, b"<h1>newer</h1>")
+    assert unrecorded.outcome == ("abort", "internetdisconnected")
+
+
+def test_specs_run_through_the_offline_fixtures():
+    specs = sorted((mock_sites.RECORDINGS_DIR.parents[1] / "tests").glob("*.spec.ts"))
+    assert specs
+    for spec in specs:
+        assert "from './offline'" in spec.read_text(), spec.name
@@ -0,0 +1,69 @@
+import ast
+
+import pytest
+
+from qa_framework.codegen.page_model import TARGETS, build_model, compile_model
+
+LOGIN = """
+<form action="/practice-test-login/">
+  <label for="username">Username</label><input id="username" name="username" type="text">
+  <label for="password">Password</label><input id="password" name="password" type="password">
+  <button id="submit" class="btn">Submit</button>
+</form>
+<div id="error" class="show">Your username is invalid!</div>
+"""
+
+AWKWARD = """
+<form action="/signup">
+  <input type="text"><input type="text">
+  <input name="from" type="text">
+  <input placeholder="2FA code" type="text">
+  <input name="o'brien" type="text">
+  <select name="default"><option>a</option></select>
+  <button type="submit">Sign up</button>
+</form>
+"""
+
+
+def _python(html: str, url: str = "https://example.com/signup") -> str:
+    return compile_model(build_model(html, url), "playwright-python")
+
+
+def test_login_page_model():
+    model = build_model(LOGIN, "https://practicetestautomation.com/practice-test-login/")
+    assert model.name == "PracticeTestLoginPage"
+    login = next(m for m in model.actions if m.name == "login")
+    assert login.params == ["username", "password"]
+    assert [s.kind for s in login.steps] == ["fill", "fill", "click"]
+    assert "expect_error_message" in [m.name for m in model.assertions]
+
+
+@pytest.mark.parametrize("html", [LOGIN, AWKWARD])
+def test_python_page_object_compiles(html):
+    compile(_python(html), "page_object.py", "exec")
+
+
+def test_awkward_names_are_valid_and_distinct():
+    tree = ast.parse(_python(AWKWARD))
+    methods = {f.name: [a.arg for a in f.args.args[1:]] for f in ast.walk(tree) if isinstance(f, ast.FunctionDef)}
+    assert methods["enter_from"] == ["from_value"]
+    assert methods["select_default"] == ["default_value"]
+    params = methods["submit_signup"]
+    assert len(params) == len(set(params)) == 6
+    assert all(p.isidentifier() for p in params)
+
+
+def test_indistinguishable_fields_get_indexed_locators():
+    model = build_model(AWKWARD, "https://example.com/signup")
+    first, second = model.elements[:2]
+    assert (first.web.value, second.web.value) == ("(//input)[1]", "(//input)[2]")
+
+
+def test_quotes_in_attribute_values_are_escaped():
+    source = _python(AWKWARD)
+    assert """page.locator("input[name=\\"o'brien\\"]")""" in source
+
+
+@pytest.mark.parametrize("target", TARGETS)
+def test_every_target_compiles_from_one_model(target):
+    assert "class PracticeTestLoginPage" in compile_model(build_model(LOGIN, "https://practicetestautomation.com/practice-test-login/"), target)
@@ -0,0 +1,72 @@
+import sqlite3
+
+from qa_framework.db.datagen import create_schema
+from qa_framework.db.plans import Access, Plan, artifact_queries, capture_plan, compare, main, missing_fk_indexes
+from qa_framework.db.schema import load_schema
+
+QUERY = "SELECT * FROM search_history WHERE user_id = 1"
+
+
+def make_db(tmp_path):
+    conn = sqlite3.connect(tmp_path / "google.db")
+    create_schema(conn, "sqlite", load_schema())
+    conn.execute("CREATE INDEX idx_search_history_user ON search_history (user_id)")
+    conn.commit()
+    return conn
+
+
+def test_artifact_queries_are_extracted():
+    assert artifact_queries() == [QUERY]
+
+
+def test_dropping_an_index_is_a_seq_scan_regression(tmp_path):
+    conn = make_db(tmp_path)
+    baseline = capture_plan(conn, "sqlite", QUERY + ";")
+    assert baseline.accesses == [Access("search_history", "index", "idx_search_history_user")]
+
+    conn.execute("DROP INDEX idx_search_history_user")
+    conn.close()
+    # A new connection, as a later run would use: sqlite3 caches the
+    # prepared EXPLAIN and does not re-plan it after DDL.
+    conn = sqlite3.connect(tmp_path / "google.db")
+    current = capture_plan(conn, "sqlite", QUERY)
+    conn.close()
+
+    assert current.accesses == [Access("search_history", "seq_scan")]
+    regressions = compare(Plan.from_dict(baseline.to_dict()), current)
+    assert [(r.kind, r.query) for r in regressions] == [("seq-scan", QUERY)]
+    assert compare(baseline, baseline) == []
+
+
+def test_cost_and_rows_growth_beyond_the_ratio():
+    before = Plan(QUERY, cost=10.0, rows=100.0)
+    assert compare(before, Plan(QUERY, cost=14.0, rows=190.0)) == []
+    assert [r.kind for r in compare(before, Plan(QUERY, cost=16.0, rows=250.0))] == ["cost", "rows"]
+
+
+def test_unindexed_foreign_keys_are_reported(tmp_path):
+    conn = make_db(tmp_path)
+    assert "search_history" not in {t.name for t, _ in missing_fk_indexes(conn, "sqlite", load_schema())}
+
+    conn.execute("DROP INDEX idx_search_history_user")
+    missing = missing_fk_indexes(conn, "sqlite", load_schema())
+    conn.close()
+    assert ("search_history", "user_id", "users") in {(t.name, fk.column, fk.ref_table) for t, fk in missing}
+
+
+def test_cli_fails_against_the_recorded_baseline(tmp_path, capsys):
+    make_db(tmp_path).close()
+    url = f"sqlite:///{tmp_path / 'google.db'}"
+    baseline = tmp_path / "plan_baselines.json"
+
+    assert main([url, "--baseline", str(baseline), "--update"]) == 0
+    assert main([url, "--baseline", str(baseline)]) == 0
+
+    conn = sqlite3.connect(tmp_path / "google.db")
+    conn.execute("DROP INDEX idx_search_history_user")
+    conn.close()
+    capsys.readouterr()
+    assert main([url, "--baseline", str(baseline)]) == 1
+    out = capsys.readouterr().out
+    assert "REGRESSION [seq-scan] search_history" in out
+    assert "missing index: search_history.user_id references users.id" in out
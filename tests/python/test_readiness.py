@@ -0,0 +1,85 @@
+import pytest
+
+from qa_framework import readiness
+from qa_framework.readiness import WaitBudgets, lint_waits
+
+
+@pytest.mark.parametrize(
+    "line, rule",
+    [
+        ("page.wait_for_load_state('networkidle')", "networkidle"),
+        ("await page.waitForLoadState('networkidle2');", "networkidle"),
+        ("page.goto(url, wait_until='idle')", "invalid-state"),
+        ("page.wait_for_timeout(500)", "fixed-sleep"),
+        ("time.sleep(2)", "fixed-sleep"),
+        ("await new Promise(r => setTimeout(r, 1000));", "fixed-sleep"),
+        ("page.wait_for_load_state()", "load-state"),
+        ("assert page.locator('#x').count() > 0", "polling-assert"),
+        ("assert error.text_content() == 'Bad'", "polling-assert"),
+        ("expect(await page.locator('a').count()).toBeGreaterThan(0);", "polling-assert"),
+    ],
+)
+def test_lint_flags_wait_anti_patterns(line, rule):
+    assert [i.rule for i in lint_waits(line)] == [rule]
+
+
+def test_lint_accepts_event_driven_waits_and_reports_lines():
+    code = (
+        "page.wait_for_load_state('domcontentloaded')\n"
+        "# page.wait_for_timeout(1000)\n"
+        "expect(page.locator('#error')).to_be_visible()\n"
+        "page.wait_for_timeout(1000)\n"
+    )
+    assert [(i.line, i.rule) for i in lint_waits(code, "a.py", first_line=10)] == [(13, "fixed-sleep")]
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+
+        return call
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append(("__call__", args, kwargs))
+        return self
+
+
+@pytest.fixture
+def expect(monkeypatch):
+    recorder = Recorder()
+    monkeypatch.setattr(readiness, "_expect", lambda: recorder)
+    return recorder
+
+
+def test_helpers_use_web_first_assertions_with_budgets(expect):
+    page = Recorder()
+    budgets = WaitBudgets(default_ms=5000, navigation_ms=9000, per_selector={"#error": 2000, "**/done/**": 3000})
+
+    readiness.expect_visible(page, "#error", budgets)
+    readiness.expect_text(page, "#msg", "Hi", budgets, exact=True)
+    readiness.expect_url(page, "**/done/**", budgets)
+
+    assert [(name, kwargs) for name, _, kwargs in expect.calls if name.startswith("to_")] == [
+        ("to_be_visible", {"timeout": 2000}),
+        ("to_have_text", {"timeout": 5000}),
+        ("to_have_url", {"timeout": 3000}),
+    ]
+
+
+def test_click_and_goto_wait_for_the_url_or_element_only():
+    page = Recorder()
+    readiness.click_and_wait_for_url(page, "#submit", "**/logged-in/**")
+    readiness.goto_ready(page, "https://example.com", "#q", WaitBudgets(per_selector={"#q": 1500}))
+
+    assert page.calls == [
+        ("click", ("#submit",), {"timeout": 5000}),
+        ("wait_for_url", ("**/logged-in/**",), {"wait_until": "commit", "timeout": 10000}),
+        ("goto", ("https://example.com",), {"wait_until": "domcontentloaded", "timeout": 10000}),
+        ("locator", ("#q",), {}),
+        ("wait_for", (), {"state": "visible", "timeout": 1500}),
+    ]
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from qa_framework.dom import parse_refined_dom
+from qa_framework.regen import diff_dom, plan_regeneration
+
+ARTIFACT = Path(__file__).resolve().parents[2] / "generated_artifacts" / "mobile_automation_scripts_appium_20250601_081508.py"
+ABOUT = "https://about.google/?fg=1&amp;utm_source=google-IN&amp;utm_medium=referral&amp;utm_campaign=hp-header"
+
+PAGE = f"""
+<header><a href="{ABOUT}">About</a> <a>Gmail</a></header>
+<form action="/search">
+  <textarea name="q" aria-label="Search"></textarea>
+  <input name="btnK" type="submit" value="Google Search">
+</form>
+<footer><a>Gmail</a></footer>
+"""
+
+
+def plan(new_page):
+    diff = diff_dom(parse_refined_dom(PAGE), parse_refined_dom(new_page))
+    return plan_regeneration(ARTIFACT.read_text(encoding="utf-8"), diff)
+
+
+def test_unchanged_page_has_an_empty_diff():
+    assert diff_dom(parse_refined_dom(PAGE), parse_refined_dom(PAGE)).empty
+
+
+def test_duplicate_locators_are_diffed_per_occurrence():
+    diff = diff_dom(parse_refined_dom(PAGE), parse_refined_dom(PAGE.replace("<footer><a>Gmail</a></footer>", "")))
+    assert [e.xpath for e in diff.removed] == ["//a[normalize-space()='Gmail']"]
+    assert not diff.added and not diff.changed
+
+    diff = diff_dom(parse_refined_dom(PAGE), parse_refined_dom(PAGE.replace("</footer>", "<a>Gmail</a></footer>")))
+    assert [e.xpath for e in diff.added] == ["//a[normalize-space()='Gmail']"]
+
+
+def test_renamed_element_is_patched_in_place():
+    result, patched = plan(PAGE.replace('name="q"', 'name="query"'))
+
+    assert [(b.xpath, a.xpath) for b, a in result.diff.changed] == [("//textarea[@name='q']", "//textarea[@name='query']")]
+    assert result.patched == ["searchBox"]
+    assert result.regenerate == []
+    assert "//textarea[@name='q']" not in patched
+    assert patched.count("//textarea[@name='query']") == 2
+
+
+def test_removed_element_regenerates_its_dependents():
+    result, patched = plan(PAGE.replace('<input name="btnK" type="submit" value="Google Search">', ""))
+
+    assert [e.xpath for e in result.diff.removed] == ["//input[@name='btnK']"]
+    assert result.regenerate == ["googleSearchButton", "clickGoogleSearch", "testGoogleHomePage", "testGoogleHomePage"]
+    assert result.patched == []
+    assert patched == ARTIFACT.read_text(encoding="utf-8")
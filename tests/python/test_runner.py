@@ -0,0 +1,151 @@
+import ast
+import os
+import xml.etree.ElementTree as ET
+
+from qa_framework import runner
+from qa_framework.browser_pool import BrowserPool, PoolConfig
+
+ARTIFACT = '''
+import os
+from pathlib import Path
+
+BASE_URL = "https://example.test/"
+TIMEOUTS = {"short": 1_000, "long": 30_000}
+ALIAS = BASE_URL
+client = MongoClient("mongodb://localhost:27017/")
+start_time = time.time()
+
+
+def helper(page):
+    return page
+
+
+def test_passes(page):
+    assert helper(page).url == ""
+    assert BASE_URL.endswith("/") and ALIAS is BASE_URL
+
+
+def test_fails(context):
+    assert context.new_page() is None, "no page"
+
+
+def test_errors(browser):
+    raise RuntimeError("boom")
+
+
+async def test_async(page):
+    pass
+
+
+def test_needs_unknown_fixture(page, login):
+    pass
+
+
+with sync_playwright() as p:
+    raise SystemExit("module-level driver must not run")
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+
+def write_artifact(tmp_path):
+    path = tmp_path / "playwright_generated.py"
+    path.write_text(ARTIFACT, encoding="utf-8")
+    return path
+
+
+def test_harvest_keeps_only_side_effect_free_statements():
+    kept = [ast.unparse(node).splitlines()[0] for node in runner.harvest_module(ARTIFACT).body]
+    assert kept[:5] == [
+        "import os",
+        "from pathlib import Path",
+        "BASE_URL = 'https://example.test/'",
+        "TIMEOUTS = {'short': 1000, 'long': 30000}",
+        "ALIAS = BASE_URL",
+    ]
+    assert not any(line.startswith(("client", "start_time", "with", "if")) for line in kept)
+
+
+def test_discovery_finds_fixture_only_tests(tmp_path):
+    path = write_artifact(tmp_path)
+    items = runner.discover([tmp_path])
+    assert [(i.name, i.params, i.is_async) for i in items] == [
+        ("test_passes", ("page",), False),
+        ("test_fails", ("context",), False),
+        ("test_errors", ("browser",), False),
+        ("test_async", ("page",), True),
+    ]
+    assert items[0].test_id == f"{path}::block0::test_passes"
+    assert [i.name for i in runner.discover([tmp_path], keyword="fails")] == ["test_fails"]
+
+
+def test_harvested_module_runs_without_its_drivers(tmp_path):
+    item = runner.discover([write_artifact(tmp_path)])[0]
+    test = runner.load_test(item)
+    assert test.__globals__["TIMEOUTS"]["long"] == 30_000
+    assert "client" not in test.__globals__
+
+
+def test_discovery_on_the_shipped_artifacts():
+    names = {item.name for item in runner.discover(keyword="051208")}
+    assert {"test_positive_login", "test_negative_username", "test_negative_password"} <= names
+
+
+class FakeContext:
+    def new_page(self):
+        return FakePage()
+
+    def close(self):
+        pass
+
+
+class FakePage:
+    url = ""
+
+
+class FakeBrowser:
+    def is_connected(self):
+        return True
+
+    def new_context(self, **options):
+        return FakeContext()
+
+    def close(self):
+        pass
+
+
+class FakePlaywright:
+    @property
+    def chromium(self):
+        return self
+
+    def launch(self, **options):
+        return FakeBrowser()
+
+
+def fake_init_worker(pool_config):
+    runner._worker_state["pool"] = BrowserPool(FakePlaywright(), PoolConfig(**pool_config))
+
+
+def test_run_fans_out_to_worker_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr(runner, "_init_worker", fake_init_worker)
+    items = runner.discover([write_artifact(tmp_path)])
+
+    report = runner.run(items, workers=2)
+
+    assert report.workers == 2
+    assert [(r.test_id, r.outcome) for r in report.results] == [
+        (items[0].test_id, "passed"),
+        (items[1].test_id, "failed"),
+        (items[2].test_id, "error"),
+        (items[3].test_id, "skipped"),
+    ]
+    assert "no page" in report.results[1].message
+    assert all(r.worker != os.getpid() for r in report.results)
+    assert not report.ok
+
+    report.write_junit(tmp_path / "results.xml")
+    suite = ET.parse(tmp_path / "results.xml").getroot()
+    assert (suite.get("tests"), suite.get("failures"), suite.get("errors"), suite.get("skipped")) == ("4", "1", "1", "1")
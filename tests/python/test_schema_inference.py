@@ -0,0 +1,83 @@
+import datetime
+import sqlite3
+
+from qa_framework.db.datagen import create_schema, load, plan_rows
+from qa_framework import gen_cache
+from qa_framework.db.infer import infer_ddl, infer_ddl_cached
+from qa_framework.db.schema import load_schema, parse_ddl
+from qa_framework.gen_cache import GenerationCache
+
+PAGE = """
+<form action="/signup">
+  <input name="id" type="text">
+  <input name="user_id" type="text">
+  <input name="email" type="email">
+  <input name="password" type="password">
+  <input name="birthday" type="date">
+  <input name="newsletter" type="checkbox">
+</form>
+<form action="/search" role="search"><input name="q" type="search"><button>Search</button></form>
+<form action="/appointments">
+  <input name="id" type="text">
+  <input name="user_id" type="text">
+  <input name="when" type="datetime-local">
+  <input name="at" type="time">
+</form>
+"""
+
+
+def test_inference_is_deterministic_and_cached(tmp_path):
+    cache = GenerationCache(tmp_path)
+    assert infer_ddl(PAGE) == infer_ddl(PAGE)
+
+    first, hit = infer_ddl_cached(PAGE, cache)
+    assert not hit
+    second, hit = infer_ddl_cached(PAGE, cache)
+    assert hit
+    assert first == second
+    assert len(list(tmp_path.rglob("*.json"))) == 1
+
+
+def test_form_fields_do_not_clash_with_generated_keys():
+    schema = parse_ddl(infer_ddl(PAGE))
+    for table in schema.values():
+        names = table.column_names
+        assert len(names) == len(set(names)), table.name
+    assert "form_id" in schema["users"].column_names
+    assert {"user_id", "form_user_id", "form_when"} <= set(schema["appointments_submissions"].column_names)
+
+
+def test_infer_create_load_round_trip(tmp_path, monkeypatch):
+    # load_schema() uses the default cache; keep it out of the working tree.
+    monkeypatch.setattr(gen_cache, "CACHE_ROOT", tmp_path / "cache")
+    page = tmp_path / "page.html"
+    page.write_text(PAGE, encoding="utf-8")
+    schema = load_schema(page)
+    assert list((tmp_path / "cache" / "generations").rglob("*.json"))
+    url = f"sqlite:///{tmp_path / 'round_trip.db'}"
+    rows = plan_rows(schema, {"users": 50, "search_history": 120, "appointments_submissions": 30})
+    stats = load(url, schema, rows, seed=1, create=True)
+    assert {s.table: s.rows for s in stats} == rows
+
+    conn = sqlite3.connect(tmp_path / "round_trip.db")
+    try:
+        orphans = conn.execute(
+            "SELECT COUNT(*) FROM appointments_submissions a LEFT JOIN users u ON u.id = a.user_id WHERE u.id IS NULL"
+        ).fetchone()[0]
+        assert orphans == 0
+        birthday, newsletter = conn.execute("SELECT birthday, newsletter FROM users LIMIT 1").fetchone()
+        datetime.date.fromisoformat(birthday)
+        assert newsletter in (0, 1)
+        when, at = conn.execute("SELECT form_when, at FROM appointments_submissions LIMIT 1").fetchone()
+        datetime.datetime.fromisoformat(when)
+        datetime.time.fromisoformat(at)
+    finally:
+        conn.close()
+
+
+def test_recreating_an_inferred_schema(tmp_path):
+    schema = parse_ddl(infer_ddl(PAGE))
+    conn = sqlite3.connect(tmp_path / "twice.db")
+    create_schema(conn, "sqlite", schema)
+    create_schema(conn, "sqlite", schema, drop=True)
+    conn.close()
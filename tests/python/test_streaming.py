@@ -0,0 +1,22 @@
+from qa_framework.streaming import write_stream
+
+RESPONSE = """Intro.
+
+```java
+public class DatabaseTest {
+}
+```
+
+```sql
+SELECT 1;
+```
+"""
+
+
+def test_two_artifacts_in_one_directory_keep_their_java_classes(tmp_path):
+    first = write_stream(list(RESPONSE), tmp_path / "db_scripts_1", validate=False)
+    second = write_stream([RESPONSE.replace("{\n}", "{ int v; }")], tmp_path / "db_scripts_2", validate=False)
+
+    assert [b.path.relative_to(tmp_path).as_posix() for b in first.blocks] == ["db_scripts_1/DatabaseTest.java", "db_scripts_1_1.sql"]
+    assert [b.path.relative_to(tmp_path).as_posix() for b in second.blocks] == ["db_scripts_2/DatabaseTest.java", "db_scripts_2_1.sql"]
+    assert "int v" not in (tmp_path / "db_scripts_1" / "DatabaseTest.java").read_text()
@@ -0,0 +1,34 @@
+import shutil
+from pathlib import Path
+
+from qa_framework.testcases import TestCaseStore, parse_test_cases
+
+DOCUMENT = Path(__file__).resolve().parents[2] / "generated_artifacts" / "test_case_generation_20250601_051314.md"
+
+
+def test_shipped_document_parses_into_ten_cases():
+    cases = parse_test_cases(DOCUMENT.read_text(encoding="utf-8"))
+
+    assert [c.case_id for c in cases] == [f"TC_{n:03d}" for n in range(1, 11)]
+    assert {c.host for c in cases} == {"practicetestautomation.com"}
+    assert [(c.priority, c.category) for c in cases[:3]] == [("High", "Functional")] * 3
+    assert cases[0].title == "Positive Login Test"
+    assert cases[0].steps[1] == "Enter valid username (`student`) in the Username field"
+    assert cases[1].steps[-1] == "Verify the error message text is `Your username is invalid!`"
+    assert all(c.steps and c.expected for c in cases)
+
+
+def test_store_ingests_once_and_answers_queries(tmp_path):
+    shutil.copy(DOCUMENT, tmp_path)
+    with TestCaseStore(tmp_path / "cases.db") as store:
+        assert list(store.ingest_all(tmp_path).values()) == [10]
+        assert list(store.ingest_all(tmp_path).values()) == [None]
+
+        security = store.query(category="Security")
+        assert [c.case_id for c in security] == ["TC_005", "TC_006"]
+        assert [c.case_id for c in store.query(priority="low", url="https://practicetestautomation.com/login/")] == ["TC_010"]
+        assert store.count("priority") == {"High": 5, "Low": 1, "Medium": 4}
+
+        (tmp_path / DOCUMENT.name).unlink()
+        assert store.prune() == 1
+        assert len(store) == 0
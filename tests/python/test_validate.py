@@ -0,0 +1,77 @@
+from qa_framework.artifacts import CodeBlock
+from qa_framework.validate import check_block, validate_file
+
+
+def _rules(code: str, language: str = "python") -> list[tuple[str, str]]:
+    return [(i.severity, i.rule) for i in check_block(CodeBlock(language, code, 1, 0), "artifact")]
+
+
+def _errors(code: str, language: str = "python") -> list[str]:
+    return [rule for severity, rule in _rules(code, language) if severity == "error"]
+
+
+def test_plain_python_on_playwright_results_is_not_checked():
+    code = (
+        "def test_title(page):\n"
+        "    title = page.title()\n"
+        "    assert title.lower().startswith('test')\n"
+        "    text = page.locator('#msg').inner_text()\n"
+        "    assert text.endswith('!')\n"
+        "    items = page.locator('li').all_text_contents()\n"
+        "    items.sort()\n"
+        "    assert page.url.startswith('https://')\n"
+    )
+    assert _errors(code) == []
+
+
+def test_unknown_api_and_property_calls_are_rejected():
+    code = (
+        "def test_login(page):\n"
+        "    page.expect_that(page.locator('#x'))\n"
+        "    field = page.get_by_label('Username')\n"
+        "    field.type_text('student')\n"
+        "    assert page.url() == 'x'\n"
+    )
+    assert _errors(code) == ["unknown-api", "unknown-api", "property-call"]
+
+
+def test_objects_from_sync_playwright_are_tracked():
+    code = (
+        "from playwright.sync_api import sync_playwright\n"
+        "with sync_playwright() as p:\n"
+        "    browser = p.chromium.launch()\n"
+        "    page = browser.new_page()\n"
+        "    page.open('https://example.com')\n"
+    )
+    assert _errors(code) == ["unknown-api"]
+
+
+def test_every_wait_anti_pattern_is_rejected():
+    code = (
+        "def test_wait(page):\n"
+        "    page.wait_for_load_state('networkidle')\n"
+        "    page.wait_for_timeout(1000)\n"
+        "    page.wait_for_load_state()\n"
+    )
+    assert _rules(code) == [("error", "networkidle"), ("error", "fixed-sleep"), ("error", "load-state")]
+
+
+def test_syntax_errors_are_rejected():
+    assert _errors("def test(page):\n    page.goto('x'\n") == ["syntax"]
+
+
+def test_typescript_spec_files(tmp_path):
+    valid = tmp_path / "valid.spec.ts"
+    valid.write_text(
+        "import { test, expect } from '@playwright/test';\n"
+        "test('home', async ({ page }) => {\n"
+        "  await page.goto('https://example.com');\n"
+        "  await expect(page).toHaveTitle(/Example/);\n"
+        "});\n"
+    )
+    broken = tmp_path / "broken.spec.ts"
+    broken.write_text("```typescript\nimport { test } from '@playwright/test;\ntest('x', async ({ page }) => {});\n```\n")
+    assert validate_file(valid).ok
+    report = validate_file(broken)
+    assert not report.ok
+    assert {i.rule for i in report.issues} >= {"markdown-fence", "unterminated-string"}
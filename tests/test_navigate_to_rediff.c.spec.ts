@@ -1,5 +1,4 @@
-```
-import { test, expect } from '@playwright/test;
+import { test, expect } from './offline';
 
 test.describe('Rediff', () => {
   test('Navigate to Rediff.com', async ({ page }) => {
@@ -7,4 +6,3 @@ test.describe('Rediff', () => {
     await expect(page).toHaveURL('https://www.rediff.com/');
   });
 });
-```
\ No newline at end of file
@@ -1,9 +1,7 @@
-```
-import { test, expect } from '@playwright/test';
+import { test, expect } from './offline';
 
 test('Navigate to rediffmail.com', async ({ page }) => {
   await page.goto('https://www.rediffmail.com/');
   await expect(page).toHaveURL('https://www.rediffmail.com/');
   await expect(page.locator('text=Rediffmail')).toBeVisible();
 });
-```
\ No newline at end of file